@@ -1,44 +1,32 @@
+import os
 import random
+import sys
 
-def initialize_board_4x4():
-    row0 = [1, 2, 3, 4]
-    random.shuffle(row0)
-    row1 = [row0[2], row0[3], row0[0], row0[1]]
-    row2 = [row0[1], row0[0], row0[3], row0[2]]
-    row3 = [row0[3], row0[2], row0[1], row0[0]]
-    board = [row0, row1, row2, row3]
-    return board
+# 카탈로그 파일 읽기는 sudoku9x9/sudoku_catalog.py 와 같이 씀
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "sudoku9x9"))
+from sudoku_catalog import read_grid4 as load_catalog
 
-def shuffle_ribbons(board):
-    top = board[:2]
-    bottom = board[2:]
-    random.shuffle(top)
-    random.shuffle(bottom)
-    return top + bottom
-
-def transpose(board):
-    size = len(board)
-    transposed = []
-    for _ in range(size):
-        transposed.append([])
-    for row in board:
-        for j in range(size):
-            transposed[j].append(row[j])
-    return transposed
-
-def create_solution_board_4x4():
-    board = initialize_board_4x4()
-    board = shuffle_ribbons(board)
-    board = transpose(board)
-    board = shuffle_ribbons(board)
-    board = transpose(board)
-    return board
-
-def copy_board(board):
-    board_clone = []
-    for row in board :
-        board_clone.append(row[:])
-    return board_clone
+def pick_puzzle(catalog, no_of_holes):
+    shapes, counts, tables = catalog
+    clues = 16 - no_of_holes
+    if counts[clues] == 0:
+        raise ValueError("no puzzle with %d clues" % clues)
+    while True:
+        s = random.randrange(len(shapes))
+        mask = 0
+        for k in random.sample(range(16), clues):
+            mask |= 1 << k
+        if tables[s * 8192 + (mask >> 3)] >> (mask & 7) & 1:
+            break
+    digits = [1, 2, 3, 4]
+    random.shuffle(digits)
+    solution_board = []
+    puzzle_board = []
+    for r in range(4):
+        row = [digits[shapes[s][r * 4 + c] - 1] for c in range(4)]
+        solution_board.append(row)
+        puzzle_board.append([row[c] if mask >> (r * 4 + c) & 1 else 0 for c in range(4)])
+    return solution_board, puzzle_board
 
 def get_level():
     print("Enter Your Level.")
@@ -52,15 +40,6 @@ def get_level():
     else:
         return 10
 
-def make_holes(board, no_of_holes):
-    while no_of_holes > 0:
-        i = random.randint(0,3)
-        j = random.randint(0,3)
-        if board[i][j] != 0:
-            board[i][j] = 0
-            no_of_holes -= 1
-    return board
-
 def show_board(board):
     for row in board:
         for entry in row:
@@ -77,10 +56,8 @@ def get_integer(message,i,j):
     return int(digit)
 
 def sudoku_mini():
-    solution_board = create_solution_board_4x4()
-    puzzle_board = copy_board(solution_board)
     no_of_holes = get_level()
-    puzzle_board = make_holes(puzzle_board, no_of_holes)
+    solution_board, puzzle_board = pick_puzzle(load_catalog(), no_of_holes)
     show_board(puzzle_board)
     while no_of_holes > 0:
         i = get_integer("Row#(1,2,3,4): ",1,4) - 1
@@ -15,9 +15,30 @@
 #
 # % side는 전체 숫자 범위(1~9)로 순환하게 함
 
+import argparse
+import cProfile
+import datetime
+import pstats
 import random
 import copy
-import time
+import sys
+from collections import Counter
+
+from sudoku_batch import apply_moves, parse_moves, summary
+from sudoku_daily import DAILY_HOLES, DailySink, daily_seed
+from sudoku_events import AuditSink, BusRecorder, EventBus, \
+    MemberStoreSink, MetricsSink, replay_sink, timeline_sink
+from sudoku_heatmap import HeatmapSink
+from sudoku_history import MoveHistory, board_to_bytes
+from sudoku_journal import GameJournal, journal_path, load_journal
+from sudoku_profile import instrument, report, write_metrics
+from sudoku_rating import RATINGS_FILE, PuzzleIndex, RatingSink, \
+    load_bank, load_ratings, make_picker
+from sudoku_seen import SEEN_FILE, SeenSink, SeenStore, make_skip
+from sudoku_spectate import SPECTATE_ADDRESS as DEFAULT_SPECTATE, \
+    SpectatorSink
+from sudoku_store import MEMBERS_FILE, MemberStore, read_members, \
+    write_members
 
 
 # ========================
@@ -39,14 +60,14 @@ def initialize_board_9x9():
 
 
 # 보드 셔플
-def shuffle_ribbons(board):
+def shuffle_ribbons(board, rng=random):
     """가로줄을 블럭 단위로 셔플"""
     top = board[0:3]
     middle = board[3:6]
     bottom = board[6:9]
-    random.shuffle(top)
-    random.shuffle(middle)
-    random.shuffle(bottom)
+    rng.shuffle(top)
+    rng.shuffle(middle)
+    rng.shuffle(bottom)
     return top + middle + bottom
 
 
@@ -63,23 +84,23 @@ def transpose(board):
     return transposed
 
 
-# 정답 보드
-def create_solution_board_9x9():
+# 정답 보드 (rng 에 random.Random(seed) 를 넘기면 항상 같은 보드)
+def create_solution_board_9x9(rng=random):
     """정답 보드 생성"""
     board = initialize_board_9x9()
-    board = shuffle_ribbons(board)
+    board = shuffle_ribbons(board, rng)
     board = transpose(board)
-    board = shuffle_ribbons(board)
+    board = shuffle_ribbons(board, rng)
     board = transpose(board)
     return board
 
 
 # 정답보드 구멍 생성
-def make_holes(board, no_of_holes):
+def make_holes(board, no_of_holes, rng=random):
     """보드에 지정된 수만큼 구멍 만들기(0으로 표시)"""
     while no_of_holes > 0:
-        i = random.randint(0, 8)
-        j = random.randint(0, 8)
+        i = rng.randint(0, 8)
+        j = rng.randint(0, 8)
         if board[i][j] != 0:
             board[i][j] = 0
             no_of_holes -= 1
@@ -119,6 +140,18 @@ def get_integer(message, min_num, max_num):
     return int(number)
 
 
+# 정수 또는 명령어 입력
+def get_integer_or_command(message, min_num, max_num, commands):
+    """정수 또는 commands 중 하나를 입력받아 리턴"""
+    number = input(message)
+    while not (number in commands or
+               (number.isdigit() and min_num <= int(number) <= max_num)):
+        number = input(message + "(Invalid input, Try again)")
+    if number in commands:
+        return number
+    return int(number)
+
+
 # 보드 진행 상황
 def show_board(board):
     """현재 보드 상태 출력"""
@@ -145,25 +178,36 @@ def show_board(board):
 # 기록불러오기 (파일 경로 수정 필요)
 def load_members():
     """기록 불러오기"""
-    file = open("sudoku_members.csv", "r")
-    members = {}
-    for line in file:
-        name, passwd, tries, points = line.strip('\n').split(',')
-        members[name] = (passwd, int(tries), int(points))
-    file.close()
-    return members
+    return read_members(MEMBERS_FILE)
 
 
-# 기록 저장하기
+# 기록 저장하기 (전체 덮어쓰기, 게임 결과는 member_store 사용)
 def store_members(members):
-    file = open("sudoku_members.csv", "r")
-    names = members.keys()
-    for name in names:
-        passwd, tries, points = members[name]
-        line = name + ',' + passwd + ',' + str(tries) + ',' + \
-               str(points) + '\n'
-        file.write(line)
-    file.close()
+    write_members(members, MEMBERS_FILE)
+
+
+# 게임 결과 저장하기
+# (파일 잠금 상태에서 tries / wins 증가분만 반영)
+member_store = MemberStore(MEMBERS_FILE)
+
+
+# 게임 이벤트를 받아 기록하는 곳들
+event_metrics = MetricsSink()
+# 오늘의 도전 기록 / 순위표 (프로세스마다 하나)
+daily_sink = DailySink()
+# 이벤트 버스 자체의 기다린 횟수 / sink 실패 횟수 (--metrics)
+bus_metrics = Counter()
+
+
+def make_sinks():
+    """리플레이, 타임라인 / 통계, 회원 기록, 이벤트 수, 감사 로그, 실수 지도,
+    실력 점수, 이미 한 퍼즐, 오늘의 도전 (+ 관전 방송)"""
+    sinks = [replay_sink(), timeline_sink(), MemberStoreSink(member_store),
+             event_metrics, AuditSink(), HeatmapSink(), RatingSink(),
+             SeenSink(), daily_sink]
+    if SPECTATE_ADDRESS is not None:
+        sinks.append(SpectatorSink(SPECTATE_ADDRESS))
+    return sinks
 
 
 # ========================
@@ -171,46 +215,179 @@ def store_members(members):
 # ========================
 
 
+# 게임 종료 기록
+def finish_game(recorder, result, journal=None):
+    """recorder 에 게임 결과를 알리고 결과를 그대로 리턴
+
+    journal 을 넘기면 끝난 게임의 체크포인트 기록을 지움
+    """
+    if recorder is not None:
+        recorder.finish(result)
+    if journal is not None:
+        journal.finish()
+    return result
+
+
+# batch 입력에서 보드를 출력할 간격 (적용한 수 기준)
+BATCH_CHECKPOINT = 0
+
+# 솔로 모드에서 실력 점수로 퍼즐을 고를 퍼즐 목록 (sudoku_seeded 형식, 없으면 무작위)
+PUZZLE_BANK = None
+
+# 게임을 관전자에게 방송할 주소 (None 이면 방송 안 함)
+SPECTATE_ADDRESS = None
+
+# 퍼즐 번호(seed)의 최댓값 (journal / 리플레이 파일에 8 byte 로 저장)
+MAX_SEED = (1 << 63) - 1
+
+# PUZZLE_BANK 로 만든 PuzzleIndex (세션에서 처음 한 번만 만들고 이후엔 갱신)
+_puzzle_index = None
+
+
+# 솔로 모드 퍼즐 목록 (없으면 만들기)
+def session_index(ratings):
+    global _puzzle_index
+    if _puzzle_index is None:
+        _puzzle_index = PuzzleIndex.from_bank(load_bank(PUZZLE_BANK), ratings)
+    return _puzzle_index
+
+
+# 방금 한 퍼즐의 점수 변화를 PuzzleIndex 에 반영
+def update_index(index, recorder, before, after):
+    if recorder.seed is None:
+        return
+    old = before.puzzle(recorder.seed, recorder.holes)
+    new = after.puzzle(recorder.seed, recorder.holes)
+    if old != new:
+        try:
+            index.update(recorder.seed, recorder.holes, old, new)
+        except KeyError:  # 목록에 없는 퍼즐 (이어한 게임 등)
+            pass
+
+
+# 이어하기 : 처음 퍼즐과 달라진 칸들 [(칸 번호, 값)]
+def filled_cells(board, original):
+    side = len(board)
+    return [(cell, board[cell // side][cell % side])
+            for cell, value in enumerate(original)
+            if board[cell // side][cell % side] != value]
+
+
 # 스도쿠 본게임
-def sudoku_mini():
-    """한 명의 플레이터가 플레이하는 미니 스도쿠 게임"""
-    import time
-    solution_board = create_solution_board_9x9()
+def sudoku_mini(recorder=None, seed=None, moves=None, picker=None,
+                journal=None, saved=None, holes=None):
+    """한 명의 플레이터가 플레이하는 미니 스도쿠 게임
+
+    recorder 를 넘기면 start / move / history / finish 로 게임 진행을 알려 줌
+    seed 와 구멍 수가 같으면 항상 같은 퍼즐이 나옴 (없으면 새로 뽑음)
+    moves(parse_moves 결과)를 넘기면 그 수들을 먼저 한꺼번에 적용하고,
+    수가 모자라면 나머지는 평소처럼 입력받음
+    picker(구멍 수) 를 넘기면 seed 가 없을 때 그 함수가 고른 seed 를 씀
+    journal(GameJournal) 을 넘기면 수마다 체크포인트를 남기고,
+    saved(load_journal 결과) 를 넘기면 그 게임을 이어서 함
+    holes 를 주면 난이도를 묻지 않고 그 구멍 수로 함 (오늘의 도전)
+    """
+    if saved is not None:
+        seed = saved.seed
+        no_of_holes = saved.holes
+    elif holes is not None:
+        no_of_holes = holes
+    else:
+        no_of_holes = get_level()
+    if seed is None and picker is not None:
+        seed = picker(no_of_holes)
+    if seed is None:
+        seed = random.randrange(MAX_SEED + 1)
+    rng = random.Random(seed)
+    solution_board = create_solution_board_9x9(rng)
     puzzle_board = deep_copy_board(solution_board)
-    no_of_holes = get_level()
-    puzzle_board = make_holes(puzzle_board, no_of_holes)
-    show_board(puzzle_board)
-
+    puzzle_board = make_holes(puzzle_board, no_of_holes, rng)
+    level_holes = no_of_holes
+    original = board_to_bytes(puzzle_board)
     try_points = no_of_holes + 3  # 도전기회 : 구멍의 갯수 +3 (전부 소모할 경우 패배, -1 을 리턴)
+    if saved is not None:  # 저장된 칸과 도전기회 되살리기
+        for cell, value in saved.cells.items():
+            if original[cell] == 0:
+                puzzle_board[cell // 9][cell % 9] = value
+        no_of_holes = sum(row.count(0) for row in puzzle_board)
+        try_points = saved.try_points
+        print("Resuming your unfinished game.")
+    show_board(puzzle_board)
+    if recorder is not None:
+        recorder.start(puzzle_board, solution_board, level_holes, seed,
+                       try_points)
+    if try_points <= 0:  # 도전기회를 다 쓴 채로 저장된 게임 (끝내기 전에 멈춤)
+        print("You lose..")
+        return finish_game(recorder, -1, journal)
+    if journal is not None:
+        journal.start(seed, level_holes, try_points,
+                      filled_cells(puzzle_board, original))
+    history = MoveHistory(puzzle_board)
+
+    if moves is not None:  # 수 목록 한꺼번에 적용 (보드는 checkpoint 마다만 출력)
+        outcome = apply_moves(moves, puzzle_board, solution_board, history,
+                              no_of_holes, try_points, recorder,
+                              BATCH_CHECKPOINT, show_board)
+        print(summary(outcome))
+        no_of_holes, try_points = outcome.holes, outcome.try_points
+        if outcome.result == 0:
+            print("See you again")
+            return finish_game(recorder, 0, journal)
+        if outcome.result == -1:
+            print("You lose..")
+            return finish_game(recorder, -1, journal)
+        if journal is not None:  # 적용한 수를 한 번에 체크포인트
+            journal.start(seed, level_holes, try_points,
+                          filled_cells(puzzle_board, original))
     print("If you wanna leave, Press 0(zero)")
+    print("To undo / redo your last move, Press u / r")
     while no_of_holes > 0:
-        i = get_integer("Row#(1,2,3,4,5,6,7,8,9) : ", 0, 9) - 1
+        i = get_integer_or_command("Row#(1,2,3,4,5,6,7,8,9) : ", 0, 9,
+                                   ("u", "r"))
+        if i in ("u", "r"):  # 되돌리기 / 다시하기 (도전기회는 돌려주지 않음)
+            move = history.undo() if i == "u" else history.redo()
+            if move is None:
+                print("Nothing to undo." if i == "u" else "Nothing to redo.")
+                continue
+            if recorder is not None:
+                recorder.history(i)
+            before, after = move[2], move[3]
+            no_of_holes += (after == 0) - (before == 0)
+            if journal is not None:
+                journal.checkpoint(move[0] * 9 + move[1], after, try_points)
+            show_board(puzzle_board)
+            continue
+        i -= 1
         if i == -1:
             print("See you again")
-            return 0
+            return finish_game(recorder, 0, journal)
         j = get_integer("Column#(1,2,3,4,5,6,7,8,9) : ", 0, 9) - 1
         if j == -1:
             print("See you again")
-            return 0
+            return finish_game(recorder, 0, journal)
 
         if puzzle_board[i][j] != 0:
             print("Not empty! Try another cell.")
             continue
 
-        n = get_integer("Number(1,2,3,4,5,6,7,8,9) : ", 0, 9)
+        n = get_integer("Number(1,2,3,4,5,6,7,8,9) : ", 1, 9)
+        if recorder is not None:
+            recorder.move(i, j, n, n == solution_board[i][j])
         if n == solution_board[i][j]:
-            puzzle_board[i][j] = n
+            history.record(i, j, n)
             show_board(puzzle_board)
             no_of_holes -= 1
         else:
             print(n, ": Wrong number! Try again.")
 
         try_points -= 1
-        if try_points == 0:
+        if journal is not None:
+            journal.checkpoint(i * 9 + j, puzzle_board[i][j], try_points)
+        if try_points <= 0:
             print("You lose..")
-            return -1
+            return finish_game(recorder, -1, journal)
     print("Well done! Come again.")
-    return 1
+    return finish_game(recorder, 1, journal)
 
 
 def login(members):
@@ -237,9 +414,30 @@ def login(members):
         return username, 0, 0, members
 
 
-def show_top5(members):
-    """Top 5 랭킹 출력"""
+def ask_resume(saved):
+    """남은 게임을 이어할지 묻기 (y / n)"""
+    filled = sum(1 for value in saved.cells.values() if value)
+    print(f"You have an unfinished game ({filled} cells filled, "
+          f"{saved.try_points} tries left).")
+    answer = input("Resume it? (y/n) : ")
+    while answer.strip().lower() not in ("y", "n"):
+        answer = input("Resume it? (y/n) : ")
+    return answer.strip().lower() == "y"
+
+
+def show_top5(members, ratings=None):
+    """Top 5 랭킹 출력 (ratings 를 주면 실력 점수 순)"""
     print("----")
+    if ratings is not None:
+        print("All-time Top 5 based on skill rating.")
+        rank = 1
+        for rating, name, games in ratings.ranking(members)[:5]:
+            pw, tries, wins = members[name]
+            print(f"ranked {rank}", end=' ')
+            print(f"name : {name} rating : {rating:.0f} "
+                  f"tries : {tries} wins : {wins}")
+            rank += 1
+        return
     rank_sorted = sorted(members.items(), key=lambda x: x[1][2], reverse=True)
     print("All-time Top 5 based on the number of wins.")
     rank = 1
@@ -252,93 +450,250 @@ def show_top5(members):
 
 
 # 게임 실행 함수
-def play_sudoku_game():
-    print("Welcome to Sudoku!")
-
-
-`
-# 회원 정보 불러오기
-members = load_members()
-
-# 로그인
-num_of_player = get_integer("Solo-mode or Multi-mode (Press 1 or 2) :\n", 1, 2)
-if num_of_player == 1:  # 솔로모드일 경우 게임을 기록하고 그 정보를 저장
-    username, tries, wins, members = login(members)
-
-    # 게임 실행
-    result = sudoku_mini()
-
-    # 결과 처리
-    if result == 1:
-        print("Congratulations! You won!")
-        wins += 1
-    elif result == 0:
-        print("See you again")
-        return None
-    elif result == -1:
-        print("You lost the game.")
+def play_sudoku_game(seed=None, moves=None):
+    """seed 를 주면 모든 게임이 그 seed 의 퍼즐로 진행됨
 
-    tries += 1
-    # 업데이트 후 저장
-    password = members[username][0]
-    members[username] = (password, tries, wins)
-    store_members(members)
-
-    # 랭킹 보여주기
-    show_top5(members)
-else:  # 둘 이상일 경우 게임의 승패를 가리고 종료
-    print("Player 1's game")
-    start_player_1 = time.perf_counter()
-    player1_result = sudoku_mini()
-    end_player_1 = time.perf_counter()
-
-    playtime_1 = int(end_player_1 - start_player_1)
-
-    if player1_result == 1:
-        print("Congratulations! You cleared a stage!")
-        print("Now, please wait about next player")
-
-    elif player1_result == 0:  # 멀티모드에선 게임 중도 종료는 게임 기권
-        print("Player 1 gave up the game.")
-        print("Player 2 wins !")
-        return "..."
-
-    elif player1_result == -1:
-        print("You lost the game.")
-        print("Now, please wait about next player.")
+    moves 를 주면 게임의 수를 입력 대신 moves 에서 차례로 가져옴
+    """
+    print("Welcome to Sudoku!")
 
-    print("Now player 2's game")
+    # 기록(파일 쓰기)은 이벤트 버스 뒤에서 처리하고, 끝날 때 모두 저장
+    bus = EventBus(make_sinks())
+    try:
+        return play_modes(bus, seed, moves)
+    finally:
+        bus.close()
+        bus_metrics.update(bus.stats())
+
+
+# 솔로 / 멀티 모드
+def play_modes(bus, seed=None, moves=None):
+    # 회원 정보 불러오기
+    members = load_members()
+
+    # 로그인
+    num_of_player = get_integer("Solo-mode, Multi-mode or Daily challenge (Press 1, 2 or 3) :\n", 1, 3)
+    if num_of_player == 1:  # 솔로모드일 경우 게임을 기록하고 그 정보를 저장
+        username, tries, wins, members = login(members)
+        bus.publish("login", player=username)
+
+        # 게임 실행 (한 수 한 수 기록, 결과는 이벤트로 저장)
+        # 퍼즐 목록이 있으면 실력 점수에 맞고 아직 안 한 퍼즐을 고름
+        password = members[username][0]
+        picker = index = None
+        if PUZZLE_BANK and seed is None:
+            ratings = load_ratings(RATINGS_FILE)
+            index = session_index(ratings)
+            picker = make_picker(index, ratings.player(username),
+                                 skip=make_skip(SeenStore(SEEN_FILE),
+                                                username))
+        # 끝내지 못한 게임이 남아 있으면 이어할지 묻기
+        journal = GameJournal(journal_path(username))
+        saved = load_journal(journal.path)
+        if saved is not None and not ask_resume(saved):
+            saved = None
+        recorder = BusRecorder(bus, username, password)
+        result = sudoku_mini(recorder, seed, moves, picker, journal, saved)
+
+        # 결과 처리
+        if result == 1:
+            print("Congratulations! You won!")
+            wins += 1
+        elif result == 0:
+            print("See you again")
+            return None
+        elif result == -1:
+            print("You lost the game.")
+
+        tries += 1
+        # 화면용 업데이트 (파일에는 MemberStoreSink 가 증가분만 저장)
+        members[username] = (password, tries, wins)
+
+        # 랭킹 보여주기 (점수는 RatingSink 가 저장한 뒤 읽음)
+        bus.flush()
+        rated = load_ratings(RATINGS_FILE)
+        if index is not None:
+            update_index(index, recorder, ratings, rated)
+        show_top5(members, rated)
+    elif num_of_player == 3:  # 오늘의 도전 : 모두 같은 퍼즐, 푼 시간으로 순위
+        play_daily(bus, members, moves)
+    else:  # 둘 이상일 경우 게임의 승패를 가리고 종료
+        # 자리마다 로그인해서 대결 결과(실력 점수)만 플레이어 이름으로 남김
+        # (각 게임은 솔로 기록 / 퍼즐 점수에 넣지 않도록 이름 없이 기록)
+        print("Player 1's game")
+        name_1 = seat_login(bus, members)
+        recorder_1 = BusRecorder(bus)
+        player1_result = sudoku_mini(recorder_1, seed, moves)
+
+        playtime_1 = recorder_1.elapsed
+
+        if player1_result == 1:
+            print("Congratulations! You cleared a stage!")
+            print("Now, please wait about next player")
+
+        elif player1_result == 0:  # 멀티모드에선 게임 중도 종료는 게임 기권
+            print("Player 1 gave up the game.")
+            print("Player 2 wins !")
+            return "..."
+
+        elif player1_result == -1:
+            print("You lost the game.")
+            print("Now, please wait about next player.")
+
+        print("Now player 2's game")
+
+        name_2 = seat_login(bus, members)
+        recorder_2 = BusRecorder(bus)
+        player2_result = sudoku_mini(recorder_2, seed, moves)
+
+        playtime_2 = recorder_2.elapsed
+
+        if player2_result == 0:
+            print("Player 2 gave up the game.")
+            print("Player 1 wins !")
+            finish_match(bus, recorder_1, recorder_2, 1, (name_1, name_2))
+            return "..."
+
+        if player1_result > player2_result:
+            print("Player 1 wins ! ")
+            score = 1
+
+        elif player1_result < player2_result:
+            print("Player 2 wins ! ")
+            score = 0
 
-    start_player_2 = time.perf_counter()
-    player2_result = sudoku_mini()
-    end_player_2 = time.perf_counter()
+        else:
+            score = 0.5
+            if player1_result == 1 and player2_result == 1:
+                if playtime_1 > playtime_2:
+                    print("Player 2 wins !")
+                    print(f" Player 2 fisished the game {playtime_1 - playtime_2:.2f} seconds faster than Player 1")
+                    score = 0
+                elif playtime_2 > playtime_1:
+                    print("Player 1 wins !")
+                    print(f" Player 1 fisished the game {playtime_2 - playtime_1:.2f} seconds faster than Player 2")
+                    score = 1
+                else:
+                    print("It's a draw")
 
-    playtime_2 = int(end_player_2 - start_player_2)
+            else:
+                print("It's a draw")
+                print("But Well done, both of you.")
+        finish_match(bus, recorder_1, recorder_2, score, (name_1, name_2))
 
-    if player2_result == 0:
-        print("Player 2 gave up the game.")
-        print("Player 1 wins !")
-        return "..."
 
-    if player1_result > player2_result:
-        print("Player 1 wins ! ")
+# 멀티 모드 한 자리 : 로그인한 플레이어 이름
+def seat_login(bus, members):
+    username, _, _, members = login(members)
+    bus.publish("login", player=username)
+    return username
 
-    elif player1_result < player2_result:
-        print("Player 2 wins ! ")
 
+# 오늘의 도전
+def play_daily(bus, members, moves=None):
+    """로그인한 플레이어가 오늘의 퍼즐을 풀고, 이기면 시간을 올리고 순위 출력"""
+    username, tries, wins, members = login(members)
+    bus.publish("login", player=username)
+    today = datetime.date.today()
+    print(f"Daily challenge {today} : everyone plays the same puzzle.")
+    recorder = BusRecorder(bus, username, members[username][0])
+    result = sudoku_mini(recorder, daily_seed(today), moves,
+                         holes=DAILY_HOLES)
+    if result != 1:
+        print("Finish the puzzle to get a daily rank. See you again")
+        return
+    bus.publish("daily_result", date=today.isoformat(), player=username,
+                elapsed=recorder.elapsed)
+    bus.flush()
+    rank, ms, total = daily_sink.rank(today, username)
+    print(f"You finished in {recorder.elapsed:.2f} seconds.")
+    print(f"Today's rank : {rank} of {total}")
+
+
+# 멀티 모드 승패 알리기 (score : 1 이면 Player 1 승, 0.5 면 무승부)
+def finish_match(bus, recorder_1, recorder_2, score, players):
+    bus.publish("match_finished", games=[recorder_1.game, recorder_2.game],
+                players=list(players), score=score)
+
+
+# ===========================
+# 실행 옵션
+# ===========================
+
+PROFILE_FILE = "sudoku_profile.prof"
+
+
+# 구간별 시간 측정 켜기
+def instrument_game():
+    module = sys.modules[__name__]
+    instrument(module, {"generate": "create_solution_board_9x9",
+                        "holes": "make_holes",
+                        "render": "show_board",
+                        "input_validation": "get_integer",
+                        "input_wait": "input",
+                        "members_load": "load_members",
+                        "members_save": "store_members"})
+    instrument(module, {"input_validation": "get_integer_or_command"})
+    instrument(MemberStore, {"members_save": "update"})
+
+
+# --seed 값 검사
+def seed_value(text):
+    seed = int(text)
+    if not 0 <= seed <= MAX_SEED:
+        raise argparse.ArgumentTypeError(
+            f"seed must be between 0 and {MAX_SEED}")
+    return seed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sudoku 9x9")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"save cProfile stats to {PROFILE_FILE}")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write phase timings in Prometheus text format")
+    parser.add_argument("--seed", type=seed_value,
+                        help="play the puzzle generated from this seed")
+    parser.add_argument("--moves", metavar="FILE",
+                        help="read moves ('r c n' lines or 'rcn' triplets) "
+                             "from FILE ('-' for stdin)")
+    parser.add_argument("--checkpoint", type=int, default=0, metavar="N",
+                        help="with --moves, show the board every N moves")
+    parser.add_argument("--bank", metavar="FILE",
+                        help="pick solo puzzles matching the player's rating "
+                             "from this sudoku_seeded NDJSON bank")
+    parser.add_argument("--spectate", nargs="?", const=DEFAULT_SPECTATE,
+                        metavar="ADDRESS",
+                        help="broadcast board changes to spectators on a "
+                             f"local socket (default {DEFAULT_SPECTATE}, "
+                             "'host:port' for TCP)")
+    args = parser.parse_args(argv)
+
+    global BATCH_CHECKPOINT, PUZZLE_BANK, SPECTATE_ADDRESS
+    BATCH_CHECKPOINT = args.checkpoint
+    PUZZLE_BANK = args.bank
+    SPECTATE_ADDRESS = args.spectate
+    moves = None
+    if args.moves == "-":
+        moves = parse_moves(sys.stdin)
+    elif args.moves:
+        with open(args.moves, "r") as file:  # 게임 전에 다 읽고 닫기
+            moves = list(parse_moves(file))
+
+    if args.metrics:
+        instrument_game()
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(play_sudoku_game, args.seed, moves)
+        profiler.dump_stats(PROFILE_FILE)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
     else:
-        if player1_result == 1 and player2_result == 1:
-            if playtime_1 > playtime_2:
-                print("Player 2 wins !")
-                print(f" Player 2 fisished the game {playtime_1 - playtime_2} seconds faster than Player 1")
-            elif playtime_2 > playtime_1:
-                print("Player 1 wins !")
-                print(f" Player 1 fisished the game {playtime_2 - playtime_1} seconds faster than Player 2")
-            else:
-                print("It's a draw")
+        play_sudoku_game(args.seed, moves)
+    if args.metrics:
+        report()
+        write_metrics(args.metrics, {"events": event_metrics.counts,
+                                     "event_bus": bus_metrics})
 
-        else:
-            print("It's a draw")
-            print("But Well done, both of you.")
 
-play_sudoku_game()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# 스도쿠 팀 프로젝트 - 수 목록을 한 번에 입력하기 (batch 모드)
+#
+# 행 / 열 / 숫자를 세 번 따로 묻는 대신, 파일이나 표준 입력으로 받은
+# 수 목록을 한꺼번에 검사하고 적용한다. 보드는 끝날 때와
+# checkpoint 마다만 출력하므로 수만 개의 수도 금방 처리된다.
+#
+# 입력 형식 (한 줄에 아래 중 하나, # 뒤는 주석)
+#   r c n            공백이나 쉼표로 나눈 숫자 세 개 (u / r 와 섞어 써도 됨)
+#   rcn rcn ...      세 자리씩 붙여 쓴 수 (예: "123 456" 또는 "123456")
+#   u / r            되돌리기 / 다시하기
+# 행이나 열이 0 이면 게임 중단 (게임의 0 입력과 같음)
+#
+# 규칙은 sudoku_mini 와 같다. 빈칸이 아닌 칸은 도전기회를 쓰지 않고 건너뛰고,
+# 틀린 숫자는 도전기회를 하나 쓴다.
+#
+# 사용법 (속도 확인) : python sudoku_batch.py [수의 개수]
+
+import sys
+import time
+from collections import Counter, namedtuple
+from itertools import groupby
+
+from sudoku_history import MoveHistory
+
+BatchResult = namedtuple("BatchResult", "result holes try_points counts")
+
+
+# ========================
+# 입력 읽기
+# ========================
+
+# 한 자리 숫자 토큰인지
+def _is_digit(token):
+    return len(token) == 1 and token.isdigit()
+
+
+# 한 줄 -> 수 목록
+def parse_line(line):
+    """줄 하나를 (r, c, n) / "u" / "r" / None(잘못된 입력) 목록으로"""
+    line = line.split("#", 1)[0].replace(",", " ")
+    tokens = []
+    # 이어진 한 자리 숫자들만 붙여 읽음 ("1 2 3 u" -> "123", "u")
+    # "u u r" 같은 명령은 붙이지 않음
+    for single, group in groupby(line.split(), _is_digit):
+        if single:
+            tokens.append("".join(group))
+        else:
+            tokens.extend(group)
+    moves = []
+    for token in tokens:
+        if token in ("u", "r"):
+            moves.append(token)
+        elif token.isdigit() and len(token) % 3 == 0:
+            for k in range(0, len(token), 3):
+                moves.append((int(token[k]), int(token[k + 1]),
+                              int(token[k + 2])))
+        else:
+            moves.append(None)
+    return moves
+
+
+# 파일 / 표준 입력 -> 수
+def parse_moves(lines):
+    """(줄 번호, 수) 를 하나씩 만들어 줌. 필요한 만큼만 읽음"""
+    for line_no, line in enumerate(lines, 1):
+        for move in parse_line(line):
+            yield line_no, move
+
+
+# ========================
+# 수 적용
+# ========================
+
+def apply_moves(moves, puzzle_board, solution_board, history, no_of_holes,
+                try_points, recorder=None, every=0, render=None):
+    """parse_moves 의 수들을 게임 끝이나 입력 끝까지 적용
+
+    every 수마다 render(보드) 호출 (0 이면 끝날 때 한 번만)
+    result 는 1 승리, 0 중단, -1 패배, None 은 입력이 먼저 끝남
+    """
+    counts = Counter()
+    side = len(puzzle_board)
+    result = None
+    for _, move in moves:
+        if move is None:
+            counts["invalid"] += 1
+            continue
+        if move in ("u", "r"):
+            change = history.undo() if move == "u" else history.redo()
+            if change is None:
+                counts["no_" + ("undo" if move == "u" else "redo")] += 1
+                continue
+            if recorder is not None:
+                recorder.history(move)
+            no_of_holes += (change[3] == 0) - (change[2] == 0)
+            counts[move] += 1
+        else:
+            i, j, n = move
+            if i == 0 or j == 0:
+                result = 0
+                break
+            if not (i <= side and j <= side and 1 <= n <= side):
+                counts["invalid"] += 1
+                continue
+            i -= 1
+            j -= 1
+            if puzzle_board[i][j] != 0:
+                counts["not_empty"] += 1
+                continue
+            correct = n == solution_board[i][j]
+            if recorder is not None:
+                recorder.move(i, j, n, correct)
+            if correct:
+                history.record(i, j, n)
+                no_of_holes -= 1
+                counts["right"] += 1
+            else:
+                counts["wrong"] += 1
+            try_points -= 1
+            if try_points <= 0:
+                result = -1
+                break
+        counts["applied"] += 1
+        if no_of_holes == 0:
+            result = 1
+            break
+        if every and render is not None and counts["applied"] % every == 0:
+            render(puzzle_board)
+    if render is not None:
+        render(puzzle_board)
+    return BatchResult(result, no_of_holes, try_points, counts)
+
+
+# 적용 결과 한 줄 요약
+def summary(outcome):
+    counts = outcome.counts
+    text = ", ".join(f"{name} {counts[name]}" for name in sorted(counts))
+    return (f"batch : {text or 'no moves'} "
+            f"(holes left {outcome.holes}, tries left {outcome.try_points})")
+
+
+# ========================
+# 속도 확인
+# ========================
+
+def _bench(total):
+    from sudoku_seeded import generate_puzzle
+
+    solution, puzzle = generate_puzzle(1, 10)
+    holes = [(i, j) for i in range(9) for j in range(9) if puzzle[i][j] == 0]
+    # 정답 하나 두고 되돌리기 / 다시하기 / 빈칸 아닌 칸을 반복, 마지막에 나머지
+    script = []
+    i, j = holes[0]
+    script.append(f"{i + 1} {j + 1} {solution[i][j]}")
+    while len(script) * 3 < total - len(holes):
+        script.append("u r 111")
+    script += ["".join(f"{i + 1}{j + 1}{solution[i][j]}" for i, j in holes)]
+    start = time.perf_counter()
+    outcome = apply_moves(parse_moves(script), puzzle, solution,
+                          MoveHistory(puzzle), len(holes), len(holes) + 3)
+    elapsed = time.perf_counter() - start
+    moves = outcome.counts["applied"] + outcome.counts["not_empty"]
+    print(summary(outcome))
+    print(f"{moves} moves in {elapsed * 1000:.1f} ms "
+          f"({moves / elapsed:,.0f} moves/s), result {outcome.result}")
+
+
+if __name__ == "__main__":
+    _bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
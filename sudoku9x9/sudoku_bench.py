@@ -0,0 +1,163 @@
+# 스도쿠 팀 프로젝트 - 벤치마크
+#
+# 보드 생성, 구멍 만들기, 보드 복사, 보드 출력, 회원 기록 읽기 / 쓰기, 풀이기의
+# 속도를 고정된 seed 로 재서 ops/sec 와 p50 / p99 지연 시간을 출력하고
+# JSON 으로 저장한다. 두 JSON 을 비교하면 변경 전후 속도 차이를 볼 수 있다.
+#
+# 사용법
+#   python sudoku_bench.py [--out bench.json] [--sizes 10,10000,1000000]
+#   python sudoku_bench.py --compare before.json after.json
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+
+from sudoku9x9_final import create_solution_board_9x9, deep_copy_board, \
+    make_holes, show_board
+from sudoku_seeded import generate_puzzle
+from sudoku_solver import count_solutions, solve
+from sudoku_store import read_members, write_members
+
+SEED = 1017
+MIN_TIME = 0.5       # 항목마다 최소 측정 시간(초)
+MAX_OPS = 20000
+
+
+# ========================
+# 측정
+# ========================
+
+# 백분위수
+def percentile(sorted_values, q):
+    k = min(len(sorted_values) - 1, int(len(sorted_values) * q / 100))
+    return sorted_values[k]
+
+
+# 한 항목 측정
+def bench(name, func, setup=None, min_time=MIN_TIME, max_ops=MAX_OPS):
+    """setup() 의 결과를 func 에 넘겨 여러 번 실행 (setup 시간은 빼고 잼)"""
+    samples = []
+    total = 0.0
+    while total < min_time and len(samples) < max_ops:
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        total += elapsed
+    samples.sort()
+    result = {"name": name, "ops": len(samples),
+              "ops_per_sec": round(len(samples) / total, 1),
+              "p50_us": round(percentile(samples, 50) * 1e6, 2),
+              "p99_us": round(percentile(samples, 99) * 1e6, 2)}
+    return result
+
+
+# 결과 한 줄 출력
+def show(result):
+    print(f"{result['name']:<28} {result['ops']:>7} ops "
+          f"{result['ops_per_sec']:>12.1f} ops/s  "
+          f"p50 {result['p50_us']:>12.2f}us  p99 {result['p99_us']:>12.2f}us")
+    return result
+
+
+# ========================
+# 벤치마크 항목
+# ========================
+
+def make_members(count, rng):
+    return {f"m{k}": (f"pw{rng.randrange(10 ** 6)}", rng.randrange(1000),
+                      rng.randrange(500))
+            for k in range(count)}
+
+
+def run_all(sizes):
+    rng = random.Random(SEED)
+    results = []
+
+    def add(name, func, setup=None):
+        results.append(show(bench(name, func, setup)))
+
+    add("create_solution_board_9x9",
+        lambda r: create_solution_board_9x9(r),
+        lambda: random.Random(rng.random()))
+    solution = create_solution_board_9x9(random.Random(SEED))
+    add("make_holes(10)",
+        lambda a: make_holes(a[0], 10, a[1]),
+        lambda: (deep_copy_board(solution), random.Random(rng.random())))
+    add("deep_copy_board", lambda _: deep_copy_board(solution))
+    board = generate_puzzle(SEED, 10)[1]
+    with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+        result = bench("show_board (null sink)", lambda _: show_board(board))
+    results.append(show(result))
+
+    # 풀이기 : 구멍 50 개짜리 고정 퍼즐들
+    puzzles = [generate_puzzle(SEED + k, 50)[1] for k in range(32)]
+    counter = iter(range(10 ** 9))
+    add("solve(50 holes)", lambda p: solve(p),
+        lambda: puzzles[next(counter) % len(puzzles)])
+    add("count_solutions(50 holes)", lambda p: count_solutions(p, 2),
+        lambda: puzzles[next(counter) % len(puzzles)])
+
+    # 회원 기록 (임시 폴더에서)
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, "members.csv")
+        for size in sizes:
+            members = make_members(size, rng)
+            write_members(members, path)
+            add(f"load_members({size})", lambda _: read_members(path))
+            add(f"store_members({size})",
+                lambda _: write_members(members, path))
+    finally:
+        shutil.rmtree(folder)
+    return results
+
+
+# ========================
+# 비교
+# ========================
+
+def compare(before_path, after_path):
+    """두 결과 파일의 ops/sec 비율 출력 (1 보다 크면 빨라짐)"""
+    with open(before_path) as file:
+        before = {r["name"]: r for r in json.load(file)["results"]}
+    with open(after_path) as file:
+        after = {r["name"]: r for r in json.load(file)["results"]}
+    print(f"{'name':<28} {'before':>12} {'after':>12} {'ratio':>7}")
+    for name, new in after.items():
+        old = before.get(name)
+        if old is None:
+            continue
+        ratio = new["ops_per_sec"] / old["ops_per_sec"]
+        print(f"{name:<28} {old['ops_per_sec']:>12.1f} "
+              f"{new['ops_per_sec']:>12.1f} {ratio:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sudoku benchmarks")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--sizes", default="10,10000,1000000",
+                        help="member counts for load/store")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = run_all(sizes)
+    data = {"seed": SEED, "python": platform.python_version(),
+            "platform": platform.platform(), "results": results}
+    with open(args.out, "w") as file:
+        json.dump(data, file, indent=1)
+    print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
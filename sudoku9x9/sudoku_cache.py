@@ -0,0 +1,232 @@
+# 스도쿠 팀 프로젝트 - 풀이 결과 캐시
+#
+# 힌트, 난이도 평가, 유일해 검사는 같은 퍼즐(또는 대칭으로 같은 퍼즐)을
+# 여러 번 풀게 된다. 퍼즐을 정규형으로 바꾼 키로 결과를 기억해 두고,
+# 찾은 해는 다시 호출한 쪽의 방향으로 되돌려 준다.
+# 정규형은 전치, 밴드 / 스택 순서, 밴드 안 행 / 스택 안 열 순서, 숫자 바꾸기를
+# 모두 접으므로 sudoku_dataset 의 변형 퍼즐도 같은 키가 된다.
+#
+# 캐시 값은 (해의 개수(최대 2), 정규형 방향의 해 bytes 또는 None)
+#
+# 정규형을 만드는 데 퍼즐 하나에 몇 ms 가 들기 때문에 빈칸이 전체 칸의
+# DIRECT_RATIO 보다 적은(쉬운) 퍼즐은 정규형을 만들지 않고 보드 81 bytes 를
+# 그대로 키로 쓴다 (대칭 변형끼리는 못 알아보지만 같은 퍼즐은 다시 풀지 않음).
+# 정규형 키도 정규형 보드의 81 bytes 라서 두 키는 한 표에 같이 둘 수 있다.
+# 한 번 만든 정규형은 보드의 Zobrist 해시로 기억해 두어서 같은 보드 상태를
+# 다시 물으면 정규형을 다시 만들지 않는다. 게임 중에는 MoveHistory.hash 를
+# state_hash 로 넘기면 보드를 읽지도 않음
+#
+# 사용법 : python sudoku_cache.py [퍼즐 수] [구멍 수]
+
+import json
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+
+from sudoku_history import MoveHistory
+from sudoku_solver import search_solutions
+from sudoku_symmetry import apply_transform, canonical_form, \
+    invert_transform, key_to_board, random_transform
+from sudoku_units import is_valid_board
+from sudoku_zobrist import board_hash
+
+
+DIRECT_RATIO = 0.7    # 9x9 에서 빈칸 57 개 미만이면 바로 풀기
+
+
+class SolverCache:
+    """정규형 키 기반 LRU 풀이 캐시"""
+
+    def __init__(self, maxsize=4096, path=None, direct_ratio=DIRECT_RATIO):
+        self.maxsize = maxsize
+        self.path = path
+        self.direct_ratio = direct_ratio
+        self.hits = 0
+        self.misses = 0
+        self.direct = 0          # 정규형 없이 보드 그대로의 키로 찾은 수
+        self._entries = OrderedDict()
+        self._states = OrderedDict()   # Zobrist 해시 -> (정규형 키, 변환)
+        self.dead_ends = set()   # 풀이기의 transposition table
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    # 정규형 없이 찾는 편이 빠른 퍼즐인지 (이미 정규형을 만든 상태는 아님)
+    def _is_easy(self, board, state_hash):
+        if state_hash is not None and state_hash in self._states:
+            return False
+        side = len(board)
+        empty = sum(row.count(0) for row in board)
+        if empty < self.direct_ratio * side * side:
+            self.direct += 1
+            return True
+        return False
+
+    # 보드 상태 -> 정규형 (Zobrist 해시로 기억)
+    def _canonical(self, board, state_hash):
+        h = board_hash(board) if state_hash is None else state_hash
+        found = self._states.get(h)
+        if found is not None:
+            self._states.move_to_end(h)
+            return found
+        found = self._states[h] = canonical_form(board)
+        if len(self._states) > self.maxsize:
+            self._states.popitem(last=False)
+        return found
+
+    # 키로 캐시 조회 (없으면 풀어서 transform 방향으로 저장)
+    def _find(self, key, board, transform):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        count, solution = search_solutions(board, 2, self.dead_ends)
+        if solution is not None and transform is not None:
+            solution = apply_transform(solution, transform)
+        canon = None
+        if solution is not None:
+            canon = bytes(v for row in solution for v in row)
+        entry = (count, canon)
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    # 정규형 키로 조회 -> (값, 변환)
+    def _lookup(self, board, state_hash=None):
+        key, transform = self._canonical(board, state_hash)
+        return self._find(key, board, transform), transform
+
+    # 보드 그대로의 키로 조회 (쉬운 퍼즐)
+    def _lookup_direct(self, board):
+        return self._find(bytes(v for row in board for v in row), board,
+                          None)
+
+    def solve(self, board, state_hash=None):
+        """해 하나를 호출한 쪽 방향으로 리턴. 해가 없으면 None
+
+        state_hash = 보드의 Zobrist 해시 (MoveHistory.hash, 없으면 계산)
+        """
+        if self._is_easy(board, state_hash):
+            canon = self._lookup_direct(board)[1]
+            return None if canon is None else key_to_board(canon, len(board))
+        (count, canon), transform = self._lookup(board, state_hash)
+        if canon is None:
+            return None
+        return invert_transform(key_to_board(canon, len(board)), transform)
+
+    def count_solutions(self, board, state_hash=None):
+        """해의 개수를 2 까지만 세서 리턴"""
+        if self._is_easy(board, state_hash):
+            return self._lookup_direct(board)[0]
+        return self._lookup(board, state_hash)[0][0]
+
+    def has_unique_solution(self, board, state_hash=None):
+        """해가 정확히 하나인지 검사"""
+        return self.count_solutions(board, state_hash) == 1
+
+    def stats(self):
+        """hits / misses / direct / size 리턴"""
+        return {"hits": self.hits, "misses": self.misses,
+                "direct": self.direct, "size": len(self._entries)}
+
+    def clear(self):
+        self._entries.clear()
+        self._states.clear()
+        self.dead_ends.clear()
+        self.hits = 0
+        self.misses = 0
+        self.direct = 0
+
+    # 파일로 저장 (임시 파일에 쓰고 이름 바꾸기)
+    def save(self, path=None):
+        """캐시 내용을 JSON 파일로 저장. 저장할 파일이 없으면 아무것도 안 함"""
+        path = path or self.path
+        if path is None:
+            return
+        data = {key.hex(): [count, canon.hex() if canon else None]
+                for key, (count, canon) in self._entries.items()}
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp, path)
+
+    # 파일에서 불러오기
+    def load(self, path=None):
+        """JSON 파일에 저장된 캐시 불러오기"""
+        path = path or self.path
+        with open(path, "r") as file:
+            data = json.load(file)
+        for key, (count, canon) in data.items():
+            self._entries[bytes.fromhex(key)] = \
+                (count, bytes.fromhex(canon) if canon else None)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# ========================
+# 실행
+# ========================
+
+def bench(count, holes):
+    """퍼즐마다 원래 모양 한 번 + 대칭 변형 두 번 묻기
+
+    정규형을 쓰는 어려운 퍼즐은 변형도 hit, 쉬운 퍼즐은 같은 모양만 hit
+    """
+    # sudoku_seeded 가 sudoku9x9_final 을 import 하므로 여기서 import
+    from sudoku_seeded import generate_puzzle
+
+    rng = random.Random(0)
+    cache = SolverCache()
+    wrong = 0
+    start = time.perf_counter()
+    for seed in range(count):
+        _, puzzle = generate_puzzle(seed, holes)
+        for k in range(3):
+            transform = random_transform(rng) if k else None
+            board = apply_transform(puzzle, transform) if k else puzzle
+            found = cache.solve(board)
+            # 해가 여러 개일 수 있으므로 퍼즐의 힌트를 지키는 올바른 보드인지만 봄
+            wrong += found is None or not is_valid_board(found) or any(
+                v and v != w for row, found_row in zip(board, found)
+                for v, w in zip(row, found_row))
+    elapsed = time.perf_counter() - start
+    stats = cache.stats()
+    print(f"{count} puzzles x 3 orientations ({holes} holes) : "
+          f"hits {stats['hits']}, misses {stats['misses']}, "
+          f"keyed without canonical form {stats['direct']}, "
+          f"wrong answers {wrong}, {elapsed / (3 * count) * 1000:.2f} ms "
+          "per lookup")
+
+    # 게임처럼 한 칸씩 채우고 되돌리면서 수마다 두 번씩 묻기 (힌트 + 검사)
+    solution, puzzle = generate_puzzle(count, holes)
+    history = MoveHistory(puzzle)
+    empties = [(r, c) for r in range(9) for c in range(9) if not puzzle[r][c]]
+    cache = SolverCache(direct_ratio=0)
+    built = len(cache._states)
+    lookups = 0
+    start = time.perf_counter()
+    for r, c in empties[:8]:
+        history.record(r, c, solution[r][c])
+        for _ in range(2):
+            cache.count_solutions(history.board, history.hash)
+            lookups += 1
+    for _ in range(8):
+        history.undo()
+        cache.count_solutions(history.board, history.hash)
+        lookups += 1
+    elapsed = time.perf_counter() - start
+    print(f"{lookups} in-game lookups keyed by MoveHistory.hash : "
+          f"{len(cache._states) - built} canonical forms built, "
+          f"{elapsed / lookups * 1000:.2f} ms per lookup")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 60)
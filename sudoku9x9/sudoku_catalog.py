@@ -0,0 +1,251 @@
+# 스도쿠 팀 프로젝트 - 미리 만들어 두는 카탈로그 (4x4 전체 / 9x9 밴드 패턴)
+#
+# 4x4 카탈로그
+#   4x4 정답 보드는 모두 288 개 = 숫자 순서를 첫 줄 기준으로 맞춘 모양 12 개
+#   x 숫자 바꾸기 24 가지. 숫자를 바꿔도 "어느 칸을 보여 주면 답이 하나인지"
+#   는 그대로라서 모양 12 개에 대해서만 유일해 퍼즐을 구한다.
+#     1. 모양과 다른 보드 287 개가 다른 칸들의 집합(diff mask)을 구하고
+#        더 작은 집합을 포함하는 것은 버림 (최소 diff mask, 14 또는 26 개)
+#     2. 힌트 칸 집합(clue mask) 65536 개 중 모든 최소 diff mask 와
+#        겹치는 것만 유일해 퍼즐 (다른 보드와 구별되는 칸이 힌트에 있음)
+#   결과는 모양마다 65536 bit(8KB) 표로 저장한다.
+#
+#   파일 형식 (sudoku4x4_catalog.bin)
+#     헤더   : "<4sBBB" (매직 b"S4CT", 버전, 한 변 크기, 모양 수)
+#     모양   : 모양마다 16 칸을 4 bit 씩 8 bytes
+#     개수   : "<17I" 힌트 수 0~16 별 유일해 퍼즐 수 (모양 12 개 합)
+#     표     : 모양마다 8192 bytes 를 이어 붙여 zlib 으로 압축
+#              (모양 s, 힌트 mask m 은 s * 8192 + m // 8 번째 byte 의 m % 8 bit)
+#
+# 9x9 밴드 패턴 카탈로그
+#   밴드의 첫 블럭 숫자(칸 번호 0~8)가 둘째 블럭 세 줄에 나뉘는 방법 56 가지
+#   파일 형식 (sudoku_bands.bin) : "<4sBB" (매직 b"S9BP", 버전, 개수) 다음에
+#   패턴마다 "<HHHB" (둘째 블럭 줄마다 칸 번호 비트마스크, pure 여부)
+#
+# 사용법
+#   python sudoku_catalog.py grid4 [OUT]
+#   python sudoku_catalog.py bands [OUT]
+
+import os
+import random
+import struct
+import sys
+import zlib
+from itertools import combinations
+
+from sudoku_solver import count_solutions
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GRID4_FILE = os.path.normpath(os.path.join(HERE, os.pardir,
+                                           "sudoku4x4_catalog.bin"))
+BANDS_FILE = os.path.join(HERE, "sudoku_bands.bin")
+
+GRID4_MAGIC = b"S4CT"
+BANDS_MAGIC = b"S9BP"
+VERSION = 1
+GRID4_HEADER = struct.Struct("<4sBBB")
+CLUE_COUNTS = struct.Struct("<17I")
+BANDS_HEADER = struct.Struct("<4sBB")
+BAND_RECORD = struct.Struct("<HHHB")
+
+
+# ========================
+# 4x4 전체 보드
+# ========================
+
+# 모든 정답 보드
+def all_grids(base=2):
+    """한 줄로 펼친 정답 보드(튜플) 를 모두 리턴 (base=2 면 288 개)"""
+    side = base * base
+    cells = side * side
+    grid = [0] * cells
+    peers = []
+    for cell in range(cells):
+        r, c = divmod(cell, side)
+        box = (r // base * base, c // base * base)
+        peers.append({p for p in range(cell)
+                      if p // side == r or p % side == c or
+                      (p // side // base * base, p % side // base * base)
+                      == box})
+    grids = []
+
+    def fill(cell):
+        if cell == cells:
+            grids.append(tuple(grid))
+            return
+        taken = {grid[p] for p in peers[cell]}
+        for v in range(1, side + 1):
+            if v not in taken:
+                grid[cell] = v
+                fill(cell + 1)
+        grid[cell] = 0
+
+    fill(0)
+    return grids
+
+
+# 숫자 순서를 첫 줄 기준으로 맞추기
+def normalize(grid, side=4):
+    relabel = {v: k + 1 for k, v in enumerate(grid[:side])}
+    return tuple(relabel[v] for v in grid)
+
+
+# 두 보드가 다른 칸들
+def diff_mask(a, b):
+    return sum(1 << k for k in range(len(a)) if a[k] != b[k])
+
+
+# 최소 diff mask
+def minimal_diff_masks(shape, grids):
+    """shape 와 다른 보드들의 diff mask 중 다른 mask 를 포함하지 않는 것들"""
+    masks = {diff_mask(shape, grid) for grid in grids if grid != shape}
+    return sorted(m for m in masks
+                  if not any(o != m and o & m == o for o in masks))
+
+
+# 유일해 퍼즐 표
+def unique_clue_table(shape, grids):
+    """힌트 mask 마다 유일해인지 1 bit 로 적은 bytearray"""
+    minimal = minimal_diff_masks(shape, grids)
+    cells = len(shape)
+    table = bytearray((1 << cells) // 8)
+    for mask in range(1 << cells):
+        if all(mask & m for m in minimal):
+            table[mask >> 3] |= 1 << (mask & 7)
+    return table
+
+
+# mask -> 퍼즐 보드
+def mask_to_board(grid, mask, side=4):
+    return [[grid[r * side + c] if mask >> (r * side + c) & 1 else 0
+             for c in range(side)] for r in range(side)]
+
+
+def build_grid4(path=GRID4_FILE, check=2000):
+    """4x4 카탈로그 파일을 만들고 (보드 수, 모양 수, 힌트 수별 퍼즐 수) 리턴
+
+    check 개의 힌트 mask 를 풀이기로 다시 확인
+    """
+    grids = all_grids(2)
+    shapes = sorted({normalize(grid) for grid in grids})
+    tables = [unique_clue_table(shape, grids) for shape in shapes]
+    counts = [0] * 17
+    for table in tables:
+        for mask in range(1 << 16):
+            if table[mask >> 3] >> (mask & 7) & 1:
+                counts[bin(mask).count("1")] += 1
+
+    # 풀이기로 표 확인
+    rng = random.Random(0)
+    for _ in range(check):
+        s = rng.randrange(len(shapes))
+        mask = rng.randrange(1 << 16)
+        unique = count_solutions(mask_to_board(shapes[s], mask)) == 1
+        if unique != bool(tables[s][mask >> 3] >> (mask & 7) & 1):
+            raise AssertionError(f"catalog mismatch at shape {s}, "
+                                 f"mask {mask:#06x}")
+
+    with open(path, "wb") as file:
+        file.write(GRID4_HEADER.pack(GRID4_MAGIC, VERSION, 4, len(shapes)))
+        for shape in shapes:
+            file.write(bytes((shape[k] << 4) | shape[k + 1]
+                             for k in range(0, 16, 2)))
+        file.write(CLUE_COUNTS.pack(*counts))
+        file.write(zlib.compress(b"".join(tables), 9))
+    return len(grids), len(shapes), counts
+
+
+def read_grid4(path=GRID4_FILE):
+    """(모양 목록, 힌트 수별 퍼즐 수, 표 bytes) 리턴
+
+    모양은 16 칸 숫자 목록, 표는 build_grid4 의 압축을 푼 것
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, side, count = GRID4_HEADER.unpack_from(data)
+    if magic != GRID4_MAGIC or version != VERSION or side != 4:
+        raise ValueError(f"{path} is not a 4x4 catalog")
+    offset = GRID4_HEADER.size
+    shapes = []
+    for _ in range(count):
+        shape = []
+        for byte in data[offset:offset + 8]:
+            shape += [byte >> 4, byte & 15]
+        shapes.append(shape)
+        offset += 8
+    counts = CLUE_COUNTS.unpack_from(data, offset)
+    tables = zlib.decompress(data[offset + CLUE_COUNTS.size:])
+    if len(tables) != count * 8192:
+        raise ValueError(f"{path} has a damaged clue table")
+    return shapes, counts, tables
+
+
+# ========================
+# 9x9 밴드 패턴
+# ========================
+
+# 가능한 밴드 패턴 목록
+def band_patterns():
+    """첫 블럭 칸 번호(0~8) 가 둘째 블럭 각 줄에 어떻게 나뉘는지 (56 가지)
+
+    패턴은 둘째 블럭 세 줄의 칸 번호 비트마스크 튜플
+    """
+    patterns = []
+    everything = set(range(9))
+    for top in combinations(range(9), 3):
+        if set(top) & {0, 1, 2}:
+            continue
+        for middle in combinations(sorted(everything - set(top)), 3):
+            if set(middle) & {3, 4, 5}:
+                continue
+            bottom = everything - set(top) - set(middle)
+            if bottom & {6, 7, 8}:
+                continue
+            patterns.append(tuple(sum(1 << k for k in part)
+                                  for part in (top, middle, bottom)))
+    return sorted(patterns)
+
+
+# 첫 블럭의 한 줄이 둘째 블럭의 한 줄로 통째로 옮겨 갔는지
+def is_pure(pattern):
+    rows = {0b111, 0b111 << 3, 0b111 << 6}
+    return all(mask in rows for mask in pattern)
+
+
+def build_bands(path=BANDS_FILE):
+    patterns = band_patterns()
+    with open(path, "wb") as file:
+        file.write(BANDS_HEADER.pack(BANDS_MAGIC, VERSION, len(patterns)))
+        for pattern in patterns:
+            file.write(BAND_RECORD.pack(*pattern, is_pure(pattern)))
+    return patterns
+
+
+def read_bands(path=BANDS_FILE):
+    """[(패턴, pure 여부)] 리턴"""
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, count = BANDS_HEADER.unpack_from(data)
+    if magic != BANDS_MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a band pattern catalog")
+    records = BAND_RECORD.iter_unpack(data[BANDS_HEADER.size:])
+    return [(record[:3], bool(record[3])) for record in records][:count]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "grid4":
+        out = sys.argv[2] if len(sys.argv) > 2 else GRID4_FILE
+        total, shapes, counts = build_grid4(out)
+        print(f"{total} grids, {shapes} shapes, "
+              f"{sum(counts)} uniquely solvable clue masks "
+              f"(x 24 relabelings) -> {out} ({os.path.getsize(out)} bytes)")
+        for clues, count in enumerate(counts):
+            if count:
+                print(f"  {clues:>2} clues : {count * 24}")
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bands":
+        out = sys.argv[2] if len(sys.argv) > 2 else BANDS_FILE
+        patterns = build_bands(out)
+        pure = sum(1 for pattern in patterns if is_pure(pattern))
+        print(f"{len(patterns)} band patterns ({pure} pure) -> {out}")
+    else:
+        print("usage : python sudoku_catalog.py grid4 [OUT] | bands [OUT]")
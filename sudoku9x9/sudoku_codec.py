@@ -0,0 +1,284 @@
+# 스도쿠 팀 프로젝트 - 퍼즐 압축 코덱 (저장 / 전송용)
+#
+# 퍼즐 하나를 30~40 bytes 안팎으로 줄인다. (리스트 보드나 81 글자 텍스트 대신)
+#
+# 형식 (9x9 만)
+#   퍼즐 : 힌트 bitmap 11 bytes + 힌트 숫자들
+#          bitmap 은 81 bit 정수 (칸 0 이 가장 높은 bit), big-endian
+#          힌트 숫자 k 개를 (숫자 - 1) 로 바꿔 k 자리 9 진수 하나로 보고
+#          DIGIT_BYTES[k] bytes 에 big-endian 으로 저장
+#          (힌트 17 개 -> 18 bytes, 30 개 -> 23 bytes, 71 개 -> 40 bytes)
+#   정답 기준 퍼즐 : 정답 보드를 이미 알고 있으면 bitmap 11 bytes 만
+#   정답 : 81 칸을 (숫자 - 1) 81 자리 9 진수로 보고 33 bytes
+#
+# 여러 개를 한꺼번에 다룰 때는 칸 버퍼를 쓴다.
+#   칸 버퍼 : 퍼즐마다 81 bytes (칸 값 0~9, 0 은 빈칸) 를 이어 붙인 것
+#             bytes / bytearray / memoryview / array('B') 등 buffer 면 됨
+#   encode_many / decode_many : 칸 버퍼 <-> 퍼즐 레코드들을 이어 붙인 bytes
+#   encode_relative_many / decode_relative_many : 정답 기준 (bitmap 만)
+# 정답 기준 묶음 변환은 BLOCK 개씩 칸마다 모든 퍼즐을 한 번에 (큰 정수 연산으로)
+# 처리한다.
+#
+# 사용법 (속도 확인) : python sudoku_codec.py [퍼즐 수]
+
+import sys
+import time
+
+SIDE = 9
+CELLS = SIDE * SIDE
+BITMAP_BYTES = 11
+SOLUTION_BYTES = 33
+
+# 힌트 k 개의 9 진수에 필요한 bytes
+DIGIT_BYTES = [((9 ** k - 1).bit_length() + 7) // 8 for k in range(CELLS + 1)]
+
+# 칸 값(0~9) <-> 글자 "0"~"9"
+TO_TEXT = bytes.maketrans(bytes(range(10)), b"0123456789")
+FROM_TEXT = bytes.maketrans(b"0123456789", bytes(range(10)))
+TO_BITS = bytes.maketrans(b"0123456789", b"0111111111")
+# 힌트 숫자 "1"~"9" <-> 9 진수 자리 "0"~"8"
+DOWN = bytes.maketrans(b"123456789", b"012345678")
+UP = str.maketrans("012345678", "123456789")
+# 칸 값 -> 0 / 1, 0 / 0xFF
+NONZERO = bytes([0] + [1] * 255)
+ONE_TO_FF = bytes([0, 0xFF] + [0] * 254)
+
+# 정답 기준 묶음 변환에서 한 번에 처리할 퍼즐 수 (CPU 캐시에 맞는 크기)
+BLOCK = 1 << 14
+
+# 9 진수 5 자리 표 (디코딩은 5 자리씩)
+CHUNK = 9 ** 5
+_chunks = []
+
+
+def _chunk_table():
+    if not _chunks:
+        for value in range(CHUNK):
+            text = ""
+            for _ in range(5):
+                value, digit = divmod(value, 9)
+                text = str(digit) + text
+            _chunks.append(text)
+    return _chunks
+
+
+# 정수 -> 9 진수 length 자리 글자
+def _base9_text(value, length):
+    table = _chunk_table()
+    parts = []
+    while value:
+        value, chunk = divmod(value, CHUNK)
+        parts.append(table[chunk])
+    text = "".join(reversed(parts))
+    if len(text) > length:   # 5 자리씩 끊어서 생긴 앞쪽 0 버리기
+        return text[len(text) - length:]
+    return text.rjust(length, "0")
+
+
+# ========================
+# 한 개씩
+# ========================
+
+# 글자 칸 81 bytes -> 레코드
+def _encode_text(text):
+    bitmap = int(text.translate(TO_BITS), 2)
+    digits = text.translate(DOWN, b"0")
+    k = len(digits)
+    value = int(digits, 9) if k else 0
+    return bitmap.to_bytes(BITMAP_BYTES, "big") + \
+        value.to_bytes(DIGIT_BYTES[k], "big")
+
+
+# 레코드 -> (글자 칸 81 글자 str, 레코드 길이)
+def _decode_text(data, offset=0):
+    bitmap = int.from_bytes(data[offset:offset + BITMAP_BYTES], "big")
+    k = bitmap.bit_count()
+    start = offset + BITMAP_BYTES
+    value = int.from_bytes(data[start:start + DIGIT_BYTES[k]], "big")
+    digits = _base9_text(value, k).translate(UP)
+    text = format(bitmap, "081b").replace("1", "%c") % tuple(digits)
+    return text, BITMAP_BYTES + DIGIT_BYTES[k]
+
+
+def _board_cells(board):
+    return bytes(v for row in board for v in row)
+
+
+def _cells_board(cells):
+    return [list(cells[r * SIDE:(r + 1) * SIDE]) for r in range(SIDE)]
+
+
+# 퍼즐 -> bytes
+def encode_puzzle(board, solution=None):
+    """퍼즐 보드를 bytes 로. solution 을 주면 bitmap 11 bytes 만"""
+    if solution is not None:
+        return encode_relative_many(_board_cells(board),
+                                    _board_cells(solution))
+    return _encode_text(_board_cells(board).translate(TO_TEXT))
+
+
+# bytes -> 퍼즐
+def decode_puzzle(data, solution=None):
+    """encode_puzzle 의 반대 (solution 은 인코딩할 때와 같은 정답)"""
+    if solution is not None:
+        cells = decode_relative_many(data, _board_cells(solution))
+    else:
+        cells = _decode_text(data)[0].encode().translate(FROM_TEXT)
+    return _cells_board(cells)
+
+
+# 레코드 길이
+def record_size(data, offset=0):
+    """offset 에서 시작하는 퍼즐 레코드의 길이 (bitmap 만 보고 계산)"""
+    bitmap = int.from_bytes(data[offset:offset + BITMAP_BYTES], "big")
+    return BITMAP_BYTES + DIGIT_BYTES[bitmap.bit_count()]
+
+
+# 정답 -> 33 bytes
+def encode_solution(board):
+    text = _board_cells(board).translate(TO_TEXT).translate(DOWN)
+    return int(text, 9).to_bytes(SOLUTION_BYTES, "big")
+
+
+def decode_solution(data):
+    value = int.from_bytes(data[:SOLUTION_BYTES], "big")
+    text = _base9_text(value, CELLS).translate(UP)
+    return _cells_board(text.encode().translate(FROM_TEXT))
+
+
+# ========================
+# 여러 개씩
+# ========================
+
+def _as_bytes(buffer):
+    data = bytes(memoryview(buffer).cast("B"))
+    if len(data) % CELLS:
+        raise ValueError("cell buffer size must be a multiple of 81")
+    return data
+
+
+# 칸 버퍼 -> 레코드들
+def encode_many(cells):
+    """칸 버퍼(퍼즐마다 81 bytes) 를 퍼즐 레코드들로 이어 붙인 bytes"""
+    text = _as_bytes(cells).translate(TO_TEXT)
+    return b"".join([_encode_text(text[k:k + CELLS])
+                     for k in range(0, len(text), CELLS)])
+
+
+# 레코드들 -> 칸 버퍼
+def decode_many(data, count=None):
+    """encode_many 의 반대. count 개만 읽을 수 있음. bytearray 리턴"""
+    data = memoryview(data).cast("B")
+    texts = []
+    offset = 0
+    while offset < len(data) and (count is None or len(texts) < count):
+        text, size = _decode_text(data, offset)
+        texts.append(text)
+        offset += size
+    return bytearray("".join(texts).encode().translate(FROM_TEXT))
+
+
+# bitmap 의 칸 j 가 들어 있는 (byte 번호, bit 위치)
+def _bit_position(j):
+    # 81 bit 를 88 bit 에 오른쪽으로 붙였으므로 앞의 7 bit 는 비어 있음
+    return (j + 7) // 8, 7 - (j + 7) % 8
+
+
+# 정답 기준 : 칸 버퍼 -> bitmap 들
+def encode_relative_many(cells, solutions):
+    """퍼즐 칸 버퍼와 정답 칸 버퍼(같은 순서) -> 퍼즐마다 bitmap 11 bytes
+
+    힌트가 정답과 다르면 ValueError
+    """
+    cells = _as_bytes(cells)
+    solutions = _as_bytes(solutions)
+    if len(cells) != len(solutions):
+        raise ValueError("puzzle and solution buffers differ in size")
+    step = BLOCK * CELLS
+    return b"".join([_encode_relative_block(cells[k:k + step],
+                                            solutions[k:k + step])
+                     for k in range(0, len(cells), step)])
+
+
+def _encode_relative_block(cells, solutions):
+    count = len(cells) // CELLS
+    bits = cells.translate(NONZERO)
+    # 모든 퍼즐의 힌트가 정답과 같은지 한 번에 검사
+    shown = int.from_bytes(bits.translate(ONE_TO_FF), "big")
+    if (int.from_bytes(cells, "big") ^ int.from_bytes(solutions, "big")) \
+            & shown:
+        raise ValueError("a clue does not match its solution")
+    columns = [0] * BITMAP_BYTES
+    for j in range(CELLS):
+        byte, shift = _bit_position(j)
+        columns[byte] |= int.from_bytes(bits[j::CELLS], "big") << shift
+    out = bytearray(count * BITMAP_BYTES)
+    for byte, column in enumerate(columns):
+        out[byte::BITMAP_BYTES] = column.to_bytes(count, "big")
+    return out
+
+
+# 정답 기준 : bitmap 들 -> 칸 버퍼
+def decode_relative_many(data, solutions):
+    """encode_relative_many 의 반대. bytearray 칸 버퍼 리턴"""
+    data = bytes(memoryview(data).cast("B"))
+    solutions = _as_bytes(solutions)
+    if len(data) // BITMAP_BYTES * CELLS != len(solutions):
+        raise ValueError("bitmap and solution buffers differ in count")
+    out = bytearray()
+    for k in range(0, len(data), BLOCK * BITMAP_BYTES):
+        start = k // BITMAP_BYTES * CELLS
+        out += _decode_relative_block(
+            data[k:k + BLOCK * BITMAP_BYTES],
+            solutions[start:start + BLOCK * CELLS])
+    return out
+
+
+def _decode_relative_block(data, solutions):
+    count = len(data) // BITMAP_BYTES
+    ones = int.from_bytes(b"\x01" * count, "big")
+    columns = [int.from_bytes(data[byte::BITMAP_BYTES], "big")
+               for byte in range(BITMAP_BYTES)]
+    mask = bytearray(count * CELLS)
+    for j in range(CELLS):
+        byte, shift = _bit_position(j)
+        bit = (columns[byte] >> shift) & ones
+        mask[j::CELLS] = bit.to_bytes(count, "big")
+    shown = int.from_bytes(mask.translate(ONE_TO_FF), "big")
+    return (int.from_bytes(solutions, "big") & shown).to_bytes(
+        count * CELLS, "big")
+
+
+# ========================
+# 속도 확인
+# ========================
+
+def _bench(count):
+    from sudoku_seeded import generate_puzzle
+
+    bank = [generate_puzzle(seed, holes) for seed, holes in
+            zip(range(64), [10, 30, 50, 64] * 16)]
+    solutions = b"".join(_board_cells(s) for s, _ in bank) * \
+        (count // len(bank))
+    cells = b"".join(_board_cells(p) for _, p in bank) * (count // len(bank))
+    count = len(cells) // CELLS
+
+    start = time.perf_counter()
+    packed = encode_many(cells)
+    middle = time.perf_counter()
+    assert decode_many(packed) == cells
+    end = time.perf_counter()
+    print(f"plain    : {count} puzzles, {len(packed) / count:.1f} bytes each,"
+          f" encode {middle - start:.2f}s decode {end - middle:.2f}s")
+
+    start = time.perf_counter()
+    packed = encode_relative_many(cells, solutions)
+    middle = time.perf_counter()
+    assert decode_relative_many(packed, solutions) == cells
+    end = time.perf_counter()
+    print(f"relative : {count} puzzles, {len(packed) / count:.1f} bytes each,"
+          f" encode {middle - start:.2f}s decode {end - middle:.2f}s")
+
+
+if __name__ == "__main__":
+    _bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
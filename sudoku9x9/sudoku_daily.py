@@ -0,0 +1,314 @@
+# 스도쿠 팀 프로젝트 - 오늘의 도전(daily challenge) 기록 / 순위
+#
+# 날짜로 seed 를 정해서 그날은 모든 플레이어가 같은 퍼즐을 푼다.
+# 푼 시간은 멀티 모드처럼 BusRecorder 가 perf_counter 로 잰 값을 쓴다.
+#
+# 기록 쌓기 : 결과를 메모리에 모았다가 BATCH 개마다 (또는 flush 때)
+#             잠금을 잡고 날짜별 파일 끝에 한 번에 덧붙인다.
+# 순위     : 시간을 BUCKET_MS 단위 칸으로 나눈 Fenwick tree(구간 합 트리)에
+#             플레이어마다 가장 빠른 기록 하나씩 넣어 두고
+#             "나보다 빠른 사람 수 + 1" 을 O(log n) 으로 구한다.
+#             (같은 칸 안의 기록은 같은 순위)
+#             파일은 처음에 한 번 읽고, 그 뒤로는 새로 덧붙은 부분만 읽는다.
+# 게임에서는 이벤트 버스의 DailySink 가 날짜마다 writer 와 순위표를 하나씩
+# 프로세스가 끝날 때까지 들고 있다 (daily_result 이벤트)
+#
+# 파일 형식 (sudoku_daily_YYYYMMDD.bin)
+#   기록 : "<16sI" (이름 utf-8, 남는 자리는 0 / 걸린 시간 ms)
+#
+# 사용법
+#   python sudoku_daily.py rank 이름 [YYYY-MM-DD]
+#   python sudoku_daily.py top [YYYY-MM-DD]
+#   python sudoku_daily.py bench [기록 수]
+
+import datetime
+import hashlib
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+
+from sudoku_store import file_lock
+
+DAILY_HOLES = 10                  # 오늘의 도전은 난이도 3 (Advanced)
+BATCH = 1024                      # 이만큼 모이면 파일에 덧붙임
+BUCKET_MS = 100                   # 순위를 나누는 시간 단위
+MAX_MS = 4 * 60 * 60 * 1000       # 이보다 오래 걸린 기록은 마지막 칸
+BUCKETS = MAX_MS // BUCKET_MS + 1
+
+RECORD = struct.Struct("<16sI")
+
+
+# 날짜 -> seed (날짜가 같으면 어디서나 같은 퍼즐)
+def daily_seed(date):
+    digest = hashlib.blake2b(f"sudoku-daily-{date.isoformat()}".encode(),
+                             digest_size=8).digest()
+    return int.from_bytes(digest, "little") >> 1
+
+
+# 이름 -> 파일에 쓰는 16 bytes
+def _key(name):
+    return name.encode()[:16].ljust(16, b"\0")
+
+
+# 걸린 초 -> 파일에 쓰는 ms
+def _ms(seconds):
+    return min(int(seconds * 1000), 0xFFFFFFFF)
+
+
+def daily_path(date):
+    return f"sudoku_daily_{date:%Y%m%d}.bin"
+
+
+# ========================
+# Fenwick tree
+# ========================
+
+class FenwickTree:
+    """칸별 개수의 앞부분 합을 O(log n) 으로 구하고 바꾸는 트리"""
+
+    def __init__(self, size, counts=None):
+        self.size = size
+        self.tree = array('i', bytes(4 * (size + 1)))
+        if counts is not None:  # O(n) 으로 한 번에 만들기
+            tree = self.tree
+            for k, count in enumerate(counts, 1):
+                tree[k] += count
+                parent = k + (k & -k)
+                if parent <= size:
+                    tree[parent] += tree[k]
+
+    def add(self, k, delta):
+        """k 번 칸(0 부터)에 delta 더하기"""
+        tree = self.tree
+        k += 1
+        while k <= self.size:
+            tree[k] += delta
+            k += k & -k
+
+    def prefix(self, k):
+        """0 ~ k-1 번 칸의 합"""
+        tree = self.tree
+        total = 0
+        while k > 0:
+            total += tree[k]
+            k -= k & -k
+        return total
+
+
+# 걸린 시간(ms) -> 칸 번호
+def bucket(ms):
+    return min(ms // BUCKET_MS, BUCKETS - 1)
+
+
+# ========================
+# 기록 쌓기
+# ========================
+
+class DailyWriter:
+    """결과를 모았다가 BATCH 개마다 파일 끝에 한 번에 덧붙이기"""
+
+    def __init__(self, path, batch=BATCH):
+        self.path = path
+        self.batch = batch
+        self._buffer = bytearray()
+        self._count = 0
+
+    def add(self, name, seconds):
+        self._buffer += RECORD.pack(_key(name), _ms(seconds))
+        self._count += 1
+        if self._count >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        with file_lock(self.path):
+            with open(self.path, "ab") as file:
+                file.write(self._buffer)
+        self._buffer.clear()
+        self._count = 0
+
+
+# ========================
+# 순위
+# ========================
+
+class DailyBoard:
+    """하루치 기록의 순위표 (플레이어마다 가장 빠른 기록)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.best = {}            # 이름(16 bytes 그대로) -> 가장 빠른 ms
+        self.tree = FenwickTree(BUCKETS)
+        self.offset = 0           # 파일에서 읽은 곳까지
+        self.refresh()
+
+    def __len__(self):
+        return len(self.best)
+
+    def _submit(self, name, ms):
+        old = self.best.get(name)
+        if old is not None:
+            if old <= ms:
+                return
+            self.tree.add(bucket(old), -1)
+        self.best[name] = ms
+        self.tree.add(bucket(ms), 1)
+
+    def refresh(self):
+        """파일에 새로 덧붙은 기록 반영 (처음에는 전체를 읽고 트리를 한 번에 만듦)"""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            data = file.read()
+        data = data[:len(data) - len(data) % RECORD.size]
+        self.offset += len(data)
+        records = RECORD.iter_unpack(data)
+        if not self.best:
+            best = self.best
+            for name, ms in records:
+                old = best.get(name)
+                if old is None or ms < old:
+                    best[name] = ms
+            counts = array('i', bytes(4 * BUCKETS))
+            for ms in best.values():
+                counts[bucket(ms)] += 1
+            self.tree = FenwickTree(BUCKETS, counts)
+        else:
+            for name, ms in records:
+                self._submit(name, ms)
+        return len(data) // RECORD.size
+
+    def rank(self, name):
+        """(순위, 가장 빠른 ms, 참가자 수). 기록이 없으면 None"""
+        ms = self.best.get(_key(name))
+        if ms is None:
+            return None
+        return self.tree.prefix(bucket(ms)) + 1, ms, len(self.best)
+
+    def top(self, n=5):
+        """[(이름, ms)] 빠른 순"""
+        return [(name.rstrip(b"\0").decode(), ms) for name, ms in
+                sorted(self.best.items(), key=lambda item: item[1])[:n]]
+
+
+# ========================
+# 이벤트 버스 sink
+# ========================
+
+class DailySink:
+    """daily_result 이벤트를 날짜별 writer / 순위표 하나씩으로 모으기
+
+    writer 와 DailyBoard 는 처음 한 번만 만들고, flush 때 writer 를 비운 뒤
+    순위표는 파일에 새로 덧붙은 부분만 읽음 (다른 프로세스의 기록)
+    """
+
+    def __init__(self, batch=BATCH):
+        self.batch = batch
+        self._days = {}     # 날짜 -> (DailyWriter, DailyBoard)
+
+    def _day(self, date):
+        found = self._days.get(date)
+        if found is None:
+            path = daily_path(date)
+            found = self._days[date] = (DailyWriter(path, self.batch),
+                                        DailyBoard(path))
+        return found
+
+    def handle(self, event):
+        if event.kind != "daily_result":
+            return
+        data = event.data
+        writer, board = self._day(datetime.date.fromisoformat(data["date"]))
+        writer.add(data["player"], data["elapsed"])
+        board._submit(_key(data["player"]), _ms(data["elapsed"]))
+
+    def rank(self, date, name):
+        """DailyBoard.rank 와 같음 (버스를 flush 한 뒤에 부를 것)"""
+        return self._day(date)[1].rank(name)
+
+    def flush(self):
+        for writer, board in self._days.values():
+            writer.flush()
+            board.refresh()
+
+    def close(self):
+        self.flush()
+
+
+# ========================
+# 실행
+# ========================
+
+def _date(args):
+    return datetime.date.fromisoformat(args[0]) if args else \
+        datetime.date.today()
+
+
+def show_rank(name, date):
+    found = DailyBoard(daily_path(date)).rank(name)
+    if found is None:
+        print(f"{name} : no result on {date}")
+    else:
+        rank, ms, total = found
+        print(f"{name} : rank {rank} of {total} on {date} ({ms / 1000:.2f}s)")
+
+
+def show_top(date, n=10):
+    board = DailyBoard(daily_path(date))
+    print(f"daily challenge {date} : {len(board)} players")
+    for rank, (name, ms) in enumerate(board.top(n), 1):
+        print(f"ranked {rank} name : {name} time : {ms / 1000:.2f}s")
+
+
+def bench(count):
+    rng = random.Random(0)
+    path = f"bench.{os.getpid()}.daily"
+    try:
+        writer = DailyWriter(path)
+        names = [f"p{k}" for k in range(count)]
+        start = time.perf_counter()
+        for name in names:
+            writer.add(name, rng.lognormvariate(6, 0.5))
+        writer.flush()
+        ingest = time.perf_counter() - start
+
+        start = time.perf_counter()
+        board = DailyBoard(path)
+        loaded = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names[:10000]:
+            board.rank(name)
+        ranked = (time.perf_counter() - start) / 10000
+
+        writer = DailyWriter(path)
+        for name in names[:1000]:
+            writer.add(name, rng.lognormvariate(5, 0.5))
+        writer.flush()
+        start = time.perf_counter()
+        board.refresh()
+        refreshed = time.perf_counter() - start
+        print(f"{count} results : ingest {count / ingest:,.0f}/s, "
+              f"load {loaded * 1000:.0f} ms, rank {ranked * 1e6:.1f} us, "
+              f"refresh 1000 new results {refreshed * 1000:.1f} ms")
+    finally:
+        for leftover in (path, path + ".lock"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "rank":
+        show_rank(sys.argv[2], _date(sys.argv[3:]))
+    elif len(sys.argv) >= 2 and sys.argv[1] == "top":
+        show_top(_date(sys.argv[2:]))
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 300000)
+    else:
+        print("usage : python sudoku_daily.py rank name [date] | top [date]"
+              " | bench [results]")
@@ -0,0 +1,134 @@
+# 스도쿠 팀 프로젝트 - 대칭 변환으로 늘린 퍼즐 데이터셋 내보내기
+#
+# 기본 퍼즐들에 대칭군에서 뽑은 무작위 변환을 적용해서
+# 같은 난이도의 다른 모양 퍼즐을 원하는 만큼 만들어 낸다.
+# 변형 퍼즐은 generator 로 하나씩 만들어 바로 파일에 쓰기 때문에
+# 몇 개를 만들든 메모리는 기본 퍼즐 + 쓰기 버퍼 크기로 일정하다.
+# (파일 쓰기가 느리면 generator 도 그만큼 천천히 돌아감)
+#
+# 출력 형식
+#   ndjson : {"base": 기본 퍼즐 번호, "puzzle": "0 은 빈칸인 81 글자"}
+#   packed : 퍼즐 하나당 칸 두 개를 1 byte 에 (상위 4 bit, 하위 4 bit) 41 bytes
+#   codec  : sudoku_codec 의 퍼즐 레코드 (힌트 bitmap + 힌트 숫자, 18~44 bytes)
+#
+# 사용법 : python sudoku_dataset.py BANK COUNT OUT [ndjson|packed|codec] [SEED]
+
+import json
+import random
+import sys
+
+from sudoku_codec import encode_puzzle
+from sudoku_seeded import board_to_string, string_to_board
+from sudoku_symmetry import apply_transform, random_transform
+
+FLUSH_EVERY = 4096
+
+
+# ========================
+# 변형 퍼즐 만들기
+# ========================
+
+# 기본 퍼즐 읽기
+def load_bank(path):
+    """sudoku_seeded 형식의 NDJSON 에서 퍼즐 보드 목록 읽기"""
+    bank = []
+    with open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                bank.append(string_to_board(json.loads(line)["puzzle"]))
+    return bank
+
+
+# 변형 퍼즐 하나씩 만들기
+def iter_variants(bank, count, seed=0):
+    """(기본 퍼즐 번호, 변형 보드) 를 count 개 차례로 리턴"""
+    rng = random.Random(seed)
+    for k in range(count):
+        index = k % len(bank)
+        board = bank[index]
+        yield index, apply_transform(board, random_transform(rng, len(board)))
+
+
+# ========================
+# 파일로 내보내기
+# ========================
+
+# 보드 -> 41 bytes
+def pack_board(board):
+    cells = [v for row in board for v in row]
+    if len(cells) % 2:
+        cells.append(0)
+    return bytes((cells[k] << 4) | cells[k + 1]
+                 for k in range(0, len(cells), 2))
+
+
+# 41 bytes -> 보드
+def unpack_board(data, side=9):
+    cells = []
+    for byte in data:
+        cells.append(byte >> 4)
+        cells.append(byte & 0x0F)
+    return [cells[r * side:(r + 1) * side] for r in range(side)]
+
+
+def write_ndjson(variants, file):
+    """변형 퍼즐을 NDJSON 으로 쓰고 개수 리턴"""
+    buffer = []
+    count = 0
+    for index, board in variants:
+        buffer.append(json.dumps({"base": index,
+                                  "puzzle": board_to_string(board)}) + "\n")
+        count += 1
+        if len(buffer) >= FLUSH_EVERY:
+            file.write("".join(buffer))
+            buffer.clear()
+    file.write("".join(buffer))
+    return count
+
+
+def write_packed(variants, file):
+    """변형 퍼즐을 41 bytes 씩 이어서 쓰고 개수 리턴"""
+    buffer = bytearray()
+    count = 0
+    for _, board in variants:
+        buffer += pack_board(board)
+        count += 1
+        if count % FLUSH_EVERY == 0:
+            file.write(buffer)
+            buffer.clear()
+    file.write(buffer)
+    return count
+
+
+def write_codec(variants, file):
+    """변형 퍼즐을 sudoku_codec 레코드로 이어서 쓰고 개수 리턴"""
+    buffer = bytearray()
+    count = 0
+    for _, board in variants:
+        buffer += encode_puzzle(board)
+        count += 1
+        if count % FLUSH_EVERY == 0:
+            file.write(buffer)
+            buffer.clear()
+    file.write(buffer)
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("usage : python sudoku_dataset.py BANK COUNT OUT "
+              "[ndjson|packed|codec] [SEED]")
+        sys.exit(1)
+    bank = load_bank(sys.argv[1])
+    count = int(sys.argv[2])
+    fmt = sys.argv[4] if len(sys.argv) > 4 else "ndjson"
+    seed = int(sys.argv[5]) if len(sys.argv) > 5 else 0
+    variants = iter_variants(bank, count, seed)
+    if fmt in ("packed", "codec"):
+        write = write_packed if fmt == "packed" else write_codec
+        with open(sys.argv[3], "wb") as out:
+            written = write(variants, out)
+    else:
+        with open(sys.argv[3], "w") as out:
+            written = write_ndjson(variants, out)
+    print(f"{written} puzzles from {len(bank)} base puzzles")
@@ -0,0 +1,247 @@
+# 스도쿠 팀 프로젝트 - 게임 이벤트 버스
+#
+# 입력을 받는 게임 루프는 일이 생기면 이벤트만 큐에 넣고 바로 돌아간다.
+# 파일 쓰기(리플레이, 타임라인, 회원 기록, 감사 로그) 같은 느린 일은
+# 뒤에서 도는 스레드 하나가 큐에서 꺼내 sink 들에게 나눠 준다.
+#
+# 이벤트 종류 : login, game_started(남은 도전기회 포함), move_made, history,
+#               game_finished, match_finished (멀티 모드 승패),
+#               daily_result (오늘의 도전 기록)
+# 리플레이 / 실수 지도 / 관전처럼 모든 수가 있어야 하는 sink 가 있으므로
+# 이벤트는 버리지 않는다. 큐가 가득 차면 자리가 날 때까지 기다림 (waits 로 셈)
+# 사람이 입력하는 속도로는 큐가 차지 않으므로 기다리는 것은 batch 입력뿐
+# sink 가 실패한 횟수(errors)는 close() 때 남아 있으면 stderr 로 알린다.
+#
+# sink 는 handle(event) 와 flush() 만 있으면 된다.
+# close() 를 부르면 큐에 남은 이벤트를 모두 처리하고 sink 들을 flush 한다.
+# (close() 가 있는 sink 는 그 뒤에 close 도 부름 - 소켓 등 정리)
+
+import itertools
+import json
+import queue
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+
+from sudoku_replay import ReplayRecorder
+from sudoku_stats import GameTimeline, record_timeline
+
+AUDIT_FILE = "sudoku_audit.ndjson"
+
+Event = namedtuple("Event", "kind time data")
+
+_STOP = object()
+_game_ids = itertools.count(1)
+
+
+# ========================
+# 이벤트 버스
+# ========================
+
+class EventBus:
+    """크기가 정해진 큐 + 뒤에서 sink 들에게 이벤트를 나눠 주는 스레드"""
+
+    def __init__(self, sinks=(), maxsize=4096):
+        self.sinks = list(sinks)
+        self.waits = 0          # 큐가 가득 차서 publish 가 기다린 횟수
+        self.errors = 0         # sink 가 예외를 낸 횟수
+        self.last_error = None
+        self._queue = queue.Queue(maxsize)
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def publish(self, kind, **data):
+        """이벤트 넣기 (큐가 가득 차면 자리가 날 때까지 기다림)"""
+        event = Event(kind, time.perf_counter(), data)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.waits += 1
+            self._queue.put(event)
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            try:
+                if event is _STOP:
+                    return
+                for sink in self.sinks:
+                    try:
+                        sink.handle(event)
+                    except Exception as exc:
+                        # sink 하나가 실패해도 게임과 다른 sink 는 계속
+                        self.errors += 1
+                        self.last_error = f"{type(sink).__name__} : {exc!r}"
+            finally:
+                self._queue.task_done()
+
+    def stats(self):
+        """--metrics 로 내보낼 {"waits": .., "errors": ..}"""
+        return {"waits": self.waits, "errors": self.errors}
+
+    def flush(self):
+        """지금까지 넣은 이벤트를 모두 처리하고 sink 들을 flush"""
+        self._queue.join()
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        self.flush()
+        self._queue.put(_STOP)
+        self._worker.join()
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+        if self.errors:
+            print(f"warning : event sinks failed {self.errors} times "
+                  f"(last {self.last_error})", file=sys.stderr)
+
+
+# ========================
+# sudoku_mini 용 recorder
+# ========================
+
+class BusRecorder:
+    """sudoku_mini 의 recorder 호출을 이벤트로 바꿔서 버스에 넣기"""
+
+    def __init__(self, bus, player=None, password=None):
+        self.bus = bus
+        self.player = player
+        self.password = password
+        self.game = next(_game_ids)
+        self.elapsed = 0.0
+        self.seed = None        # 시작한 퍼즐 (seed, 구멍 수)
+        self.holes = None
+        self._start = None
+
+    def start(self, puzzle_board, solution_board, no_of_holes, seed,
+              try_points):
+        self._start = time.perf_counter()
+        self.seed = seed
+        self.holes = no_of_holes
+        self.bus.publish("game_started", game=self.game, player=self.player,
+                         puzzle=[row[:] for row in puzzle_board],
+                         solution=[row[:] for row in solution_board],
+                         holes=no_of_holes, seed=seed, try_points=try_points)
+
+    def move(self, i, j, n, correct):
+        self.bus.publish("move_made", game=self.game, row=i, col=j,
+                         number=n, correct=correct)
+
+    def history(self, command):
+        self.bus.publish("history", game=self.game, command=command)
+
+    def finish(self, result):
+        self.elapsed = time.perf_counter() - self._start
+        self.bus.publish("game_finished", game=self.game, player=self.player,
+                         password=self.password, result=result,
+                         elapsed=self.elapsed)
+
+
+# ========================
+# sink
+# ========================
+
+class RecorderSink:
+    """게임마다 recorder 를 하나 만들어 이벤트를 recorder 호출로 되돌림"""
+
+    def __init__(self, make_recorder, on_finish=None):
+        self.make_recorder = make_recorder
+        self.on_finish = on_finish
+        self._games = {}
+
+    def handle(self, event):
+        data = event.data
+        if event.kind == "game_started":
+            recorder = self.make_recorder(data)
+            recorder.start(data["puzzle"], data["solution"], data["holes"],
+                           data["seed"], now=event.time)
+            self._games[data["game"]] = recorder
+            return
+        recorder = self._games.get(data.get("game"))
+        if recorder is None:
+            return
+        if event.kind == "move_made":
+            recorder.move(data["row"], data["col"], data["number"],
+                          data["correct"], now=event.time)
+        elif event.kind == "history":
+            recorder.history(data["command"], now=event.time)
+        elif event.kind == "game_finished":
+            recorder.finish(data["result"], now=event.time)
+            del self._games[data["game"]]
+            if self.on_finish is not None:
+                self.on_finish(recorder)
+
+    def flush(self):
+        pass
+
+
+def replay_sink():
+    """모든 게임을 sudoku_replays.bin 에 기록"""
+    return RecorderSink(lambda data: ReplayRecorder())
+
+
+def timeline_sink():
+    """모든 게임의 타임라인과 풀이 시간 통계 기록"""
+    return RecorderSink(lambda data: GameTimeline(data["player"]),
+                        record_timeline)
+
+
+class MemberStoreSink:
+    """로그인한 플레이어의 게임 결과를 회원 기록에 반영 (중도 포기는 제외)"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def handle(self, event):
+        data = event.data
+        if event.kind != "game_finished" or data["player"] is None:
+            return
+        if data["result"] != 0:
+            self.store.record_game(data["player"], data["password"],
+                                   data["result"] == 1)
+
+    def flush(self):
+        pass
+
+
+class MetricsSink:
+    """이벤트 종류별 개수 세기"""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def handle(self, event):
+        self.counts[event.kind] += 1
+        if event.kind == "game_finished":
+            self.counts[f"result_{event.data['result']}"] += 1
+
+    def flush(self):
+        pass
+
+
+class AuditSink:
+    """이벤트를 한 줄씩 JSON 으로 남기기 (비밀번호와 보드는 빼고)"""
+
+    hidden = ("password", "puzzle", "solution")
+
+    def __init__(self, path=AUDIT_FILE):
+        self.path = path
+        self._lines = []
+        # perf_counter 값 -> 실제 시각
+        self._offset = time.time() - time.perf_counter()
+
+    def handle(self, event):
+        data = {k: v for k, v in event.data.items() if k not in self.hidden}
+        data["event"] = event.kind
+        data["time"] = round(event.time + self._offset, 3)
+        self._lines.append(json.dumps(data))
+        if len(self._lines) >= 256:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            with open(self.path, "a") as file:
+                file.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
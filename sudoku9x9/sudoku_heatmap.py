@@ -0,0 +1,250 @@
+# 스도쿠 팀 프로젝트 - 칸별 실수 지도(heatmap)
+#
+# sudoku_mini 의 "Wrong number!" 를 버리지 않고 (난이도, 칸, 숫자) 별로
+# 틀린 횟수 / 맞은 횟수를 센다. 카운터는 처음에 한 번 만든 고정 크기
+# array 라서 게임을 몇 판 하든 메모리가 늘지 않는다.
+#   3 난이도 x 81 칸 x 9 숫자 x (틀림, 맞음) = 4374 칸 (8 bytes 씩, 약 35KB)
+#
+# 이벤트 버스의 HeatmapSink 가 수를 칸 번호로만 바꿔 모아 두었다가
+# BATCH 개마다 한꺼번에 더하고, flush 때 파일(잠금 + 증가분 더하기)에 저장
+# 칸이 판 밖이거나 숫자가 1~9 가 아닌 수는 세지 않고 건너뜀 (invalid 로 셈)
+#
+# 사용법
+#   python sudoku_heatmap.py show [난이도]     칸별 오답률과 가장 어려운 칸
+#   python sudoku_heatmap.py bench [수의 개수]  수 반영 속도 확인
+
+import os
+import random
+import sys
+import time
+from array import array
+from collections import Counter
+
+from sudoku_stats import LEVEL_BY_HOLES
+from sudoku_store import file_lock
+
+HEATMAP_FILE = "sudoku_heatmap.bin"
+
+LEVELS = 3
+SIDE = 9
+CELLS = SIDE * SIDE
+BATCH = 4096        # 이만큼 모이면 카운터에 반영
+
+
+# ========================
+# 카운터
+# ========================
+
+class MistakeHeatmap:
+    """(난이도, 칸, 숫자, 정답 여부) 별 횟수"""
+
+    size = LEVELS * CELLS * SIDE * 2
+
+    def __init__(self, counts=None):
+        self.counts = counts if counts is not None else \
+            array('Q', bytes(8 * self.size))
+
+    # (난이도 1~3, 칸 번호, 숫자 1~9, 정답 여부) -> 카운터 번호
+    @staticmethod
+    def index(level, cell, digit, correct):
+        """범위를 벗어난 값이면 ValueError (다른 칸의 카운터를 세지 않도록)"""
+        if not (1 <= level <= LEVELS and 0 <= cell < CELLS and
+                1 <= digit <= SIDE):
+            raise ValueError(f"bad heatmap entry : level {level}, "
+                             f"cell {cell}, digit {digit}")
+        return (((level - 1) * CELLS + cell) * SIDE + digit - 1) * 2 + correct
+
+    def add(self, indexes):
+        """index() 로 만든 카운터 번호들을 한꺼번에 더하기"""
+        counts = self.counts
+        for k, c in Counter(indexes).items():
+            counts[k] += c
+
+    def merge(self, other):
+        counts = self.counts
+        for k, c in enumerate(other.counts):
+            if c:
+                counts[k] += c
+
+    def clear(self):
+        self.counts = array('Q', bytes(8 * self.size))
+
+    # 한 칸의 숫자별 (틀린 횟수 목록, 맞은 횟수 목록)
+    def digit_counts(self, level, cell):
+        start = self.index(level, cell, 1, 0)
+        block = self.counts[start:start + SIDE * 2]
+        return list(block[0::2]), list(block[1::2])
+
+    def cell_totals(self, level):
+        """칸마다 (틀린 횟수, 맞은 횟수) 81 개"""
+        totals = []
+        for cell in range(CELLS):
+            wrong, right = self.digit_counts(level, cell)
+            totals.append((sum(wrong), sum(right)))
+        return totals
+
+    def hardest_cells(self, level, board=None, top=5, min_attempts=1):
+        """오답률이 높은 칸 (오답률, 행, 열, 틀림, 맞음) 목록
+
+        board 를 넘기면 그 퍼즐의 빈칸 중에서만 고름
+        """
+        ranked = []
+        for cell, (wrong, right) in enumerate(self.cell_totals(level)):
+            i, j = divmod(cell, SIDE)
+            if board is not None and board[i][j] != 0:
+                continue
+            if wrong + right < min_attempts or wrong + right == 0:
+                continue
+            ranked.append((wrong / (wrong + right), i, j, wrong, right))
+        ranked.sort(key=lambda item: (-item[0], -item[3]))
+        return ranked[:top]
+
+    # 파일 형식 : little-endian 8 byte 카운터 size 개
+    def to_bytes(self):
+        counts = array('Q', self.counts)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        return counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        counts = array('Q')
+        counts.frombytes(data)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        if len(counts) != cls.size:
+            raise ValueError("heatmap file has a different layout")
+        return cls(counts)
+
+
+# 파일 읽기 (없으면 빈 카운터)
+def load_heatmap(path=HEATMAP_FILE):
+    if not os.path.exists(path):
+        return MistakeHeatmap()
+    with open(path, "rb") as file:
+        return MistakeHeatmap.from_bytes(file.read())
+
+
+# 잠금 상태에서 증가분 더하기
+def add_to_file(delta, path=HEATMAP_FILE):
+    with file_lock(path):
+        heatmap = load_heatmap(path)
+        heatmap.merge(delta)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(heatmap.to_bytes())
+        os.replace(tmp, path)
+    return heatmap
+
+
+# ========================
+# 이벤트 버스 sink
+# ========================
+
+class HeatmapSink:
+    """move_made 이벤트를 모아서 실수 지도에 반영"""
+
+    def __init__(self, path=HEATMAP_FILE, batch=BATCH):
+        self.path = path
+        self.batch = batch
+        self.delta = MistakeHeatmap()   # 아직 파일에 저장하지 않은 횟수
+        self.skipped = 0                # 난이도를 모르는 게임의 수
+        self.invalid = 0                # 칸이나 숫자가 범위 밖인 수
+        self._pending = array('H')
+        self._levels = {}               # 진행 중인 게임 -> 난이도
+
+    def handle(self, event):
+        data = event.data
+        if event.kind == "move_made":
+            level = self._levels.get(data["game"])
+            if level is None:
+                self.skipped += 1
+                return
+            row, col = data["row"], data["col"]
+            if not (0 <= row < SIDE and 0 <= col < SIDE):
+                self.invalid += 1
+                return
+            try:
+                index = MistakeHeatmap.index(level, row * SIDE + col,
+                                             data["number"],
+                                             bool(data["correct"]))
+            except ValueError:
+                self.invalid += 1
+                return
+            self._pending.append(index)
+            if len(self._pending) >= self.batch:
+                self._apply()
+        elif event.kind == "game_started":
+            level = LEVEL_BY_HOLES.get(data["holes"])
+            if level is not None:
+                self._levels[data["game"]] = level
+        elif event.kind == "game_finished":
+            self._levels.pop(data["game"], None)
+
+    def _apply(self):
+        self.delta.add(self._pending)
+        del self._pending[:]
+
+    def flush(self):
+        self._apply()
+        if any(self.delta.counts):
+            add_to_file(self.delta, self.path)
+            self.delta.clear()
+
+
+# ========================
+# 출력
+# ========================
+
+def show(level=None, path=HEATMAP_FILE):
+    """난이도별 칸 오답률(%) 지도와 가장 어려운 칸 출력"""
+    heatmap = load_heatmap(path)
+    for lv in ([level] if level else range(1, LEVELS + 1)):
+        totals = heatmap.cell_totals(lv)
+        if not any(w + r for w, r in totals):
+            continue
+        print(f"level {lv} : wrong answers per 100 attempts")
+        print("     " + "".join(f"{c + 1:>4}" for c in range(SIDE)))
+        for i in range(SIDE):
+            row = totals[i * SIDE:(i + 1) * SIDE]
+            print(f"{i + 1:>4} " + "".join(
+                f"{100 * w // (w + r):>4}" if w + r else "   ."
+                for w, r in row))
+        print("hardest cells :")
+        for rate, i, j, wrong, right in heatmap.hardest_cells(lv):
+            wrong_digits, _ = heatmap.digit_counts(lv, i * SIDE + j)
+            digit = wrong_digits.index(max(wrong_digits)) + 1
+            print(f"  ({i + 1}, {j + 1}) {rate:6.1%} wrong {wrong} "
+                  f"right {right}, most tried wrong digit {digit}")
+        print()
+
+
+# 수 반영 속도
+def bench(moves):
+    from sudoku_events import Event
+
+    rng = random.Random(0)
+    sink = HeatmapSink(os.devnull)
+    sink.handle(Event("game_started", 0.0, {"game": 1, "holes": 10}))
+    events = [Event("move_made", 0.0,
+                    {"game": 1, "row": rng.randrange(9),
+                     "col": rng.randrange(9), "number": rng.randrange(1, 10),
+                     "correct": rng.random() < 0.7})
+              for _ in range(min(moves, 100000))]
+    start = time.perf_counter()
+    for k in range(moves):
+        sink.handle(events[k % len(events)])
+    sink._apply()
+    elapsed = time.perf_counter() - start
+    print(f"{moves} moves in {elapsed:.3f}s "
+          f"({moves / elapsed * 60:,.0f} moves/minute), "
+          f"total {sum(sink.delta.counts)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "show":
+        show(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+    else:
+        print("usage : python sudoku_heatmap.py show [level] | bench [moves]")
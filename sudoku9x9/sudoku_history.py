@@ -0,0 +1,93 @@
+# 스도쿠 팀 프로젝트 - 되돌리기 / 다시하기(undo / redo) 기록
+#
+# 한 수마다 보드 전체를 복사하지 않고 (칸 번호, 이전 값, 새 값) 만 저장한다.
+# 칸 수만큼의 수마다 보드를 bytes 로 한 번 찍어 두어서(snapshot)
+# 어느 시점이든 가장 가까운 스냅샷 + 최대 한 구간의 수만 다시 두면 복원된다.
+#
+# 25x25 보드에서 수 하나는 4 bytes, 스냅샷은 625 수마다 625 bytes
+# 이므로 수천 수를 두어도 보드 몇 개 크기 정도만 쓴다.
+
+from array import array
+
+from sudoku_zobrist import board_hash, update_hash
+
+
+# 보드 -> bytes
+def board_to_bytes(board):
+    """보드를 한 줄로 펼친 bytes 로 바꾸기"""
+    return bytes(v for row in board for v in row)
+
+
+class MoveHistory:
+    """보드에 둔 수를 기록하고 되돌리기 / 다시하기 / 복원을 지원"""
+
+    def __init__(self, board, snapshot_every=None):
+        self.board = board
+        self.side = len(board)
+        self.snapshot_every = snapshot_every or self.side * self.side
+        self.position = 0             # 지금까지 적용된 수의 개수
+        self._cells = array('H')      # 칸 번호 r * side + c
+        self._old = array('B')
+        self._new = array('B')
+        self._snapshots = [board_to_bytes(board)]
+        # 지금 보드의 Zobrist 해시 (SolverCache 의 state_hash 로 넘기는 키)
+        self.hash = board_hash(board)
+
+    def __len__(self):
+        return len(self._cells)
+
+    # 칸 값 바꾸기 (해시도 같이 갱신)
+    def _set(self, cell, value):
+        r, c = divmod(cell, self.side)
+        self.hash = update_hash(self.hash, self.side, cell,
+                                self.board[r][c], value)
+        self.board[r][c] = value
+
+    def record(self, i, j, value):
+        """(i, j) 에 value 를 두고 기록. 되돌린 뒤 새로 두면 redo 기록은 버림"""
+        if self.position < len(self._cells):
+            del self._cells[self.position:]
+            del self._old[self.position:]
+            del self._new[self.position:]
+            del self._snapshots[self.position // self.snapshot_every + 1:]
+        cell = i * self.side + j
+        self._cells.append(cell)
+        self._old.append(self.board[i][j])
+        self._new.append(value)
+        self._set(cell, value)
+        self.position += 1
+        if self.position % self.snapshot_every == 0:
+            self._snapshots.append(board_to_bytes(self.board))
+
+    def undo(self):
+        """마지막 수를 되돌리고 (i, j, 이전 값, 되돌린 값) 리턴. 없으면 None"""
+        if self.position == 0:
+            return None
+        self.position -= 1
+        cell = self._cells[self.position]
+        self._set(cell, self._old[self.position])
+        i, j = divmod(cell, self.side)
+        return i, j, self._new[self.position], self._old[self.position]
+
+    def redo(self):
+        """되돌린 수를 다시 두고 (i, j, 이전 값, 새 값) 리턴. 없으면 None"""
+        if self.position == len(self._cells):
+            return None
+        cell = self._cells[self.position]
+        self._set(cell, self._new[self.position])
+        self.position += 1
+        i, j = divmod(cell, self.side)
+        return i, j, self._old[self.position - 1], self._new[self.position - 1]
+
+    def restore(self, position):
+        """position 번째 수까지 둔 상태로 보드 복원"""
+        if not 0 <= position <= len(self._cells):
+            raise IndexError("history position out of range")
+        k = min(position // self.snapshot_every, len(self._snapshots) - 1)
+        snapshot = self._snapshots[k]
+        for cell, value in enumerate(snapshot):
+            if self.board[cell // self.side][cell % self.side] != value:
+                self._set(cell, value)
+        for p in range(k * self.snapshot_every, position):
+            self._set(self._cells[p], self._new[p])
+        self.position = position
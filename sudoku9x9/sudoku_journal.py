@@ -0,0 +1,199 @@
+# 스도쿠 팀 프로젝트 - 진행 중인 게임의 체크포인트 기록(journal) / 이어하기
+#
+# sudoku_mini 도중에 프로세스가 죽으면 게임도, 회원 기록도 날아간다.
+# 그래서 수를 둘 때마다 작은 기록 하나를 journal 파일 끝에 덧붙인다.
+#   - 파일 쓰기는 os.write 한 번 (운영체제에 넘기면 프로세스가 죽어도 남음)
+#   - 디스크까지 확실히 쓰는 fsync 는 뒤에서 도는 스레드가
+#     SYNC_INTERVAL 마다 한 번씩 모아서 함 (입력 루프는 기다리지 않음)
+# 게임이 끝나면(승리, 패배, 그만두기) journal 을 지우고,
+# 다음에 같은 플레이어가 로그인할 때 journal 이 남아 있으면 이어할지 묻는다.
+#
+# 파일 형식 (플레이어마다 sudoku_journal.<이름 hex>.bin, little-endian)
+#   헤더 : "<4sBBBxq" (매직 b"SDKJ", 버전, 구멍 수, 도전기회, 퍼즐 번호(seed))
+#   기록 : "<BBBB" (칸 번호, 그 칸의 지금 값, 남은 도전기회, 검사 byte)
+#          틀린 수는 값 0 으로, 되돌리기 / 다시하기는 바뀐 칸의 새 값으로 남김
+#   마지막 기록이 중간에 잘렸거나 검사 byte 가 틀리면 그 앞까지만 읽는다.
+#
+# 사용법
+#   python sudoku_journal.py show 이름
+#   python sudoku_journal.py bench [수의 개수]
+
+import os
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+
+MAGIC = b"SDKJ"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBxq")
+RECORD = struct.Struct("<BBBB")
+
+SYNC_INTERVAL = 0.5    # fsync 를 모아서 하는 간격 (초)
+
+SavedGame = namedtuple("SavedGame", "seed holes try_points cells moves")
+
+
+# 플레이어 -> journal 파일 이름
+def journal_path(player):
+    return f"sudoku_journal.{player.encode().hex()}.bin"
+
+
+# 기록 한 개 (검사 byte 포함)
+def _record(cell, value, try_points):
+    return RECORD.pack(cell, value, try_points,
+                       cell ^ value ^ try_points ^ 0xA5)
+
+
+# ========================
+# 쓰기
+# ========================
+
+class GameJournal:
+    """한 플레이어의 진행 중인 게임 기록"""
+
+    def __init__(self, path, interval=SYNC_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.synced = 0            # fsync 한 횟수
+        self._fd = None
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._thread = None
+
+    def start(self, seed, holes, try_points, filled=()):
+        """새 journal 시작. filled = 이미 채운 [(칸 번호, 값)] (이어하기용)"""
+        self.close()
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        data = HEADER.pack(MAGIC, VERSION, holes, try_points, seed)
+        data += b"".join(_record(cell, value, try_points)
+                         for cell, value in filled)
+        os.write(fd, data)
+        os.fsync(fd)
+        os.replace(tmp, self.path)   # 열린 fd 는 이름이 바뀐 파일을 그대로 가리킴
+        self._fd = fd
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sync_loop,
+                                            daemon=True)
+            self._thread.start()
+
+    def checkpoint(self, cell, value, try_points):
+        """한 수 기록 (fsync 는 뒤에서)"""
+        if self._fd is None:
+            return
+        os.write(self._fd, _record(cell, value, try_points))
+        self._dirty.set()
+
+    def _sync_loop(self):
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            with self._lock:
+                if self._fd is None and self._thread is None:
+                    return
+                if self._fd is not None:
+                    os.fsync(self._fd)
+                    self.synced += 1
+            time.sleep(self.interval)
+
+    def close(self):
+        """남은 기록을 fsync 하고 파일은 남겨 둠"""
+        with self._lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
+
+    def finish(self):
+        """게임이 끝났으므로 journal 을 지우고 스레드 정리"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._dirty.set()
+            thread.join()
+
+
+# ========================
+# 읽기
+# ========================
+
+def load_journal(path):
+    """남아 있는 게임을 SavedGame 으로 리턴 (없거나 망가졌으면 None)
+
+    cells = {칸 번호: 마지막 값}
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, holes, try_points, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    body = memoryview(data)[HEADER.size:]
+    body = body[:len(body) - len(body) % RECORD.size]
+    cells = {}
+    moves = 0
+    for cell, value, points, check in RECORD.iter_unpack(body):
+        if cell ^ value ^ points ^ 0xA5 != check:
+            break
+        cells[cell] = value
+        try_points = points
+        moves += 1
+    return SavedGame(seed, holes, try_points, cells, moves)
+
+
+def discard_journal(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# ========================
+# 실행
+# ========================
+
+def show(player):
+    saved = load_journal(journal_path(player))
+    if saved is None:
+        print(f"{player} : no unfinished game")
+        return
+    filled = sum(1 for value in saved.cells.values() if value)
+    print(f"{player} : puzzle {saved.seed}, {saved.holes} holes, "
+          f"{filled} cells filled, {saved.try_points} tries left, "
+          f"{saved.moves} checkpoints")
+
+
+def bench(moves):
+    path = f"bench.{os.getpid()}.journal"
+    journal = GameJournal(path)
+    try:
+        journal.start(2024, 81, 255)
+        start = time.perf_counter()
+        for k in range(moves):
+            journal.checkpoint(k % 81, k % 10, 255 - k % 200)
+        elapsed = time.perf_counter() - start
+        journal.close()
+        start = time.perf_counter()
+        saved = load_journal(path)
+        loaded = time.perf_counter() - start
+        print(f"{moves} checkpoints : {elapsed / moves * 1e6:.1f} us per move "
+              f"({journal.synced} background fsyncs), resume "
+              f"{loaded * 1000:.2f} ms for {saved.moves} records "
+              f"({os.path.getsize(path)} bytes)")
+    finally:
+        journal.finish()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "show":
+        show(sys.argv[2])
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
+    else:
+        print("usage : python sudoku_journal.py show name | bench [moves]")
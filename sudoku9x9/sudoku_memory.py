@@ -0,0 +1,153 @@
+# 스도쿠 팀 프로젝트 - 게임 한 판의 메모리 사용량 / 누수 검사
+#
+# 사람 대신 정답을 입력하는 "자동 게임(headless)" 을 돌리면서
+# tracemalloc 으로 다음을 잰다.
+#   1. 한 판 동안의 최대 메모리(peak), 끝난 뒤 남은 메모리와 블럭 수
+#   2. 많이 할당한 곳 (traceback 으로 묶어서 어디서 불렀는지까지)
+#   3. 여러 판을 연달아 돌렸을 때 메모리가 계속 늘어나는지(누수)
+#
+# 게임은 임시 폴더 안에서 돌리므로 실제 회원 기록 파일은 건드리지 않는다.
+#
+# 예산(PEAK_BUDGET, LEAK_BUDGET) 검사는 test_memory.py 에서 한다.
+#
+# 사용법 : python sudoku_memory.py [판 수]
+
+import builtins
+import contextlib
+import gc
+import linecache
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+import sudoku9x9_final
+from sudoku_seeded import generate_puzzle
+
+HOLES = 10                # 난이도 3 (Advanced)
+PEAK_BUDGET = 512 * 1024  # 한 판의 최대 메모리 (bytes)
+LEAK_BUDGET = 64 * 1024   # 워밍업 이후 늘어나도 되는 메모리 (bytes)
+WARMUP = 10
+FRAMES = 6                # traceback 으로 남길 frame 수
+
+
+# ========================
+# 자동 게임
+# ========================
+
+# 솔로 모드 한 판의 입력 만들기
+def scripted_answers(seed, name="bot", passwd="bot"):
+    solution, puzzle = generate_puzzle(seed, HOLES)
+    answers = ["1", name, passwd, "3"]
+    for i in range(9):
+        for j in range(9):
+            if puzzle[i][j] == 0:
+                answers += [str(i + 1), str(j + 1), str(solution[i][j])]
+    return answers
+
+
+# 자동 게임 한 판
+def play_headless(seed):
+    """입력은 정답 목록으로, 출력은 버리고 play_sudoku_game 한 판 실행"""
+    answers = iter(scripted_answers(seed))
+    original = builtins.input
+    builtins.input = lambda message="": next(answers)
+    try:
+        with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+            sudoku9x9_final.play_sudoku_game(seed)
+    finally:
+        builtins.input = original
+
+
+# 임시 폴더에서 실행
+@contextlib.contextmanager
+def sandbox():
+    folder = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    open(os.path.join(folder, sudoku9x9_final.MEMBERS_FILE), "w").close()
+    os.chdir(folder)
+    try:
+        yield folder
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(folder)
+
+
+# ========================
+# 측정
+# ========================
+
+# 위치 -> "파일:줄  코드"
+def _where(frame):
+    line = linecache.getline(frame.filename, frame.lineno).strip()
+    return f"{os.path.basename(frame.filename)}:{frame.lineno}  {line[:50]}"
+
+
+# traceback -> 할당한 줄 + 그 줄을 부른 곳들 ("파일:줄 <- 파일:줄 ...")
+def _callers(traceback):
+    return " <- ".join(f"{os.path.basename(frame.filename)}:{frame.lineno}"
+                       for frame in reversed(traceback[:-1]))
+
+
+# tracemalloc 자신(snapshot 만들기)이 할당한 것인지
+def _own(stat):
+    return any(frame.filename == tracemalloc.__file__
+               for frame in stat.traceback)
+
+
+def measure_game(seed, top=10):
+    """한 판의 (peak bytes, 남은 bytes, 남은 블럭 수, 많이 할당한 위치들)"""
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    play_headless(seed)
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    # 같은 줄이라도 부른 곳이 다르면 따로 (traceback 단위)
+    diff = [d for d in after.compare_to(before, "traceback") if not _own(d)]
+    net_size = sum(d.size_diff for d in diff)
+    net_count = sum(d.count_diff for d in diff)
+    # 게임 도중 할당한 위치 (peak 시점이 아니라 끝난 뒤 기준)
+    tops = sorted(diff, key=lambda d: abs(d.size_diff), reverse=True)[:top]
+    return peak - base, net_size, net_count, tops
+
+
+def leak_check(games):
+    """games 판을 연달아 돌리고 (워밍업 후 메모리, 마지막 메모리) 리턴"""
+    warm = None
+    for k in range(games):
+        play_headless(k)
+        if k + 1 == WARMUP:
+            gc.collect()
+            warm = tracemalloc.get_traced_memory()[0]
+    gc.collect()
+    return warm, tracemalloc.get_traced_memory()[0]
+
+
+def main(argv):
+    games = int(argv[0]) if argv else 200
+    tracemalloc.start(FRAMES)
+    with sandbox():
+        play_headless(0)   # import / 첫 실행 비용 제외
+        peak, net_size, net_count, tops = measure_game(1)
+        print(f"one game : peak {peak} bytes, "
+              f"retained {net_size} bytes in {net_count} blocks")
+        print("top allocators (retained bytes, blocks) :")
+        for stat in tops:
+            print(f"  {stat.size_diff:>8} {stat.count_diff:>6}  "
+                  f"{_where(stat.traceback[-1])}")
+            if len(stat.traceback) > 1:
+                print(f"  {'':>15}  called from {_callers(stat.traceback)}")
+        games = max(games, WARMUP + 1)
+        warm, last = leak_check(games)
+        growth = last - warm
+        print(f"{games} games : {warm} -> {last} bytes "
+              f"(growth {growth} bytes after warmup)")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
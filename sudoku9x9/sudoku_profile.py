@@ -0,0 +1,110 @@
+# 스도쿠 팀 프로젝트 - 구간별 시간 측정 / 프로파일링
+#
+# instrument() 로 모듈(또는 클래스)의 함수를 시간 재는 함수로 바꿔 끼운다.
+# 켜지 않으면 원래 함수가 그대로 불리므로 비용이 전혀 없다.
+#
+# 함수 안에서 다른 측정 함수를 부르면 그 시간은 빼고 센다 (self time).
+# 예) get_integer 안의 input 을 같이 측정하면
+#     get_integer 시간 = 입력 검사 시간, input 시간 = 사용자 입력 대기 시간
+#
+# write_metrics() 는 Prometheus 텍스트 형식으로 결과를 파일에 쓴다.
+
+import builtins
+import threading
+import time
+from functools import wraps
+
+# 구간 이름 -> [호출 수, self time 합(초)]
+timings = {}
+
+_installed = []          # (대상, 이름, 원래 함수)
+_local = threading.local()
+
+
+# ========================
+# 측정
+# ========================
+
+# 시간 재는 함수 만들기
+def _timed(phase, func):
+    stats = timings.setdefault(phase, [0, 0.0])
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(0.0)            # 안쪽 측정 함수들이 쓴 시간
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            stats[0] += 1
+            stats[1] += elapsed - children
+
+    return wrapper
+
+
+# 측정 켜기
+def instrument(target, phases):
+    """phases = {구간 이름: target 안의 함수 이름}"""
+    for phase, name in phases.items():
+        # 모듈에 없는 이름(input 등)은 내장 함수를 감싸서 모듈에 넣음
+        original = getattr(target, name, None) or getattr(builtins, name)
+        _installed.append((target, name, original))
+        setattr(target, name, _timed(phase, original))
+
+
+# 측정 끄기
+def uninstrument():
+    """instrument 로 바꿔 끼운 함수를 모두 원래대로"""
+    while _installed:
+        target, name, original = _installed.pop()
+        if getattr(builtins, name, None) is original:
+            delattr(target, name)
+        else:
+            setattr(target, name, original)
+
+
+def reset():
+    for stats in timings.values():
+        stats[0] = 0
+        stats[1] = 0.0
+
+
+# ========================
+# 결과 출력
+# ========================
+
+def report():
+    """구간별 호출 수, 총 시간, 평균 시간 출력"""
+    print("phase               calls   total(ms)    mean(us)")
+    for phase, (calls, total) in sorted(timings.items()):
+        mean = total / calls * 1e6 if calls else 0.0
+        print(f"{phase:<18} {calls:>6} {total * 1000:>11.3f} {mean:>11.1f}")
+
+
+# Prometheus 텍스트 형식으로 저장
+def write_metrics(path, counters=None):
+    """구간별 시간 / 호출 수 (+ counters = {이름: {라벨 값: 숫자}}) 저장"""
+    lines = [
+        "# HELP sudoku_phase_seconds_total Self time spent in each phase.",
+        "# TYPE sudoku_phase_seconds_total counter",
+    ]
+    for phase, (_, total) in sorted(timings.items()):
+        lines.append(f'sudoku_phase_seconds_total{{phase="{phase}"}} '
+                     f'{total:.9f}')
+    lines.append("# HELP sudoku_phase_calls_total Calls of each phase.")
+    lines.append("# TYPE sudoku_phase_calls_total counter")
+    for phase, (calls, _) in sorted(timings.items()):
+        lines.append(f'sudoku_phase_calls_total{{phase="{phase}"}} {calls}')
+    for name, values in (counters or {}).items():
+        lines.append(f"# TYPE sudoku_{name}_total counter")
+        for label, value in sorted(values.items()):
+            lines.append(f'sudoku_{name}_total{{kind="{label}"}} {value}')
+    with open(path, "w") as file:
+        file.write("\n".join(lines) + "\n")
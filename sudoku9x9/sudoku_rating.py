@@ -0,0 +1,323 @@
+# 스도쿠 팀 프로젝트 - 플레이어 / 퍼즐 실력 점수 (Elo)
+#
+# show_top5 는 이긴 판 수로만 줄을 세워서 많이 한 사람이 늘 위에 있다.
+# 그래서 플레이어와 퍼즐 모두에 Elo 점수를 매긴다.
+#   솔로 게임 : 플레이어 vs 퍼즐 (이기면 플레이어가 이긴 것, 지면 퍼즐이 이긴 것)
+#   멀티 게임 : 두 플레이어의 승패만 (match_finished 이벤트, 각 게임은 이름 없이
+#               기록하므로 솔로 점수 / 회원 기록에는 들어가지 않음)
+# 결과 하나에 점수 두 개만 바뀌므로 갱신은 O(1)
+#
+# 퍼즐은 (seed, 구멍 수) 로 다시 만들 수 있으므로 "seed/구멍 수" 를 이름으로 쓴다.
+# 퍼즐 고르기(PuzzleIndex)는 구멍 수마다 (점수, seed) 를 정렬해 두고
+# 플레이어가 TARGET 확률로 이길 만한 점수를 이진 탐색으로 찾는다 (O(log n))
+#
+# 파일 형식 (sudoku_ratings.json)
+#   {"players": {이름: [점수, 판 수]}, "puzzles": {"seed/구멍 수": [점수, 판 수]}}
+# 저장할 때는 잠금 상태에서 파일을 다시 읽고 이번에 바뀐 만큼만 더한다.
+#
+# 사용법
+#   python sudoku_rating.py show [이름]
+#   python sudoku_rating.py bench [퍼즐 수]
+
+import json
+import math
+import os
+import random
+import sys
+import time
+from bisect import bisect_left, insort
+
+from sudoku_stats import LEVEL_BY_HOLES
+from sudoku_store import file_lock
+
+RATINGS_FILE = "sudoku_ratings.json"
+
+DEFAULT_RATING = 1500.0
+LEVEL_STEP = 200.0   # 난이도 한 단계마다 퍼즐 처음 점수 차이
+SCALE = 400.0        # 점수가 SCALE 만큼 높으면 10 배 더 잘 이김
+K_PLAYER = 32.0      # 한 판에 바뀌는 점수 크기
+K_PUZZLE = 16.0
+TARGET = 0.6         # 퍼즐을 고를 때 플레이어가 이길 확률
+WINDOW = 8           # 목표 점수 근처에서 고를 퍼즐 수
+TRIES = 32           # skip 으로 건너뛸 때 살펴볼 최대 퍼즐 수
+
+
+# ========================
+# 점수 계산
+# ========================
+
+# a 가 b 를 이길 확률
+def expected(a, b):
+    return 1.0 / (1.0 + 10.0 ** ((b - a) / SCALE))
+
+
+# 퍼즐 이름
+def puzzle_key(seed, holes):
+    return f"{seed}/{holes}"
+
+
+# 처음 보는 퍼즐의 점수 (난이도가 높을수록 높게 시작)
+def initial_puzzle_rating(holes):
+    return DEFAULT_RATING + LEVEL_STEP * (LEVEL_BY_HOLES.get(holes, 2) - 2)
+
+
+class Ratings:
+    """플레이어 / 퍼즐 점수표. 바뀐 만큼(changes)은 save 때 파일에 더함"""
+
+    def __init__(self, players=None, puzzles=None):
+        self.players = players if players is not None else {}
+        self.puzzles = puzzles if puzzles is not None else {}
+        self.changes = {"players": {}, "puzzles": {}}
+
+    def player(self, name):
+        entry = self.players.get(name)
+        return entry[0] if entry else DEFAULT_RATING
+
+    def puzzle(self, seed, holes):
+        entry = self.puzzles.get(puzzle_key(seed, holes))
+        return entry[0] if entry else initial_puzzle_rating(holes)
+
+    # 점수표 하나의 한 항목 바꾸기
+    def _move(self, table, key, rating, delta):
+        entry = getattr(self, table).setdefault(key, [rating, 0])
+        entry[0] += delta
+        entry[1] += 1
+        change = self.changes[table].setdefault(key, [rating, 0.0, 0])
+        change[1] += delta
+        change[2] += 1
+        return entry[0]
+
+    def rate_game(self, player, seed, holes, score):
+        """솔로 게임 결과 반영 (score : 이기면 1, 지면 0)
+
+        player 가 None(이름 없는 플레이어)이면 기본 점수로 보고 퍼즐만 바꿈
+        (새 플레이어 점수, 새 퍼즐 점수) 리턴
+        """
+        mine = self.player(player)
+        theirs = self.puzzle(seed, holes)
+        surprise = score - expected(mine, theirs)
+        if player is not None:
+            mine = self._move("players", player, mine, K_PLAYER * surprise)
+        theirs = self._move("puzzles", puzzle_key(seed, holes), theirs,
+                            -K_PUZZLE * surprise)
+        return mine, theirs
+
+    def rate_match(self, first, second, score):
+        """두 플레이어의 승패 반영 (score : first 가 이기면 1, 비기면 0.5)"""
+        a, b = self.player(first), self.player(second)
+        surprise = score - expected(a, b)
+        return (self._move("players", first, a, K_PLAYER * surprise),
+                self._move("players", second, b, -K_PLAYER * surprise))
+
+    def ranking(self, names=None):
+        """[(점수, 이름, 판 수)] 점수 높은 순. names 를 주면 그 이름만"""
+        if names is None:
+            names = self.players
+        return sorted(((self.player(name), name,
+                        self.players.get(name, (0, 0))[1])
+                       for name in names), key=lambda item: -item[0])
+
+    def to_json(self):
+        return {"players": self.players, "puzzles": self.puzzles}
+
+    def save(self, path=RATINGS_FILE):
+        """잠금 상태에서 파일을 다시 읽고 바뀐 만큼만 더해서 저장"""
+        if not any(self.changes.values()):
+            return
+        with file_lock(path):
+            saved = load_ratings(path)
+            for table, changes in self.changes.items():
+                entries = getattr(saved, table)
+                for key, (start, delta, games) in changes.items():
+                    entry = entries.setdefault(key, [start, 0])
+                    entry[0] += delta
+                    entry[1] += games
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as file:
+                json.dump(saved.to_json(), file)
+            os.replace(tmp, path)
+        self.players, self.puzzles = saved.players, saved.puzzles
+        self.changes = {"players": {}, "puzzles": {}}
+
+
+# 파일 읽기 (없으면 빈 점수표)
+def load_ratings(path=RATINGS_FILE):
+    if not os.path.exists(path):
+        return Ratings()
+    with open(path, "r") as file:
+        data = json.load(file)
+    return Ratings(data.get("players", {}), data.get("puzzles", {}))
+
+
+# ========================
+# 이벤트 버스 sink
+# ========================
+
+class RatingSink:
+    """게임 / 대결 결과로 점수 갱신 (중도 포기한 솔로 게임은 제외)"""
+
+    def __init__(self, path=RATINGS_FILE):
+        self.path = path
+        self.ratings = load_ratings(path)
+        self._games = {}      # 진행 중인 게임 -> (seed, 구멍 수)
+
+    def handle(self, event):
+        data = event.data
+        if event.kind == "game_started":
+            self._games[data["game"]] = (data["seed"], data["holes"])
+        elif event.kind == "game_finished":
+            puzzle = self._games.pop(data["game"], None)
+            if puzzle is None or data["player"] is None:
+                return
+            if data["result"] != 0:
+                self.ratings.rate_game(data["player"], *puzzle,
+                                       data["result"] == 1)
+        elif event.kind == "match_finished":
+            first, second = data["players"]
+            if first != second:
+                self.ratings.rate_match(first, second, data["score"])
+
+    def flush(self):
+        self.ratings.save(self.path)
+
+
+# ========================
+# 퍼즐 고르기
+# ========================
+
+class PuzzleIndex:
+    """구멍 수마다 (점수, seed) 를 정렬한 목록"""
+
+    def __init__(self):
+        self.levels = {}
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.levels.values())
+
+    def add(self, seed, holes, rating):
+        insort(self.levels.setdefault(holes, []), (rating, seed))
+
+    def update(self, seed, holes, old, new):
+        """퍼즐 점수가 old -> new 로 바뀐 것 반영
+
+        찾기는 이진 탐색이지만 목록 안에서 자리를 옮기므로 큰 목록에선 느림
+        (100 만 개에 1ms 정도, 게임 중에는 한 판에 한 번)
+        """
+        entries = self.levels[holes]
+        k = bisect_left(entries, (old, seed))
+        if k == len(entries) or entries[k] != (old, seed):
+            raise KeyError(puzzle_key(seed, holes))
+        del entries[k]
+        insort(entries, (new, seed))
+
+    def pick(self, rating, holes, rng=random, target=TARGET, window=WINDOW,
+             skip=None, tries=TRIES):
+        """rating 인 플레이어가 target 확률로 이길 만한 퍼즐의 seed (없으면 None)
+
+        목표 점수에 가장 가까운 window 개 중에서 무작위로 고름
+        skip(seed, 구멍 수) 가 True 인 퍼즐은 건너뛰고 바깥쪽으로 넓혀 가며
+        tries 개까지 살펴봄 (모두 건너뛰면 가장 가까운 퍼즐)
+        """
+        entries = self.levels.get(holes)
+        if not entries:
+            return None
+        goal = rating - SCALE * math.log10(target / (1 - target))
+        k = bisect_left(entries, (goal,))
+        lo = max(0, min(k - window // 2, len(entries) - window))
+        hi = min(len(entries), lo + window)
+        order = list(range(lo, hi))
+        rng.shuffle(order)
+        if skip is None:
+            return entries[order[0]][1]
+        left, right = lo - 1, hi
+        while len(order) < tries and (left >= 0 or right < len(entries)):
+            if right < len(entries):
+                order.append(right)
+                right += 1
+            if left >= 0:
+                order.append(left)
+                left -= 1
+        for k in order[:tries]:
+            if not skip(entries[k][1], holes):
+                return entries[k][1]
+        return entries[order[0]][1]
+
+    @classmethod
+    def from_bank(cls, puzzles, ratings):
+        """puzzles = [(seed, 구멍 수)], ratings = Ratings"""
+        index = cls()
+        for seed, holes in puzzles:
+            index.levels.setdefault(holes, []).append(
+                (ratings.puzzle(seed, holes), seed))
+        for entries in index.levels.values():
+            entries.sort()
+        return index
+
+
+# sudoku_seeded 형식의 NDJSON -> [(seed, 구멍 수)]
+def load_bank(path):
+    puzzles = []
+    with open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                puzzles.append((record["seed"], record["holes"]))
+    return puzzles
+
+
+def make_picker(index, rating, rng=random, skip=None):
+    """sudoku_mini 에 넘길 picker(구멍 수) -> seed"""
+    return lambda holes: index.pick(rating, holes, rng, skip=skip)
+
+
+# ========================
+# 실행
+# ========================
+
+def show(name=None, path=RATINGS_FILE):
+    ratings = load_ratings(path)
+    for rank, (rating, who, games) in enumerate(ratings.ranking()[:10], 1):
+        print(f"ranked {rank} name : {who} rating : {rating:.0f} "
+              f"games : {games}")
+    for holes, level in sorted(LEVEL_BY_HOLES.items()):
+        values = [entry[0] for key, entry in ratings.puzzles.items()
+                  if key.endswith(f"/{holes}")]
+        if values:
+            print(f"level {level} puzzles : {len(values)}, rating "
+                  f"{min(values):.0f}~{max(values):.0f} "
+                  f"(mean {sum(values) / len(values):.0f})")
+    if name is not None:
+        print(f"{name} : rating {ratings.player(name):.0f}")
+
+
+def bench(count):
+    rng = random.Random(0)
+    ratings = Ratings()
+    puzzles = [(seed, 10) for seed in range(count)]
+    start = time.perf_counter()
+    index = PuzzleIndex.from_bank(puzzles, ratings)
+    built = time.perf_counter() - start
+
+    games = 10000
+    players = [f"p{k}" for k in range(100)]
+    start = time.perf_counter()
+    picked = [(player, index.pick(ratings.player(player), 10, rng))
+              for player in (rng.choice(players) for _ in range(games))]
+    middle = time.perf_counter()
+    for player, seed in picked:
+        old = ratings.puzzle(seed, 10)
+        _, new = ratings.rate_game(player, seed, 10, rng.random() < 0.6)
+        index.update(seed, 10, old, new)
+    end = time.perf_counter()
+    print(f"{count} puzzles : index built in {built:.2f}s, "
+          f"pick {(middle - start) / games * 1e6:.1f} us, "
+          f"rate + reindex {(end - middle) / games * 1e6:.1f} us per game")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "show":
+        show(sys.argv[2] if len(sys.argv) > 2 else None)
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+    else:
+        print("usage : python sudoku_rating.py show [name] | bench [puzzles]")
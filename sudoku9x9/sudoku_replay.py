@@ -0,0 +1,161 @@
+# 스도쿠 팀 프로젝트 - 게임 리플레이 기록 (바이너리)
+#
+# 게임 한 판 = 헤더 + 정답 보드 + 퍼즐 보드 + 고정 길이 기록들
+#   헤더   : "<4sBBQI" (매직 b"SDKR", 버전, 한 변 크기, 퍼즐 번호(seed), 기록 수)
+#   보드   : 칸마다 1 byte (정답, 퍼즐 순서로 side * side bytes 씩)
+#   기록   : "<HBHB" (칸 번호, 숫자, 이전 기록과의 시간 차(ms), 결과) 6 bytes
+#
+# 결과 코드
+#   0 : 틀린 숫자   1 : 맞은 숫자   2 : 되돌리기   3 : 다시하기
+#   4 : 게임 종료 (숫자 칸에 게임 결과 + 1 을 저장)
+#
+# 게임 기록은 메모리에 모았다가 게임이 끝날 때 한 번에 파일 끝에 덧붙인다.
+#
+# 사용법 : python sudoku_replay.py [리플레이 파일]
+
+import struct
+import sys
+import time
+
+REPLAY_FILE = "sudoku_replays.bin"
+
+MAGIC = b"SDKR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBQI")
+RECORD = struct.Struct("<HBHB")
+
+WRONG, RIGHT, UNDO, REDO, END = range(5)
+MAX_DELTA_MS = 0xFFFF
+
+
+# ========================
+# 기록하기
+# ========================
+
+class ReplayRecorder:
+    """sudoku_mini 에 넘겨서 게임을 바이너리로 기록하는 recorder"""
+
+    def __init__(self, path=REPLAY_FILE):
+        self.path = path
+        self.puzzle_id = 0
+        self.side = 0
+        self.boards = b""
+        self.records = bytearray()
+        self._last = None
+
+    # 이전 기록과의 시간 차 (ms)
+    def _delta(self, now):
+        now = time.perf_counter() if now is None else now
+        delta = min(int((now - self._last) * 1000), MAX_DELTA_MS)
+        self._last = now
+        return delta
+
+    def _add(self, cell, digit, outcome, now):
+        self.records += RECORD.pack(cell, digit, self._delta(now), outcome)
+
+    # now 를 넘기면 그 시각(perf_counter 값)에 일어난 일로 기록
+    def start(self, puzzle_board, solution_board, no_of_holes, seed,
+              now=None):
+        self.puzzle_id = seed
+        self.side = len(puzzle_board)
+        self.boards = bytes(v for row in solution_board for v in row) + \
+            bytes(v for row in puzzle_board for v in row)
+        self._last = time.perf_counter() if now is None else now
+
+    def move(self, i, j, n, correct, now=None):
+        self._add(i * self.side + j, n, RIGHT if correct else WRONG, now)
+
+    def history(self, command, now=None):
+        self._add(0, 0, UNDO if command == "u" else REDO, now)
+
+    def finish(self, result, now=None):
+        self._add(0, result + 1, END, now)
+        with open(self.path, "ab") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.side, self.puzzle_id,
+                                   len(self.records) // RECORD.size))
+            file.write(self.boards)
+            file.write(self.records)
+
+
+# ========================
+# 다시 보기(replay)
+# ========================
+
+# 파일 안의 게임들을 하나씩 꺼내기
+def iter_games(data):
+    """(퍼즐 번호, 정답 bytes, 퍼즐 bytes, 기록 memoryview) 를 차례로 리턴"""
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        magic, version, side, puzzle_id, count = \
+            HEADER.unpack_from(view, offset)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"bad replay header at byte {offset}")
+        offset += HEADER.size
+        cells = side * side
+        solution = bytes(view[offset:offset + cells])
+        puzzle = bytes(view[offset + cells:offset + 2 * cells])
+        offset += 2 * cells
+        end = offset + count * RECORD.size
+        yield puzzle_id, solution, puzzle, view[offset:end]
+        offset = end
+
+
+# 게임 한 판 다시 두기
+def replay_game(solution, puzzle, records):
+    """기록을 보드에 다시 적용해 보고 요약(dict)을 리턴
+
+    맞다고 기록된 수가 실제 정답과 다르면 ValueError
+    """
+    board = bytearray(puzzle)
+    placed = []      # 되돌리기용 (칸 번호)
+    undone = []
+    right = wrong = 0
+    elapsed_ms = 0
+    result = None
+    for cell, digit, delta, outcome in RECORD.iter_unpack(records):
+        elapsed_ms += delta
+        if outcome == RIGHT:
+            if solution[cell] != digit or board[cell]:
+                raise ValueError(f"invalid move: cell {cell} digit {digit}")
+            board[cell] = digit
+            placed.append(cell)
+            undone.clear()
+            right += 1
+        elif outcome == WRONG:
+            wrong += 1
+        elif outcome == UNDO:
+            if placed:
+                cell = placed.pop()
+                undone.append(cell)
+                board[cell] = 0
+        elif outcome == REDO:
+            if undone:
+                cell = undone.pop()
+                placed.append(cell)
+                board[cell] = solution[cell]
+        else:
+            result = digit - 1
+    return {"result": result, "right": right, "wrong": wrong,
+            "elapsed_ms": elapsed_ms, "solved": board == solution}
+
+
+# 여러 게임 다시 보기
+def replay_file(path=REPLAY_FILE):
+    """파일 안의 모든 게임을 다시 두어 (퍼즐 번호, 요약) 을 차례로 리턴"""
+    with open(path, "rb") as file:
+        data = file.read()
+    for puzzle_id, solution, puzzle, records in iter_games(data):
+        yield puzzle_id, replay_game(solution, puzzle, records)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else REPLAY_FILE
+    games = moves = 0
+    start = time.perf_counter()
+    for puzzle_id, summary in replay_file(path):
+        games += 1
+        moves += summary["right"] + summary["wrong"]
+    elapsed = time.perf_counter() - start
+    print(f"games : {games} moves : {moves} "
+          f"({moves / elapsed if elapsed else 0:.0f} moves/sec)")
@@ -0,0 +1,117 @@
+# 스도쿠 팀 프로젝트 - seed 로 퍼즐 만들기 / 여러 컴퓨터에 나눠 만들기
+#
+# 퍼즐 하나마다 seed 를 정하고 random.Random(seed) 로만 보드를 만들기 때문에
+# (seed, 구멍 수) 만 있으면 언제 어디서든 같은 퍼즐을 다시 만들 수 있다.
+#
+# seed 구간 [start, stop) 을 겹치지 않게 노드마다 나눠 주고,
+# 각 노드가 만든 결과(NDJSON)를 merge 로 합치면서 중복 퍼즐을 없앤다.
+# 중복 판단은 sudoku_symmetry 의 정규형으로 하므로 대칭으로 같은 퍼즐도 하나만 남음
+#
+# 사용법
+#   python sudoku_seeded.py generate START STOP NODES NODE HOLES OUT
+#   python sudoku_seeded.py merge OUT SHARD [SHARD ...]
+
+import json
+import random
+import sys
+
+from sudoku9x9_final import create_solution_board_9x9, deep_copy_board, \
+    make_holes
+from sudoku_symmetry import canonical_form
+
+
+# ========================
+# seed -> 퍼즐
+# ========================
+
+# 퍼즐 만들기
+def generate_puzzle(seed, no_of_holes):
+    """(정답 보드, 퍼즐 보드) 리턴. sudoku_mini 와 같은 순서로 rng 사용"""
+    rng = random.Random(seed)
+    solution_board = create_solution_board_9x9(rng)
+    puzzle_board = make_holes(deep_copy_board(solution_board), no_of_holes,
+                              rng)
+    return solution_board, puzzle_board
+
+
+# 보드 <-> 문자열 ("0" 은 빈칸)
+def board_to_string(board):
+    return "".join(str(v) for row in board for v in row)
+
+
+def string_to_board(text, side=9):
+    return [[int(ch) for ch in text[r * side:(r + 1) * side]]
+            for r in range(side)]
+
+
+# ========================
+# seed 구간 나누기
+# ========================
+
+# 노드별 seed 구간
+def shard_range(start, stop, nodes, node):
+    """[start, stop) 을 nodes 개로 나눈 것 중 node 번째 구간 (range)"""
+    if not 0 <= node < nodes:
+        raise ValueError("node must be in range(nodes)")
+    total = stop - start
+    lo = start + total * node // nodes
+    hi = start + total * (node + 1) // nodes
+    return range(lo, hi)
+
+
+# 한 노드의 퍼즐 만들기
+def generate_shard(seeds, no_of_holes, out_path):
+    """seeds 의 퍼즐을 한 줄에 하나씩 NDJSON 으로 저장하고 개수 리턴"""
+    count = 0
+    with open(out_path, "w") as file:
+        for seed in seeds:
+            _, puzzle = generate_puzzle(seed, no_of_holes)
+            record = {"seed": seed, "holes": no_of_holes,
+                      "puzzle": board_to_string(puzzle)}
+            file.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+# 노드 결과 합치기
+def merge_shards(out_path, shard_paths):
+    """여러 노드의 결과를 합쳐 정규형이 같은 퍼즐은 seed 가 가장 작은 것만 남김
+
+    (남은 개수, 버린 중복 개수) 리턴
+    """
+    best = {}
+    duplicates = 0
+    for path in shard_paths:
+        with open(path, "r") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key, _ = canonical_form(string_to_board(record["puzzle"]))
+                old = best.get(key)
+                if old is not None:
+                    duplicates += 1
+                    if old["seed"] <= record["seed"]:
+                        continue
+                best[key] = record
+    records = sorted(best.values(), key=lambda r: (r["holes"], r["seed"]))
+    with open(out_path, "w") as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+    return len(records), duplicates
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 8 and sys.argv[1] == "generate":
+        start, stop, nodes, node, holes = map(int, sys.argv[2:7])
+        seeds = shard_range(start, stop, nodes, node)
+        count = generate_shard(seeds, holes, sys.argv[7])
+        print(f"node {node}/{nodes} : seeds {seeds.start}~{seeds.stop - 1}, "
+              f"{count} puzzles")
+    elif len(sys.argv) >= 4 and sys.argv[1] == "merge":
+        kept, duplicates = merge_shards(sys.argv[2], sys.argv[3:])
+        print(f"merged : {kept} puzzles ({duplicates} duplicates removed)")
+    else:
+        print("usage : python sudoku_seeded.py generate "
+              "START STOP NODES NODE HOLES OUT")
+        print("        python sudoku_seeded.py merge OUT SHARD [SHARD ...]")
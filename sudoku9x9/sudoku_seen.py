@@ -0,0 +1,257 @@
+# 스도쿠 팀 프로젝트 - 플레이어가 이미 푼 퍼즐 걸러내기 (Bloom filter)
+#
+# 퍼즐 목록에서 고를 때 다시 온 플레이어에게 했던 퍼즐을 또 주지 않으려면
+# 플레이어마다 푼 퍼즐을 기억해야 하는데, 전부 저장하면 너무 크다.
+# 그래서 플레이어마다 크기가 고정된 Bloom filter 에 퍼즐의 해시만 넣는다.
+#   - 검사 / 추가는 해시 위치 HASHES 개만 보므로 O(1)
+#   - "안 했다" 는 항상 맞고, "했다" 는 FP_RATE 확률로 틀릴 수 있음
+#   - 한 명당 BUDGET_BYTES bytes. 담을 수 있는 퍼즐 수(capacity)를 넘기면
+#     비우고 다시 시작 (오래된 퍼즐은 다시 나올 수 있음)
+# 퍼즐은 (seed, 구멍 수) 로 다시 만들 수 있으므로 그 두 값을 해시한다.
+# 퍼즐을 다시 만들거나 정규형을 구하지 않으므로 검사 한 번이 해시 한 번
+# (대칭으로 같은 퍼즐은 sudoku_seeded.merge_shards 가 퍼즐 목록에서 이미 하나만 남김)
+#
+# 파일 형식 (회원 파일 옆 sudoku_seen.bin, little-endian)
+#   헤더   : "<4sBHBH" (매직 b"SDKS", 버전, filter bytes, 해시 수, capacity)
+#   플레이어마다 : 이름 길이(B) + 이름(utf-8) + 넣은 수(H) + filter bytes
+#   설정이 바뀌어 filter 크기나 버전이 다르면 예전 filter 는 버리고 새로 시작
+# 저장할 때는 잠금 상태에서 파일을 다시 읽고 이번에 넣은 퍼즐만 다시 넣는다.
+#
+# 사용법
+#   python sudoku_seen.py show [이름]
+#   python sudoku_seen.py bench [플레이어 수]
+
+import hashlib
+import math
+import os
+import random
+import struct
+import sys
+import time
+
+from sudoku_store import file_lock
+
+SEEN_FILE = "sudoku_seen.bin"
+
+BUDGET_BYTES = 256    # 플레이어 한 명의 filter 크기
+FP_RATE = 0.01        # 안 한 퍼즐을 했다고 잘못 볼 확률 (capacity 까지 찼을 때)
+
+MAGIC = b"SDKS"
+VERSION = 2           # 1 : 정규형 해시 (퍼즐을 다시 만들어야 했음)
+HEADER = struct.Struct("<4sBHBH")
+COUNT = struct.Struct("<H")
+PUZZLE = struct.Struct("<QB")   # 해시할 (seed, 구멍 수)
+
+
+# ========================
+# Bloom filter
+# ========================
+
+# filter 크기와 오답률 -> (담을 수 있는 수, 해시 수)
+def bloom_shape(size, fp_rate):
+    bits = size * 8
+    capacity = int(bits * math.log(2) ** 2 / -math.log(fp_rate))
+    hashes = max(1, round(bits / max(capacity, 1) * math.log(2)))
+    return max(capacity, 1), hashes
+
+
+# (seed, 구멍 수) -> 16 byte 해시 (이어하기로 칸이 채워져 있어도 같음)
+def seed_digest(seed, holes):
+    return hashlib.blake2b(PUZZLE.pack(seed, holes), digest_size=16).digest()
+
+
+class BloomFilter:
+    """크기가 고정된 Bloom filter (넣는 값은 16 byte 해시)"""
+
+    def __init__(self, size=BUDGET_BYTES, fp_rate=FP_RATE, bits=None,
+                 count=0):
+        self.capacity, self.hashes = bloom_shape(size, fp_rate)
+        self.bits = bytearray(bits) if bits is not None else bytearray(size)
+        self.count = count
+        self._size = size * 8
+
+    # 해시 하나로 위치 여러 개 (double hashing)
+    def _positions(self, digest):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self._size
+        return [(h1 + k * h2) % size for k in range(self.hashes)]
+
+    def __contains__(self, digest):
+        bits = self.bits
+        return all(bits[p >> 3] >> (p & 7) & 1
+                   for p in self._positions(digest))
+
+    def add(self, digest):
+        """넣기. capacity 가 차면 비우고 다시 시작"""
+        if digest in self:
+            return
+        if self.count >= self.capacity:
+            self.bits = bytearray(len(self.bits))
+            self.count = 0
+        for p in self._positions(digest):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+# ========================
+# 플레이어별 저장소
+# ========================
+
+class SeenStore:
+    """이름 -> BloomFilter. save 때 이번에 넣은 것(pending)만 파일에 다시 넣음"""
+
+    def __init__(self, path=SEEN_FILE, size=BUDGET_BYTES, fp_rate=FP_RATE):
+        self.path = path
+        self.size = size
+        self.fp_rate = fp_rate
+        self.filters = self._read()
+        self.pending = {}
+
+    def _read(self):
+        filters = {}
+        if not os.path.exists(self.path):
+            return filters
+        with open(self.path, "rb") as file:
+            data = file.read()
+        magic, version, size, hashes, capacity = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a seen-puzzle file")
+        shape = (self.size, bloom_shape(self.size, self.fp_rate))
+        if version != VERSION or (size, (capacity, hashes)) != shape:
+            return filters   # 버전이나 설정이 바뀜 : 새로 시작
+        offset = HEADER.size
+        while offset < len(data):
+            length = data[offset]
+            name = data[offset + 1:offset + 1 + length].decode()
+            offset += 1 + length
+            count, = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            filters[name] = BloomFilter(size, self.fp_rate,
+                                        data[offset:offset + size], count)
+            offset += size
+        return filters
+
+    def filter(self, name):
+        found = self.filters.get(name)
+        return found if found is not None else \
+            BloomFilter(self.size, self.fp_rate)
+
+    def has_seen(self, name, digest):
+        found = self.filters.get(name)
+        return found is not None and digest in found
+
+    def add(self, name, digest):
+        if name not in self.filters:
+            self.filters[name] = BloomFilter(self.size, self.fp_rate)
+        self.filters[name].add(digest)
+        self.pending.setdefault(name, []).append(digest)
+
+    def save(self):
+        """잠금 상태에서 파일을 다시 읽고 pending 을 넣어 저장"""
+        if not self.pending:
+            return
+        with file_lock(self.path):
+            self.filters = self._read()
+            for name, digests in self.pending.items():
+                for digest in digests:
+                    if name not in self.filters:
+                        self.filters[name] = BloomFilter(self.size,
+                                                         self.fp_rate)
+                    self.filters[name].add(digest)
+            capacity, hashes = bloom_shape(self.size, self.fp_rate)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as file:
+                file.write(HEADER.pack(MAGIC, VERSION, self.size, hashes,
+                                       capacity))
+                for name, found in self.filters.items():
+                    encoded = name.encode()
+                    file.write(bytes([len(encoded)]) + encoded +
+                               COUNT.pack(found.count) + found.bits)
+            os.replace(tmp, self.path)
+        self.pending = {}
+
+
+def make_skip(store, name):
+    """PuzzleIndex.pick 에 넘길 skip(seed, 구멍 수) : 이미 한 퍼즐이면 True"""
+    found = store.filter(name)
+
+    def skip(seed, holes):
+        return seed_digest(seed, holes) in found
+    return skip
+
+
+# ========================
+# 이벤트 버스 sink
+# ========================
+
+class SeenSink:
+    """로그인한 플레이어가 시작한 퍼즐을 filter 에 넣기"""
+
+    def __init__(self, path=SEEN_FILE):
+        self.store = SeenStore(path)
+
+    def handle(self, event):
+        data = event.data
+        if event.kind == "game_started" and data["player"] is not None:
+            self.store.add(data["player"],
+                           seed_digest(data["seed"], data["holes"]))
+
+    def flush(self):
+        self.store.save()
+
+
+# ========================
+# 실행
+# ========================
+
+def show(name=None, path=SEEN_FILE):
+    store = SeenStore(path)
+    capacity, hashes = bloom_shape(store.size, store.fp_rate)
+    print(f"{len(store.filters)} players, {store.size} bytes each, "
+          f"{hashes} hashes, up to {capacity} puzzles at "
+          f"{store.fp_rate:.1%} false positives")
+    names = [name] if name is not None else sorted(store.filters)
+    for who in names:
+        found = store.filters.get(who)
+        print(f"{who} : {found.count if found else 0} puzzles remembered")
+
+
+def bench(players):
+    rng = random.Random(0)
+    path = f"bench.{os.getpid()}.seen"
+    try:
+        store = SeenStore(path)
+        capacity, _ = bloom_shape(store.size, store.fp_rate)
+        digests = [rng.randbytes(16) for _ in range(capacity)]
+        for k in range(players):
+            for digest in digests:
+                store.add(f"p{k}", digest)
+        start = time.perf_counter()
+        store.save()
+        saved = time.perf_counter() - start
+        store = SeenStore(path)
+        found = store.filters["p0"]
+        fresh = [rng.randbytes(16) for _ in range(100000)]
+        start = time.perf_counter()
+        false_hits = sum(1 for digest in fresh if digest in found)
+        elapsed = time.perf_counter() - start
+        assert all(digest in found for digest in digests)
+        print(f"{players} players x {capacity} puzzles : file "
+              f"{os.path.getsize(path)} bytes, saved in {saved:.2f}s, "
+              f"check {elapsed / len(fresh) * 1e6:.2f} us, "
+              f"false positives {false_hits / len(fresh):.2%} "
+              f"(target {FP_RATE:.0%})")
+    finally:
+        for leftover in (path, path + ".lock"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "show":
+        show(sys.argv[2] if len(sys.argv) > 2 else None)
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
+    else:
+        print("usage : python sudoku_seen.py show [name] | bench [players]")
@@ -0,0 +1,262 @@
+# 스도쿠 팀 프로젝트 - 여러 프로세스가 함께 쓰는 퍼즐 목록 (mmap)
+#
+# 게임을 프로세스 여러 개로 돌리면 프로세스마다 퍼즐 목록을 따로 읽어서
+# 메모리가 프로세스 수만큼 늘어난다. 그래서 부모 프로세스가 목록을
+# 파일 하나(가능하면 메모리 위의 /dev/shm)에 한 번만 쓰고, 자식(worker)들은
+# 경로로 붙어서(attach) mmap 한 읽기 전용 memoryview 로 본다.
+# mmap 한 페이지는 OS 가 프로세스끼리 나눠 쓰므로 worker 가 몇 개든 한 벌이다.
+# 프로세스 사이에는 보드 대신 퍼즐 번호(정수)만 주고받는다.
+# worker 마다 SolverCache 를 두어서 같은 퍼즐(어려운 퍼즐은 대칭 변형까지)은
+# 한 번만 푼다.
+#
+# 파일 형식 (숫자는 little-endian)
+#   헤더      : "<4sB3xQ" (매직 b"SDKB", 버전, 퍼즐 수 N) 16 bytes
+#   seeds     : N 개 'q'
+#   holes     : N 개 'B'
+#   puzzles   : 퍼즐마다 81 bytes (칸 값 0~9, 0 은 빈칸)
+#   solutions : 퍼즐마다 81 bytes
+#
+# 사용법
+#   python sudoku_sharedbank.py check BANK [WORKERS]   모든 퍼즐의 해 개수 확인
+#   python sudoku_sharedbank.py bench [퍼즐 수] [WORKERS]
+
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+
+from sudoku_cache import SolverCache
+from sudoku_seeded import generate_puzzle, string_to_board
+
+MAGIC = b"SDKB"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xQ")
+
+SIDE = 9
+CELLS = SIDE * SIDE
+
+
+# ========================
+# 공유 퍼즐 목록
+# ========================
+
+# 목록 파일을 둘 폴더 (메모리 위 파일 시스템이 있으면 그쪽)
+def _bank_folder():
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class SharedBank:
+    """mmap 한 퍼즐 목록. seeds / holes / puzzles / solutions 는
+    읽기 전용 memoryview"""
+
+    def __init__(self, path, owner):
+        self.path = path
+        self.owner = owner      # 만든 프로세스만 파일을 지움
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a puzzle bank")
+        self.count = count
+        view = memoryview(self._map)
+        start = HEADER.size
+        self.seeds = view[start:start + 8 * count].cast('q')
+        start += 8 * count
+        self.holes = view[start:start + count]
+        start += count
+        self.puzzles = view[start:start + CELLS * count]
+        start += CELLS * count
+        self.solutions = view[start:start + CELLS * count]
+        view.release()
+
+    @classmethod
+    def publish(cls, records, path=None):
+        """records = [(seed, 구멍 수, 퍼즐 보드, 정답 보드)] 를 목록 파일로
+        쓰고 SharedBank 리턴 (이 프로세스가 owner)"""
+        records = list(records)
+        seeds = array('q', (seed for seed, _, _, _ in records))
+        if sys.byteorder == "big":
+            seeds.byteswap()
+        if path is None:
+            fd, path = tempfile.mkstemp(".bank", "sudoku_", _bank_folder())
+            os.close(fd)
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(records)))
+            seeds.tofile(file)
+            file.write(bytes(holes for _, holes, _, _ in records))
+            for column in (2, 3):
+                file.write(bytes(v for record in records
+                                 for row in record[column] for v in row))
+        return cls(path, owner=True)
+
+    @classmethod
+    def attach(cls, path):
+        """다른 프로세스가 만든 목록에 붙기"""
+        return cls(path, owner=False)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for name in ("seeds", "holes", "puzzles", "solutions"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+        if self.owner:
+            os.remove(self.path)
+
+    def seed(self, k):
+        seed = self.seeds[k]
+        if sys.byteorder == "big":
+            seed = int.from_bytes(seed.to_bytes(8, "big", signed=True),
+                                  "little", signed=True)
+        return seed
+
+    # 번호 -> 81 칸 memoryview (복사 없음)
+    def puzzle_cells(self, k):
+        return self.puzzles[k * CELLS:(k + 1) * CELLS]
+
+    def solution_cells(self, k):
+        return self.solutions[k * CELLS:(k + 1) * CELLS]
+
+    def board(self, k):
+        """k 번 퍼즐을 sudoku_mini 와 같은 리스트 보드로 (정답, 퍼즐)"""
+        return (_cells_board(self.solution_cells(k)),
+                _cells_board(self.puzzle_cells(k)))
+
+
+def _cells_board(cells):
+    return [list(cells[r * SIDE:(r + 1) * SIDE]) for r in range(SIDE)]
+
+
+# sudoku_seeded 형식의 NDJSON -> publish 에 넘길 records
+def read_bank(path):
+    """정답은 (seed, 구멍 수) 로 다시 만듦"""
+    with open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                solution, _ = generate_puzzle(record["seed"],
+                                              record["holes"])
+                yield (record["seed"], record["holes"],
+                       string_to_board(record["puzzle"]), solution)
+
+
+# ========================
+# worker
+# ========================
+
+_bank = None
+_cache = None
+
+
+# Pool initializer : worker 마다 한 번 붙기
+def attach_worker(path):
+    global _bank, _cache
+    _bank = SharedBank.attach(path)
+    _cache = SolverCache()
+
+
+def check_puzzle(k):
+    """(번호, 해 개수, 정답과 힌트가 맞는지, 캐시 hit 인지) 리턴"""
+    solution, puzzle = _bank.board(k)
+    matches = all(p in (0, s) for p_row, s_row in zip(puzzle, solution)
+                  for p, s in zip(p_row, s_row))
+    hits = _cache.hits
+    solutions = _cache.count_solutions(puzzle)
+    return k, solutions, matches, _cache.hits > hits
+
+
+# 이 프로세스만 쓰는 메모리 (Linux 만, 없으면 None)
+def private_bytes():
+    try:
+        with open("/proc/self/smaps_rollup", "r") as file:
+            fields = dict(line.split(":", 1) for line in file if ":" in line)
+    except OSError:
+        return None
+    return sum(int(fields[key].split()[0]) * 1024
+               for key in ("Private_Clean", "Private_Dirty"))
+
+
+def worker_memory(_):
+    return os.getpid(), private_bytes()
+
+
+# ========================
+# 실행
+# ========================
+
+def check(bank, workers):
+    """모든 퍼즐을 worker 들에게 번호로 나눠 주고 결과 모으기
+
+    (해 개수별 퍼즐 수, 정답과 안 맞는 퍼즐 번호들, 캐시 hit 수) 리턴
+    """
+    counts = {}
+    bad = []
+    hits = 0
+    with multiprocessing.Pool(workers, attach_worker, (bank.path,)) as pool:
+        for k, solutions, matches, hit in pool.imap_unordered(
+                check_puzzle, range(len(bank)), chunksize=64):
+            counts[solutions] = counts.get(solutions, 0) + 1
+            hits += hit
+            if not matches:
+                bad.append(k)
+    return counts, bad, hits
+
+
+def bench(count, workers):
+    records = [(seed, 10) + generate_puzzle(seed, 10)[::-1]
+               for seed in range(count)]
+    start = time.perf_counter()
+    bank = SharedBank.publish(records)
+    published = time.perf_counter() - start
+    copy_bytes = len(json.dumps([[s, h, p, q] for s, h, p, q in records]))
+    with bank:
+        print(f"{count} puzzles : shared file "
+              f"{os.path.getsize(bank.path)} bytes, published in "
+              f"{published:.2f}s "
+              f"(one JSON copy per worker would be {copy_bytes} bytes)")
+        start = time.perf_counter()
+        counts, bad, hits = check(bank, workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers} workers checked {count} puzzles in {elapsed:.2f}s "
+              f"solutions {dict(sorted(counts.items()))}, "
+              f"mismatched {len(bad)}, cache hits {hits}")
+        with multiprocessing.Pool(workers, attach_worker,
+                                  (bank.path,)) as pool:
+            sizes = dict(pool.map(worker_memory, range(workers * 4)))
+        if None not in sizes.values():
+            print("private memory per worker : " + ", ".join(
+                f"{size // 1024}KB" for size in sizes.values()))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "check":
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else \
+            multiprocessing.cpu_count()
+        with SharedBank.publish(read_bank(sys.argv[2])) as shared:
+            counts, bad, hits = check(shared, workers)
+        print(f"{sum(counts.values())} puzzles, solutions "
+              f"{dict(sorted(counts.items()))}, mismatched {bad}, "
+              f"cache hits {hits}")
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 100000,
+              int(sys.argv[3]) if len(sys.argv) > 3 else
+              multiprocessing.cpu_count())
+    else:
+        print("usage : python sudoku_sharedbank.py check BANK [workers]"
+              " | bench [puzzles] [workers]")
@@ -0,0 +1,259 @@
+# 스도쿠 팀 프로젝트 - 회원 기록 열(column) 스냅샷
+#
+# 회원 dict 는 (passwd, tries, wins) 튜플을 플레이어마다 들고 있어서
+# 한 명에 100 bytes 넘게 쓰고, 전체 통계를 낼 때도 느리다.
+# 스냅샷은 같은 내용을 열 단위 배열로 파일에 쓰고 mmap 으로 열어서
+# 파일을 통째로 읽지 않고도(복사 없이) 바로 통계를 낸다. 비밀번호는 넣지 않는다.
+#
+# 파일 형식 (sudoku_members.snap, 숫자는 모두 little-endian 4 bytes)
+#   헤더        : "<4sB3xQ" (매직 b"SDKM", 버전, 회원 수 N) 16 bytes
+#   offsets     : N + 1 개. k 번째 이름은 names[offsets[k]:offsets[k + 1]]
+#   tries       : N 개
+#   wins        : N 개
+#   wins_sorted : N 개 (wins 를 정렬한 것, 백분위 계산용)
+#   names       : 이름을 바이트 순서로 정렬해 이어 붙인 utf-8
+#
+# 통계는 memoryview 위에서 map / compress / Counter 같은 C 로 된 반복만 써서
+# 파이썬 for 문 없이 계산한다.
+#
+# 사용법
+#   python sudoku_snapshot.py build [회원 파일] [스냅샷 파일]
+#   python sudoku_snapshot.py stats [스냅샷 파일] [이름]
+#   python sudoku_snapshot.py bench [회원 수]
+
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import compress, repeat
+from operator import floordiv, mul
+
+from sudoku_store import MEMBERS_FILE, read_members
+
+SNAPSHOT_FILE = "sudoku_members.snap"
+
+MAGIC = b"SDKM"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xQ")
+
+
+# ========================
+# 쓰기
+# ========================
+
+def write_snapshot(members, path=SNAPSHOT_FILE):
+    """members = {name: (passwd, tries, wins)} 를 스냅샷으로 저장"""
+    names = sorted(name.encode() for name in members)
+    offsets = array('I', [0])
+    tries = array('I')
+    wins = array('I')
+    for name in names:
+        _, t, w = members[name.decode()]
+        offsets.append(offsets[-1] + len(name))
+        tries.append(t)
+        wins.append(w)
+    wins_sorted = array('I', sorted(wins))
+    columns = (offsets, tries, wins, wins_sorted)
+    if sys.byteorder == "big":
+        for column in columns:
+            column.byteswap()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(names)))
+        for column in columns:
+            column.tofile(file)
+        file.write(b"".join(names))
+    os.replace(tmp, path)
+
+
+# 회원 파일 -> 스냅샷
+def build_snapshot(members_path=MEMBERS_FILE, path=SNAPSHOT_FILE):
+    write_snapshot(read_members(members_path), path)
+
+
+# ========================
+# 읽기
+# ========================
+
+class MemberSnapshot:
+    """mmap 으로 연 스냅샷. tries / wins / wins_sorted 는 'I' memoryview"""
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a member snapshot")
+        self.count = count
+        view = memoryview(self._map)
+        start = HEADER.size
+        columns = []
+        for size in (count + 1, count, count, count):
+            column = view[start:start + 4 * size].cast('I')
+            if sys.byteorder == "big":  # 복사해서 바이트 순서 뒤집기
+                column = array('I', column)
+                column.byteswap()
+            columns.append(column)
+            start += 4 * size
+        self.offsets, self.tries, self.wins, self.wins_sorted = columns
+        self._names = view[start:]
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for name in ("offsets", "tries", "wins", "wins_sorted", "_names"):
+            column = self.__dict__.pop(name, None)
+            if isinstance(column, memoryview):
+                column.release()
+        self._map.close()
+        self._file.close()
+
+    def name(self, k):
+        return bytes(self._names[self.offsets[k]:self.offsets[k + 1]]).decode()
+
+    def find(self, name):
+        """이름의 위치 (없으면 -1). 이름이 정렬되어 있어 이진 탐색"""
+        key = name.encode()
+        names, offsets = self._names, self.offsets
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(names[offsets[mid]:offsets[mid + 1]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and names[offsets[lo]:offsets[lo + 1]] == key:
+            return lo
+        return -1
+
+    def record(self, name):
+        """(tries, wins) 리턴. 없으면 None"""
+        k = self.find(name)
+        if k < 0:
+            return None
+        return self.tries[k], self.wins[k]
+
+    # ========================
+    # 통계
+    # ========================
+
+    def totals(self):
+        """(전체 게임 수, 전체 승리 수)"""
+        return sum(self.tries), sum(self.wins)
+
+    def active_players(self, min_tries=1):
+        """min_tries 판 이상 한 플레이어 수"""
+        return sum(map(min_tries.__le__, self.tries))
+
+    def win_rate_histogram(self, bins=10, min_tries=1):
+        """승률을 bins 구간으로 나눈 플레이어 수 목록 (마지막 구간은 100% 포함)"""
+        active = list(map(min_tries.__le__, self.tries))
+        tries = compress(self.tries, active)
+        wins = compress(self.wins, active)
+        counts = Counter(map(floordiv, map(mul, wins, repeat(bins)), tries))
+        histogram = [counts[k] for k in range(bins)]
+        histogram[-1] += counts[bins]
+        return histogram
+
+    def percentile_rank(self, wins):
+        """wins 보다 적게 이긴 플레이어 비율 (0~100, 같은 수는 절반으로 셈)"""
+        if self.count == 0:
+            return 0.0
+        below = bisect_left(self.wins_sorted, wins)
+        same = bisect_right(self.wins_sorted, wins) - below
+        return 100 * (below + same / 2) / self.count
+
+    def top(self, n=5):
+        """승리 수 상위 n 명 [(이름, tries, wins)]"""
+        if n <= 0 or self.count == 0:
+            return []
+        cut = self.wins_sorted[max(0, self.count - n)]
+        picked = [k for k in compress(range(self.count),
+                                      map(cut.__le__, self.wins))]
+        picked.sort(key=lambda k: self.wins[k], reverse=True)
+        return [(self.name(k), self.tries[k], self.wins[k])
+                for k in picked[:n]]
+
+
+# ========================
+# 실행
+# ========================
+
+def stats(path=SNAPSHOT_FILE, name=None):
+    with MemberSnapshot(path) as snapshot:
+        tries, wins = snapshot.totals()
+        print(f"players {len(snapshot)}, active "
+              f"{snapshot.active_players()}, games {tries}, wins {wins}")
+        print("win rate  players")
+        for k, count in enumerate(snapshot.win_rate_histogram()):
+            print(f"{k * 10:>3}-{k * 10 + 10:<3}%  {count:>8}")
+        for rank, (who, t, w) in enumerate(snapshot.top(), 1):
+            print(f"ranked {rank} name : {who} tries : {t} wins : {w}")
+        if name is not None:
+            record = snapshot.record(name)
+            if record is None:
+                print(f"{name} : not found")
+            else:
+                print(f"{name} : tries {record[0]} wins {record[1]}, "
+                      f"percentile {snapshot.percentile_rank(record[1]):.1f}")
+
+
+def bench(count):
+    rng = random.Random(0)
+    tracemalloc.start()
+    members = {}
+    for k in range(count):
+        t = rng.randrange(200)
+        members[f"p{k}"] = (f"pw{k}", t, rng.randrange(t + 1))
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    path = f"bench.{os.getpid()}.snap"
+    try:
+        write_snapshot(members, path)
+        print(f"{count} players : dict about {dict_bytes / count:.0f} "
+              f"bytes/player, snapshot {os.path.getsize(path) / count:.1f} "
+              f"bytes/player")
+        with MemberSnapshot(path) as snapshot:
+            for label, query in (
+                    ("totals", snapshot.totals),
+                    ("active_players", snapshot.active_players),
+                    ("win_rate_histogram", snapshot.win_rate_histogram),
+                    ("percentile_rank x1000",
+                     lambda: [snapshot.percentile_rank(w)
+                              for w in range(1000)]),
+                    ("find x1000",
+                     lambda: [snapshot.find(f"p{k}") for k in range(1000)])):
+                start = time.perf_counter()
+                query()
+                elapsed = time.perf_counter() - start
+                print(f"  {label:<22} {elapsed * 1000:>9.1f} ms")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "build":
+        build_snapshot(*sys.argv[2:4])
+    elif command == "stats":
+        stats(sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_FILE,
+              sys.argv[3] if len(sys.argv) > 3 else None)
+    elif command == "bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+    else:
+        print("usage : python sudoku_snapshot.py build [members] [snapshot]"
+              " | stats [snapshot] [name] | bench [players]")
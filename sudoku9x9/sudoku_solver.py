@@ -0,0 +1,196 @@
+# 스도쿠 팀 프로젝트 - 풀이기(solver)
+#
+# unit(행 / 열 / 블럭 / 대각선 / 조각 / 케이지)마다 이미 쓴 숫자를
+# 비트마스크로 들고 다니면서 후보가 가장 적은 칸부터 채워 보는 백트래킹 풀이기
+# 어떤 unit 들이 있는지는 sudoku_units.Layout 이 정함 (기본은 일반 스도쿠)
+#
+# 숫자 d 는 비트 1 << (d - 1) 로 나타냄
+#
+# dead_ends(set) 를 넘기면 해가 없다고 밝혀진 중간 상태를
+# (Layout.key, Zobrist 해시) 로 모아 두었다가 같은 상태를 다시 만나면 바로
+# 건너뛴다 (transposition table). 같은 게임의 힌트 / 유일해 검사처럼 비슷한
+# 보드를 여러 번 풀 때 같이 쓰면 좋음. 배치가 다르면 같은 보드라도
+# 막힌 상태가 다르므로 키에 배치를 넣어 set 을 나눠 써도 섞이지 않음
+
+from sudoku_units import standard_layout
+from sudoku_zobrist import board_hash, zobrist_table
+
+DEAD_END_LIMIT = 1 << 16   # dead_ends 가 이보다 커지면 비움
+
+
+# ========================
+# 풀이 준비
+# ========================
+
+# 보드 -> 비트마스크 상태
+def _prepare(board, layout):
+    """(unit 별 마스크, 케이지 합, 케이지 빈칸 수, 빈칸 목록) 리턴
+
+    규칙에 어긋나면 None
+    """
+    side = len(board)
+    used = [0] * len(layout.units)
+    cage_sum = [0] * len(layout.cages)
+    cage_empty = [len(cells) for cells, _ in layout.cages]
+    empties = []
+    for cell in range(side * side):
+        v = board[cell // side][cell % side]
+        if v == 0:
+            empties.append(cell)
+            continue
+        bit = 1 << (v - 1)
+        for u in layout.cell_units[cell]:
+            if used[u] & bit:
+                return None
+            used[u] |= bit
+        k = layout.cell_cage[cell]
+        if k >= 0:
+            cage_sum[k] += v
+            cage_empty[k] -= 1
+    for k, (_, total) in enumerate(layout.cages):
+        if cage_sum[k] + cage_empty[k] > total or \
+                (cage_empty[k] == 0 and cage_sum[k] != total):
+            return None
+    return used, cage_sum, cage_empty, empties
+
+
+_popcounts = {}
+
+
+# 마스크 -> 후보 수 표 (side 가 16 이하일 때만)
+def _popcount_table(side):
+    if side > 16:
+        return None
+    table = _popcounts.get(side)
+    if table is None:
+        table = _popcounts[side] = [bin(m).count("1")
+                                    for m in range(1 << side)]
+    return table
+
+
+# 킬러 케이지 합으로 후보 줄이기
+def _cage_candidates(mask, remaining, empty):
+    """남은 합 remaining, 남은 빈칸 empty 일 때 mask 중 가능한 숫자만"""
+    if empty == 1:
+        return mask & (1 << (remaining - 1)) if remaining >= 1 else 0
+    # 나머지 빈칸에 최소 1 씩은 들어가야 함
+    limit = remaining - (empty - 1)
+    if limit < 1:
+        return 0
+    return mask & ((1 << limit) - 1)
+
+
+# 백트래킹 탐색
+def search_solutions(board, limit, dead_ends=None, layout=None):
+    """(찾은 해의 수(limit 까지), 첫 번째 해) 리턴"""
+    side = len(board)
+    layout = layout or standard_layout(side)
+    state = _prepare(board, layout)
+    if state is None:
+        return 0, None
+    used, cage_sum, cage_empty, empties = state
+    cell_units = layout.cell_units
+    cell_cage = layout.cell_cage
+    cages = layout.cages
+    full = (1 << side) - 1
+    popcount = _popcount_table(side)
+    three = all(len(us) == 3 for us in cell_units)
+    grid = [v for row in board for v in row]
+    found = [0, None]
+    if dead_ends is not None and len(dead_ends) > DEAD_END_LIMIT:
+        dead_ends.clear()
+    table = zobrist_table(side)
+    layout_key = layout.key
+
+    # 칸의 후보 마스크 (킬러 케이지가 있는 배치에서만 사용)
+    def cage_candidates(cell, mask):
+        k = cell_cage[cell]
+        if k >= 0 and mask:
+            mask = _cage_candidates(mask, cages[k][1] - cage_sum[k],
+                                    cage_empty[k])
+        return mask
+
+    def search(remaining, h):
+        if dead_ends is not None and (layout_key, h) in dead_ends:
+            return False
+        if not remaining:
+            found[0] += 1
+            if found[1] is None:
+                found[1] = [grid[r * side:(r + 1) * side]
+                            for r in range(side)]
+            return found[0] >= limit
+        # 후보가 가장 적은 칸 고르기
+        best = -1
+        best_mask = 0
+        best_count = side + 1
+        for k, cell in enumerate(remaining):
+            if three:  # 행 / 열 / 블럭(조각) 만 있는 배치는 펼쳐서 계산
+                a, b, c = cell_units[cell]
+                taken = used[a] | used[b] | used[c]
+            else:
+                taken = 0
+                for u in cell_units[cell]:
+                    taken |= used[u]
+            mask = full & ~taken
+            if cages:
+                mask = cage_candidates(cell, mask)
+            count = popcount[mask] if popcount else bin(mask).count("1")
+            if count < best_count:
+                best, best_mask, best_count = k, mask, count
+                if count <= 1:
+                    break
+        if best_count == 0:
+            return False
+        cell = remaining[best]
+        rest = remaining[:best] + remaining[best + 1:]
+        units = cell_units[cell]
+        cage = cell_cage[cell]
+        mask = best_mask
+        before = found[0]
+        z = cell * (side + 1)
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            v = bit.bit_length()
+            for u in units:
+                used[u] |= bit
+            if cage >= 0:
+                cage_sum[cage] += v
+                cage_empty[cage] -= 1
+            grid[cell] = v
+            if search(rest, h ^ table[z + v]):
+                return True
+            for u in units:
+                used[u] ^= bit
+            if cage >= 0:
+                cage_sum[cage] -= v
+                cage_empty[cage] += 1
+        grid[cell] = 0
+        if dead_ends is not None and found[0] == before:
+            dead_ends.add((layout_key, h))
+        return False
+
+    search(empties, board_hash(board))
+    return found[0], found[1]
+
+
+# ========================
+# 풀이 함수
+# ========================
+
+# 풀기
+def solve(board, dead_ends=None, layout=None):
+    """해 하나를 리턴. 해가 없으면 None"""
+    return search_solutions(board, 1, dead_ends, layout)[1]
+
+
+# 해의 개수 세기
+def count_solutions(board, limit=2, dead_ends=None, layout=None):
+    """해의 개수를 limit 까지만 세서 리턴"""
+    return search_solutions(board, limit, dead_ends, layout)[0]
+
+
+# 유일해 검사
+def has_unique_solution(board, dead_ends=None, layout=None):
+    """해가 정확히 하나인지 검사"""
+    return count_solutions(board, 2, dead_ends, layout) == 1
@@ -0,0 +1,446 @@
+# 스도쿠 팀 프로젝트 - 관전(spectator) 방송
+#
+# 대회에서 멀티 모드 게임을 여러 사람이 실시간으로 볼 수 있도록
+# 이벤트 버스의 SpectatorSink 가 수마다 "바뀐 칸 + 남은 도전기회" 만 담은
+# 작은 메시지를 만들어 로컬 소켓으로 구독자(관전자)들에게 보낸다.
+#   - 메시지는 한 번만 만들고(encode once) 최근 MAX_PENDING 개를 공용 목록에
+#     둔다. 구독자마다 어디까지 받았는지만 기억하므로 방송은 O(1)
+#   - 보내기는 뒤에서 도는 스레드가 non-blocking 소켓으로 함
+#     (sink 는 이벤트 버스 스레드에서 돌므로 입력 루프는 전혀 기다리지 않음)
+#   - MAX_PENDING 개보다 더 밀린 구독자(느린 관전자)는 밀린 메시지 대신
+#     그 사이의 변화를 모두 합친 현재 상태(snapshot) 하나만 받음
+#   - 새 구독자도 처음에 snapshot 을 받음
+#     snapshot 은 수마다 만들지 않고, 방송 스레드가 그런 구독자가 있을 때만
+#     sink 와 같은 잠금 안에서 만든다.
+#   - 메시지마다 게임별 순서 번호(seq)를 붙이고, 게임마다 SNAPSHOT_EVERY 수에
+#     한 번씩 그 게임의 SNAPSHOT 도 보낸다. 관전자는 번호가 건너뛰면
+#     그 게임을 다음 SNAPSHOT 까지 보여 주지 않음 (다시 맞추기)
+#
+# 메시지 형식 (little-endian)
+#   헤더 : "<HBIBH" (뒤따르는 길이, 종류, 게임 번호, 남은 도전기회, seq)
+#          seq 는 게임마다 1 부터 (65536 에서 0 으로 돌아감).
+#          전체 snapshot 안의 SNAPSHOT 은 그 게임의 마지막 seq 를 씀
+#   RESET    : 내용 없음 (알고 있던 게임을 모두 잊음, snapshot 맨 앞)
+#   SNAPSHOT : 보드 81 bytes
+#   DIFF     : (칸 번호, 새 값) 2 bytes 씩
+#   END      : 게임 결과 + 1 (1 byte)
+#
+# 주소 : "host:port" 면 TCP, 아니면 Unix 소켓 파일 경로
+#
+# 사용법
+#   python sudoku9x9_final.py --spectate [주소]    게임 방송
+#   python sudoku_spectate.py watch [주소]         관전
+#   python sudoku_spectate.py bench [구독자 수] [메시지 수]
+
+import collections
+import itertools
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+
+from sudoku_history import MoveHistory, board_to_bytes
+
+SPECTATE_ADDRESS = "sudoku_spectate.sock"
+MAX_PENDING = 64        # 밀린 구독자에게 그대로 보내 줄 최근 메시지 수
+SNAPSHOT_EVERY = 64     # 게임마다 이만큼의 메시지에 한 번 보드 전체를 보냄
+
+SIDE = 9
+CELLS = SIDE * SIDE
+
+HEADER = struct.Struct("<HBIBH")
+RESET, SNAPSHOT, DIFF, END = range(4)
+
+
+# 메시지 하나
+def encode(kind, game, try_points, seq=0, payload=b""):
+    return HEADER.pack(HEADER.size - 2 + len(payload), kind, game,
+                       try_points, seq) + payload
+
+
+# 주소 -> (소켓 종류, 주소)
+def parse_address(address):
+    if ":" in address or not hasattr(socket, "AF_UNIX"):
+        host, _, port = address.rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port or 8765))
+    return socket.AF_UNIX, address
+
+
+# ========================
+# 방송
+# ========================
+
+class Subscriber:
+    def __init__(self, sock):
+        self.sock = sock
+        self.cursor = -1        # 다음에 보낼 메시지 번호 (-1 : snapshot 부터)
+        self.pending = b""      # 보내는 중인 bytes
+        self.offset = 0
+        self.writing = False    # selector 에 EVENT_WRITE 로 등록했는지
+
+
+class Broadcaster:
+    """구독자들에게 메시지를 나눠 보내는 스레드
+
+    메시지는 최근 max_pending 개만 공용 목록에 두고, 구독자마다
+    어디까지 보냈는지(cursor)만 기억한다. 그래서 publish 는 구독자 수와
+    상관없이 O(1) 이고, 목록보다 더 밀린 구독자는 snapshot() 을 받음
+    snapshot() 은 lock 을 잡은 채로 부르므로, 상태를 바꾸고 publish 하는
+    쪽도 같은 lock 안에서 해야 snapshot 과 메시지 순서가 맞음
+    """
+
+    def __init__(self, address=SPECTATE_ADDRESS, max_pending=MAX_PENDING,
+                 snapshot=None):
+        self.max_pending = max_pending
+        # 지금까지의 모든 변화를 합친 메시지를 만드는 함수 (느린 / 새 구독자용)
+        self.snapshot = snapshot or (lambda: encode(RESET, 0, 0))
+        self.lock = threading.RLock()
+        self.dropped = 0        # 느린 구독자가 건너뛴 메시지 수
+        self.resyncs = 0        # 건너뛴 대신 보낸 snapshot 수
+        self.subscribers = {}
+        self._log = collections.deque()
+        self._first = 0         # 목록 맨 앞 메시지 번호
+        self._next = 0          # 다음 메시지 번호
+        family, self.address = parse_address(address)
+        if family == getattr(socket, "AF_UNIX", None) and \
+                os.path.exists(self.address):
+            os.remove(self.address)
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(self.address)
+        self._server.listen(1024)
+        self._server.setblocking(False)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def publish(self, message):
+        """message 를 방송 (기다리지 않음)"""
+        with self.lock:
+            self._log.append(message)
+            self._next += 1
+            if len(self._log) > self.max_pending:
+                self._log.popleft()
+                self._first += 1
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def _run(self):
+        while not self._closing:
+            for key, mask in self._selector.select(timeout=1.0):
+                if key.fileobj is self._server:
+                    self._accept()
+                elif key.fileobj is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                elif mask & selectors.EVENT_READ:
+                    self._check_closed(key.fileobj)
+            for sub in list(self.subscribers.values()):
+                if sub.pending or sub.cursor < self._next:
+                    self._send(sub)
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except (BlockingIOError, OSError):
+                return
+            sock.setblocking(False)
+            self.subscribers[sock] = Subscriber(sock)
+            self._selector.register(sock, selectors.EVENT_READ)
+
+    # 구독자는 보내는 것이 없으므로 읽을 것이 생기면 연결이 끊긴 것
+    def _check_closed(self, sock):
+        try:
+            data = sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(sock)
+
+    def _drop(self, sock):
+        self.subscribers.pop(sock, None)
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
+
+    # 구독자에게 보낼 다음 bytes (밀린 메시지를 한 번에)
+    def _next_chunk(self, sub):
+        with self.lock:
+            if sub.cursor < self._first:
+                if sub.cursor >= 0:
+                    self.dropped += self._first - sub.cursor
+                    self.resyncs += 1
+                sub.cursor = self._next
+                return self.snapshot()
+            start = sub.cursor - self._first
+            sub.cursor = self._next
+            if start == len(self._log) - 1:
+                return self._log[start]
+            return b"".join(itertools.islice(self._log, start, None))
+
+    # 보낼 수 있는 만큼 보내기
+    def _send(self, sub):
+        try:
+            while True:
+                if not sub.pending:
+                    if sub.cursor >= self._next:
+                        break
+                    sub.pending = self._next_chunk(sub)
+                    sub.offset = 0
+                sent = sub.sock.send(memoryview(sub.pending)[sub.offset:])
+                sub.offset += sent
+                if sub.offset < len(sub.pending):
+                    break
+                sub.pending = b""
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._drop(sub.sock)
+            return
+        want = bool(sub.pending)
+        if want != sub.writing:
+            events = selectors.EVENT_READ | \
+                (selectors.EVENT_WRITE if want else 0)
+            self._selector.modify(sub.sock, events)
+            sub.writing = want
+
+    def close(self):
+        self._closing = True
+        self._wake()
+        self._thread.join()
+        for sock in list(self.subscribers):
+            self._drop(sock)
+        self._selector.close()
+        self._server.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+
+# ========================
+# 이벤트 버스 sink
+# ========================
+
+class SpectatorSink:
+    """게임 이벤트를 보드 변화 메시지로 바꿔 방송"""
+
+    def __init__(self, address=SPECTATE_ADDRESS, broadcaster=None,
+                 every=SNAPSHOT_EVERY):
+        self.broadcaster = broadcaster or Broadcaster(address)
+        self.broadcaster.snapshot = self._snapshot
+        self.every = every
+        self._games = {}    # 게임 번호 -> [MoveHistory, 남은 도전기회, seq]
+
+    # 모든 게임의 현재 보드 (방송 스레드가 lock 안에서 필요할 때만 부름)
+    def _snapshot(self):
+        return encode(RESET, 0, 0) + b"".join(
+            encode(SNAPSHOT, game, points, seq, board_to_bytes(history.board))
+            for game, (history, points, seq) in self._games.items())
+
+    # 게임의 다음 seq 를 붙여 방송
+    def _publish(self, game, state, kind, payload):
+        state[2] = (state[2] + 1) & 0xFFFF
+        self.broadcaster.publish(encode(kind, game, state[1], state[2],
+                                        payload))
+        if kind == DIFF and state[2] % self.every == 0:
+            self._publish(game, state, SNAPSHOT,
+                          board_to_bytes(state[0].board))
+
+    def handle(self, event):
+        with self.broadcaster.lock:
+            self._handle(event)
+
+    def _handle(self, event):
+        data = event.data
+        game = data.get("game")
+        if event.kind == "game_started":
+            board = [row[:] for row in data["puzzle"]]
+            state = self._games[game] = [MoveHistory(board),
+                                         data["try_points"], 0]
+            self._publish(game, state, SNAPSHOT, board_to_bytes(board))
+            return
+        state = self._games.get(game)
+        if state is None:
+            return
+        history = state[0]
+        if event.kind == "move_made":
+            state[1] = max(state[1] - 1, 0)
+            changed = b""
+            if data["correct"]:
+                history.record(data["row"], data["col"], data["number"])
+                changed = bytes((data["row"] * SIDE + data["col"],
+                                 data["number"]))
+            self._publish(game, state, DIFF, changed)
+        elif event.kind == "history":
+            move = history.undo() if data["command"] == "u" else \
+                history.redo()
+            if move is not None:
+                self._publish(game, state, DIFF,
+                              bytes((move[0] * SIDE + move[1], move[3])))
+        elif event.kind == "game_finished":
+            del self._games[game]
+            self._publish(game, state, END, bytes((data["result"] + 1,)))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.broadcaster.close()
+
+
+# ========================
+# 관전
+# ========================
+
+# 소켓에서 메시지를 하나씩 꺼내기
+def iter_messages(sock):
+    """(종류, 게임 번호, 남은 도전기회, seq, 내용) 을 차례로 리턴"""
+    buffer = bytearray()
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            return
+        buffer += data
+        offset = 0
+        while len(buffer) - offset >= 2:
+            length, = struct.unpack_from("<H", buffer, offset)
+            if len(buffer) - offset < 2 + length:
+                break
+            _, kind, game, points, seq = HEADER.unpack_from(buffer, offset)
+            payload = bytes(buffer[offset + HEADER.size:offset + 2 + length])
+            offset += 2 + length
+            yield kind, game, points, seq, payload
+        del buffer[:offset]
+
+
+def watch(address=SPECTATE_ADDRESS):
+    family, address = parse_address(address)
+    boards = {}
+    seqs = {}       # 게임 -> 마지막으로 받은 seq
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.connect(address)
+        for kind, game, points, seq, payload in iter_messages(sock):
+            if kind == RESET:
+                boards.clear()
+                seqs.clear()
+                continue
+            if kind == SNAPSHOT:
+                boards[game] = bytearray(payload)
+                seqs[game] = seq
+            elif game in seqs and seq != (seqs[game] + 1) & 0xFFFF:
+                # 놓친 메시지가 있음 : 다음 SNAPSHOT 까지 이 게임은 보류
+                print(f"game {game} out of sync, waiting for a snapshot")
+                boards.pop(game, None)
+                seqs.pop(game, None)
+                continue
+            if game in seqs:
+                seqs[game] = seq
+            if kind == DIFF and game in boards:
+                for k in range(0, len(payload), 2):
+                    boards[game][payload[k]] = payload[k + 1]
+            elif kind == END:
+                result = {2: "won", 1: "quit", 0: "lost"}[payload[0]]
+                print(f"game {game} finished : {result}")
+                boards.pop(game, None)
+                seqs.pop(game, None)
+                continue
+            board = boards.get(game)
+            if board is None:
+                continue
+            print(f"game {game}  tries left {points}")
+            for r in range(SIDE):
+                print(" ".join(str(v) if v else "."
+                               for v in board[r * SIDE:(r + 1) * SIDE]))
+            print()
+
+
+def bench(subscribers, messages):
+    address = f"bench.{os.getpid()}.sock"
+    sink = SpectatorSink(address)
+    clients = []
+    family, target = parse_address(address)
+    for _ in range(subscribers):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.connect(target)
+        sock.setblocking(False)
+        clients.append(sock)
+    time.sleep(0.2)
+    # 절반은 계속 읽고(빠른 관전자), 절반은 읽지 않음(느린 관전자)
+    readers = clients[:subscribers // 2]
+    received = [0]
+    stop = threading.Event()
+
+    def read_all():
+        selector = selectors.DefaultSelector()
+        for sock in readers:
+            selector.register(sock, selectors.EVENT_READ)
+        while not stop.is_set():
+            for key, _ in selector.select(timeout=0.1):
+                try:
+                    received[0] += len(key.fileobj.recv(65536))
+                except BlockingIOError:
+                    pass
+        selector.close()
+
+    reader = threading.Thread(target=read_all, daemon=True)
+    reader.start()
+    Event = collections.namedtuple("Event", "kind time data")
+    puzzle = [[0] * SIDE for _ in range(SIDE)]
+    sink.handle(Event("game_started", 0.0,
+                      {"game": 1, "puzzle": puzzle, "holes": 81,
+                       "try_points": 84}))
+    start = time.perf_counter()
+    for k in range(messages):
+        cell = k % CELLS
+        sink.handle(Event("move_made", 0.0,
+                          {"game": 1, "row": cell // SIDE,
+                           "col": cell % SIDE, "number": k % 9 + 1,
+                           "correct": k % 3 != 0}))
+    elapsed = time.perf_counter() - start
+    time.sleep(0.5)
+    stop.set()
+    reader.join()
+    broadcaster = sink.broadcaster
+    print(f"{subscribers} subscribers, {messages} moves : publish "
+          f"{elapsed / messages * 1e6:.1f} us per move, "
+          f"{received[0]} bytes read by {len(readers)} fast subscribers, "
+          f"dropped {broadcaster.dropped} messages, "
+          f"{broadcaster.resyncs} snapshots sent")
+    for sock in clients:
+        sock.close()
+    sink.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "watch":
+        watch(sys.argv[2] if len(sys.argv) > 2 else SPECTATE_ADDRESS)
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+              int(sys.argv[3]) if len(sys.argv) > 3 else 2000)
+    else:
+        print("usage : python sudoku_spectate.py watch [address]"
+              " | bench [subscribers] [moves]")
@@ -0,0 +1,201 @@
+# 스도쿠 팀 프로젝트 - 풀이 시간 통계
+#
+# 게임마다 한 수 한 수의 기록(timeline)을 남기고,
+# (플레이어, 난이도) 별로 풀이 시간 분포를 로그 눈금 히스토그램에 모은다.
+# 히스토그램은 칸 수가 고정이라 게임을 몇 판 하든 메모리가 늘지 않고,
+# p50 / p90 / p99 는 원본 기록을 다시 읽지 않고 히스토그램에서 바로 구한다.
+# 통계 파일은 파일 잠금을 잡고 다시 읽은 뒤 더해서 저장한다 (sudoku_store 참고)
+#
+# 사용법 : python sudoku_stats.py report [이름]
+
+import json
+import os
+import sys
+import time
+
+from sudoku_store import file_lock
+
+STATS_FILE = "sudoku_stats.json"
+TIMELINE_FILE = "sudoku_timelines.ndjson"
+
+# 구멍 수 -> 난이도 (get_level 참고)
+LEVEL_BY_HOLES = {6: 1, 8: 2, 10: 3}
+
+SUB_BITS = 5           # 2 배 구간 하나를 16 칸으로 나눔 (상대 오차 약 3%)
+MAX_EXPONENT = 32      # 밀리초 기준 약 50 일까지
+
+
+# ========================
+# 로그 눈금 히스토그램
+# ========================
+
+class LogHistogram:
+    """HDR 방식의 고정 크기 히스토그램 (단위 : 밀리초)"""
+
+    size = (MAX_EXPONENT + 1) << SUB_BITS
+
+    def __init__(self, counts=None):
+        self.counts = counts if counts is not None else [0] * self.size
+        self.total = sum(self.counts)
+
+    # 값 -> 칸 번호
+    @staticmethod
+    def bucket(ms):
+        if ms < (1 << SUB_BITS):
+            return ms
+        exponent = ms.bit_length() - SUB_BITS
+        index = (exponent << SUB_BITS) + (ms >> exponent)
+        return min(index, LogHistogram.size - 1)
+
+    # 칸 번호 -> 칸의 대표값
+    @staticmethod
+    def value(index):
+        exponent, sub = divmod(index, 1 << SUB_BITS)
+        if exponent == 0:
+            return sub
+        # 칸의 가운데 값
+        return (sub << exponent) + (1 << exponent) // 2
+
+    def add(self, seconds):
+        self.counts[self.bucket(int(seconds * 1000))] += 1
+        self.total += 1
+
+    def percentile(self, q):
+        """q (0~100) 백분위수를 초 단위로 리턴"""
+        if self.total == 0:
+            return None
+        rank = max(1, round(self.total * q / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.value(index) / 1000
+        return None
+
+    # 0 이 아닌 칸만 저장
+    def to_json(self):
+        return {str(k): v for k, v in enumerate(self.counts) if v}
+
+    @classmethod
+    def from_json(cls, data):
+        counts = [0] * cls.size
+        for k, v in data.items():
+            counts[int(k)] = v
+        return cls(counts)
+
+
+# ========================
+# 한 판의 기록
+# ========================
+
+class GameTimeline:
+    """sudoku_mini 에 넘겨서 한 수 한 수를 기록하는 recorder"""
+
+    def __init__(self, player=None):
+        self.player = player
+        self.level = None
+        self.seed = None
+        self.moves = []      # (경과 초, 행, 열, 숫자, 정답 여부) 또는 (경과 초, u/r)
+        self.result = None
+        self.elapsed = 0.0
+        self._start = None
+
+    # now 를 넘기면 그 시각(perf_counter 값)에 일어난 일로 기록
+    def start(self, puzzle_board, solution_board, no_of_holes, seed,
+              now=None):
+        self.level = LEVEL_BY_HOLES.get(no_of_holes, no_of_holes)
+        self.seed = seed
+        self._start = time.perf_counter() if now is None else now
+
+    def _elapsed(self, now):
+        return (time.perf_counter() if now is None else now) - self._start
+
+    def move(self, i, j, n, correct, now=None):
+        self.moves.append((round(self._elapsed(now), 3), i, j, n, correct))
+
+    def history(self, command, now=None):
+        self.moves.append((round(self._elapsed(now), 3), command))
+
+    def finish(self, result, now=None):
+        self.result = result
+        self.elapsed = self._elapsed(now)
+
+    def to_json(self):
+        return {"player": self.player, "level": self.level,
+                "seed": self.seed, "result": self.result,
+                "elapsed": round(self.elapsed, 3), "moves": self.moves}
+
+
+# ========================
+# 플레이어 / 난이도 별 통계
+# ========================
+
+class SolveStats:
+    """(플레이어, 난이도) 별 풀이 시간 히스토그램 모음"""
+
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self.sketches = {}
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                data = json.load(file)
+            for key, counts in data.items():
+                player, level = key.rsplit("/", 1)
+                self.sketches[(player, int(level))] = \
+                    LogHistogram.from_json(counts)
+
+    def add(self, player, level, seconds):
+        sketch = self.sketches.get((player, level))
+        if sketch is None:
+            sketch = self.sketches[(player, level)] = LogHistogram()
+        sketch.add(seconds)
+
+    def summary(self, player, level):
+        """(판 수, p50, p90, p99) 리턴"""
+        sketch = self.sketches.get((player, level))
+        if sketch is None:
+            return 0, None, None, None
+        return (sketch.total, sketch.percentile(50),
+                sketch.percentile(90), sketch.percentile(99))
+
+    def save(self):
+        data = {f"{player}/{level}": sketch.to_json()
+                for (player, level), sketch in self.sketches.items()}
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp, self.path)
+
+
+# 게임 기록 저장
+def record_timeline(timeline, stats_path=STATS_FILE,
+                    timeline_path=TIMELINE_FILE):
+    """timeline 을 로그 파일에 덧붙이고, 이긴 게임이면 풀이 시간 통계에 반영"""
+    with open(timeline_path, "a") as file:
+        file.write(json.dumps(timeline.to_json()) + "\n")
+    if timeline.result == 1 and timeline.player is not None:
+        # 다른 프로세스의 기록을 덮어쓰지 않도록 잠금 상태에서 읽고 저장
+        with file_lock(stats_path):
+            stats = SolveStats(stats_path)
+            stats.add(timeline.player, timeline.level, timeline.elapsed)
+            stats.save()
+
+
+# 통계 출력
+def report(player=None, stats_path=STATS_FILE):
+    """플레이어 / 난이도 별 p50 / p90 / p99 풀이 시간 출력"""
+    stats = SolveStats(stats_path)
+    print("name  level  games     p50     p90     p99 (seconds)")
+    for (name, level) in sorted(stats.sketches):
+        if player is not None and name != player:
+            continue
+        games, p50, p90, p99 = stats.summary(name, level)
+        print(f"{name:<5} {level:>5} {games:>6} "
+              f"{p50:>7.1f} {p90:>7.1f} {p99:>7.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "report":
+        report(sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        print("usage : python sudoku_stats.py report [name]")
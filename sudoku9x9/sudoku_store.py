@@ -0,0 +1,213 @@
+# 스도쿠 팀 프로젝트 - 회원 기록 저장소
+#
+# 게임 두 개가 동시에 끝나면 각자 회원 dict 전체를 덮어써서
+# 한 명의 tries / wins 가 사라질 수 있다. 그래서
+#   1. 파일 잠금(lock)을 잡은 상태에서
+#   2. 파일을 새로 읽고, 플레이어별 증가분(delta)만 더한 뒤
+#   3. 임시 파일에 쓰고 이름을 바꿔(rename) 한 번에 교체한다.
+# 같은 프로세스 안에서 동시에 들어온 기록은 한 번의 저장(flush)으로 묶는다.
+#
+# 파일 형식은 sudoku9x9_final.load_members 와 같음 : name,passwd,tries,wins
+
+import contextlib
+import os
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MEMBERS_FILE = "sudoku_members.csv"
+
+
+# ========================
+# 파일 잠금
+# ========================
+
+# 잠금 잡기
+def _lock(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+# 잠금 풀기
+def _unlock(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# path 옆의 .lock 파일로 잠그기
+@contextlib.contextmanager
+def file_lock(path):
+    """with file_lock(path): 안에서는 다른 프로세스가 path 를 못 바꿈"""
+    with open(path + ".lock", "a") as lock_file:
+        _lock(lock_file)
+        try:
+            yield
+        finally:
+            _unlock(lock_file)
+
+
+# ========================
+# 읽기 / 쓰기
+# ========================
+
+# 기록 읽기
+def read_members(path=MEMBERS_FILE):
+    """회원 기록 파일 읽기 (파일이 없으면 빈 dict)"""
+    members = {}
+    if not os.path.exists(path):
+        return members
+    with open(path, "r") as file:
+        for line in file:
+            line = line.strip('\n')
+            if not line:
+                continue
+            name, passwd, tries, wins = line.split(',')
+            members[name] = (passwd, int(tries), int(wins))
+    return members
+
+
+# 기록 쓰기 (임시 파일 -> 이름 바꾸기)
+def write_members(members, path=MEMBERS_FILE):
+    """회원 기록 전체를 원자적으로(atomic) 저장"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as file:
+        for name, (passwd, tries, wins) in members.items():
+            file.write(f"{name},{passwd},{tries},{wins}\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, path)
+
+
+# 잠금 상태에서 증가분 반영
+def apply_deltas(deltas, path=MEMBERS_FILE):
+    """deltas = {name: (passwd, 더할 tries, 더할 wins)} 를 파일에 반영"""
+    with file_lock(path):
+        members = read_members(path)
+        for name, (passwd, d_tries, d_wins) in deltas.items():
+            # 이미 있는 회원은 저장된 비밀번호를 유지
+            old_passwd, tries, wins = members.get(name, (passwd, 0, 0))
+            members[name] = (old_passwd, tries + d_tries, wins + d_wins)
+        write_members(members, path)
+    return members
+
+
+# ========================
+# 묶어서 저장하는 저장소
+# ========================
+
+class MemberStore:
+    """동시에 들어온 기록을 한 번의 flush 로 묶어서 저장"""
+
+    def __init__(self, path=MEMBERS_FILE):
+        self.path = path
+        self.flushes = 0
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._batch = 0      # 지금 모으고 있는 묶음 번호
+        self._flushed = -1   # 저장이 끝난 마지막 묶음 번호
+
+    def update(self, name, passwd, tries=0, wins=0):
+        """플레이어 기록에 증가분을 더하고, 저장될 때까지 기다림"""
+        with self._pending_lock:
+            old = self._pending.get(name, (passwd, 0, 0))
+            self._pending[name] = (old[0], old[1] + tries, old[2] + wins)
+            batch = self._batch
+        with self._flush_lock:
+            # 다른 스레드가 이미 내 기록까지 저장했으면 끝
+            if self._flushed >= batch:
+                return
+            with self._pending_lock:
+                deltas = self._pending
+                self._pending = {}
+                flushing = self._batch
+                self._batch += 1
+            apply_deltas(deltas, self.path)
+            self._flushed = flushing
+            self.flushes += 1
+
+    def record_game(self, name, passwd, won):
+        """게임 한 판 결과 기록 (tries +1, 이기면 wins +1)"""
+        self.update(name, passwd, 1, 1 if won else 0)
+
+
+# ==========================
+# 동시 저장 점검
+# ==========================
+
+# 프로세스 하나가 쓰는 기록 (multiprocessing 으로 넘기므로 모듈 함수)
+def _write_games(path, k, games, names=10):
+    store = MemberStore(path)
+    for g in range(games):
+        store.record_game(f"p{(k + g) % names}", "pw", g % 2 == 0)
+    return store.flushes
+
+
+def check_concurrent_writers(path, writers=100, games=20, processes=True):
+    """writers 개의 writer 가 동시에 path 에 기록하게 하고
+    (tries 합, wins 합, 기대 tries, 기대 wins, flush 수, 걸린 초) 리턴
+
+    processes=True 면 writer 마다 프로세스 (파일 잠금 점검),
+    False 면 한 MemberStore 를 나눠 쓰는 스레드 (flush 묶기 점검)
+    """
+    start = time.perf_counter()
+    if processes:
+        import multiprocessing
+
+        with multiprocessing.Pool(writers) as pool:
+            flushes = sum(pool.starmap(
+                _write_games, [(path, k, games) for k in range(writers)],
+                chunksize=1))
+    else:
+        store = MemberStore(path)
+
+        def writer(k):
+            for g in range(games):
+                store.record_game(f"p{(k + g) % 10}", "pw", g % 2 == 0)
+
+        threads = [threading.Thread(target=writer, args=(k,))
+                   for k in range(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        flushes = store.flushes
+    elapsed = time.perf_counter() - start
+    members = read_members(path)
+    return (sum(tries for _, tries, _ in members.values()),
+            sum(wins for _, _, wins in members.values()),
+            writers * games, writers * ((games + 1) // 2), flushes, elapsed)
+
+
+def _report(writers=100, games=20):
+    import tempfile
+
+    ok = True
+    for processes in (True, False):
+        with tempfile.TemporaryDirectory() as folder:
+            tries, wins, want_tries, want_wins, flushes, elapsed = \
+                check_concurrent_writers(os.path.join(folder, "members.csv"),
+                                         writers, games, processes)
+        kind = "processes" if processes else "threads"
+        print(f"{writers} {kind} x {games} games : tries {tries} "
+              f"(expected {want_tries}), wins {wins} (expected {want_wins}), "
+              f"{flushes} flushes ({flushes / elapsed:.1f} flushes/sec, "
+              f"{writers * games / elapsed:.1f} updates/sec)")
+        ok = ok and (tries, wins) == (want_tries, want_wins)
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if _report() else 1)
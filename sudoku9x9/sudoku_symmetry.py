@@ -0,0 +1,307 @@
+# 스도쿠 팀 프로젝트 - 보드 대칭 변환 / 정규형
+#
+# 같은 스도쿠라도 밴드(가로 3줄 묶음) 순서, 스택(세로 3줄 묶음) 순서,
+# 밴드 안 행 순서, 스택 안 열 순서, 전치, 숫자 바꾸기를 하면 겉모습이 달라진다.
+# 이런 변환을 모두 적용한 것 중 가장 작은 모양을 "정규형"으로 삼는다.
+# (변환이 2 x 6^8 x 9! 가지라서 다 만들어 보지 않고 한 줄씩 가지치기로 찾음)
+#
+# 변환(transform)은 (transposed, row_map, col_map, relabel) 튜플
+#   transposed : 먼저 전치했는지 여부
+#   row_map    : 정규형 r 행이 원래(전치 후) 보드의 몇 번째 행인지
+#   col_map    : 정규형 c 열이 원래(전치 후) 보드의 몇 번째 열인지
+#   relabel    : 원래 숫자 -> 정규형 숫자 (0 은 항상 0)
+
+from itertools import permutations
+from math import isqrt
+
+
+# ========================
+# 변환 적용 함수
+# ========================
+
+# 가로세로 전환 (sudoku9x9_final.transpose 와 같은 동작)
+def transpose(board):
+    """보드를 전치(행 <-> 열 바꾸기)"""
+    size = len(board)
+    return [[board[j][i] for j in range(size)] for i in range(size)]
+
+
+# 밴드 순서 -> 행 번호 순서
+def block_order_to_lines(order, base):
+    """블럭 순서를 줄 번호 순서로 펼치기"""
+    return [block * base + k for block in order for k in range(base)]
+
+
+# 변환 적용
+def apply_transform(board, transform):
+    """원래 보드에 변환을 적용해 정규형 방향의 보드를 리턴"""
+    transposed, row_map, col_map, relabel = transform
+    src = transpose(board) if transposed else board
+    return [[relabel[src[r][c]] for c in col_map] for r in row_map]
+
+
+# 변환 되돌리기
+def invert_transform(board, transform):
+    """정규형 방향의 보드를 원래 보드 방향으로 되돌리기"""
+    transposed, row_map, col_map, relabel = transform
+    size = len(board)
+    inverse = [0] * len(relabel)
+    for digit, label in enumerate(relabel):
+        inverse[label] = digit
+    src = [[0] * size for _ in range(size)]
+    for r in range(size):
+        for c in range(size):
+            src[row_map[r]][col_map[c]] = inverse[board[r][c]]
+    return transpose(src) if transposed else src
+
+
+# 무작위 변환 뽑기
+def random_transform(rng, side=9):
+    """스도쿠 대칭군 전체에서 변환 하나를 뽑기
+
+    전치, 밴드 / 스택 순서, 밴드 안 행 순서, 스택 안 열 순서, 숫자 바꾸기
+    (shuffle_ribbons / transpose 는 이 중 밴드 안 행, 스택 안 열 순서만 씀)
+    """
+    base = isqrt(side)
+
+    def line_map():
+        blocks = list(range(base))
+        rng.shuffle(blocks)
+        lines = []
+        for block in blocks:
+            inner = list(range(base))
+            rng.shuffle(inner)
+            lines.extend(block * base + k for k in inner)
+        return lines
+
+    digits = list(range(1, side + 1))
+    rng.shuffle(digits)
+    relabel = [0] + digits
+    return rng.random() < 0.5, line_map(), line_map(), relabel
+
+
+# ========================
+# 정규형
+# ========================
+
+NEW = 255   # 정규형 비교에서 "처음 보는 숫자" (이미 번호가 붙은 숫자보다 큼)
+
+
+# 스택 하나에서 줄의 가장 작은 모양
+def _stack_parts(values, stack, relabel):
+    """stack = 열 묶음(group)들. 묶음 안에서 빈칸은 앞에 두고 계속 묶어 두며,
+    이미 번호가 붙은 숫자는 번호 순서로, 처음 보는 숫자는 그 뒤에 둠
+
+    (모양 bytes, 묶음마다 (빈칸 열, 번호 순 열, 처음 보는 숫자 열)) 리턴
+    """
+    pattern = bytearray()
+    parts = []
+    for group in stack:
+        zeros = tuple(c for c in group if not values[c])
+        known = tuple(sorted((c for c in group
+                              if values[c] and relabel[values[c]]),
+                             key=lambda c: relabel[values[c]]))
+        new = tuple(c for c in group
+                    if values[c] and not relabel[values[c]])
+        pattern += bytes(len(zeros))
+        pattern += bytes(relabel[values[c]] for c in known)
+        pattern += bytes((NEW,)) * len(new)
+        parts.append((zeros, known, new))
+    return bytes(pattern), parts
+
+
+# 가장 작은 모양을 만드는 스택 하나의 열 순서들
+def _stack_orders(parts):
+    """처음 보는 숫자들은 이 줄에서는 모두 같은 모양이고 받을 번호만 다르므로
+    모든 순서를 둠. [(열 순서, 새 stack)] 리턴"""
+    orders = [((), ())]
+    for zeros, known, new in parts:
+        head = (zeros,) if zeros else ()
+        alternatives = []
+        for order in permutations(new):
+            cells = known + order
+            alternatives.append((zeros + cells,
+                                 head + tuple((c,) for c in cells)))
+        orders = [(cols + more, groups + split)
+                  for cols, groups in orders
+                  for more, split in alternatives]
+    return orders
+
+
+# 줄 하나를 정규형의 다음 줄로 둘 때의 가장 작은 모양
+def _line_parts(values, slots, relabel):
+    """slots = 스택 자리들. 자리 하나에 스택이 여러 개면 지금까지 모두
+    빈칸이라 아직 순서를 정하지 못한 스택들
+
+    (모양 bytes, 자리마다 (빈칸뿐인 스택들, 모양이 같은 스택 묶음들)) 리턴
+    """
+    pattern = bytearray()
+    slot_parts = []
+    for slot in slots:
+        blank = ()
+        if len(slot) > 1:
+            blank = tuple(stack for stack in slot
+                          if not any(values[c] for c in stack[0]))
+            pattern += bytes(sum(len(stack[0]) for stack in blank))
+        filled = sorted(_stack_parts(values, stack, relabel)
+                        for stack in slot if stack not in blank)
+        runs = []
+        for stack_pattern, parts in filled:
+            if runs and runs[-1][0] == stack_pattern:
+                runs[-1][1].append(parts)
+            else:
+                runs.append((stack_pattern, [parts]))
+            pattern += stack_pattern
+        slot_parts.append((blank, [parts for _, parts in runs]))
+    return bytes(pattern), slot_parts
+
+
+# 가장 작은 모양을 만드는 열 순서들
+def _line_orders(slot_parts):
+    """[(열 순서, 새 slots)] 리턴. 모양이 같은 스택끼리는 모든 순서를 둠"""
+    orders = [((), ())]
+    for blank, runs in slot_parts:
+        alternatives = [(tuple(c for stack in blank for c in stack[0]),
+                         (blank,) if blank else ())]
+        for run in runs:
+            alternatives = [(cols + more, slots + split)
+                            for cols, slots in alternatives
+                            for order in permutations(run)
+                            for more, split in _run_orders(order)]
+        orders = [(cols + more, slots + split)
+                  for cols, slots in orders
+                  for more, split in alternatives]
+    return orders
+
+
+def _run_orders(stacks):
+    orders = [((), ())]
+    for parts in stacks:
+        orders = [(cols + more, slots + ((stack,),))
+                  for cols, slots in orders
+                  for more, stack in _stack_orders(parts)]
+    return orders
+
+
+# 정규형 계산
+def canonical_form(board):
+    """(정규형 키, 변환) 리턴. 키는 정규형 보드를 한 줄로 펼친 bytes
+
+    전치, 밴드 / 스택 순서, 밴드 안 행 순서, 스택 안 열 순서, 숫자 바꾸기를
+    모두 적용한 것 중 가장 작은 모양. 2 x 6^8 x 9! 가지를 다 만들어 보지 않고
+    윗줄부터 한 줄씩 정하면서 지금까지 가장 작은 상태들만 남긴다.
+    지금까지 빈칸뿐인 열 / 스택은 순서를 정하지 않고 묶어 둠
+    """
+    side = len(board)
+    base = isqrt(side)
+    fresh = tuple((tuple(range(s * base, (s + 1) * base)),)
+                  for s in range(base))
+    states = [(transposed, transpose(board) if transposed else board, (),
+               (fresh,), (0,) * (side + 1), 1)
+              for transposed in (False, True)]
+    key = bytearray()
+    for _ in range(side):
+        best = None
+        found = []
+        for state in states:
+            transposed, src, rows, slots, relabel, label = state
+            if len(rows) % base:
+                band = rows[-1] // base
+                choices = [r for r in range(band * base, (band + 1) * base)
+                           if r not in rows]
+            else:
+                used = {r // base for r in rows}
+                choices = [r for r in range(side) if r // base not in used]
+            for r in choices:
+                pattern, slot_parts = _line_parts(src[r], slots, relabel)
+                if best is None or pattern < best:
+                    best = pattern
+                    found = []
+                if pattern == best:
+                    found.append((state, r, slot_parts))
+        # 처음 보는 숫자는 나오는 순서대로 다음 번호
+        label = found[0][0][5]
+        for v in best:
+            if v == NEW:
+                v = label
+                label += 1
+            key.append(v)
+        # 모양이 가장 작은 줄들만 열 순서를 펼치고 숫자 번호를 붙임
+        survivors = {}
+        for (transposed, src, rows, _, relabel, label), r, slot_parts in found:
+            values = src[r]
+            rows = rows + (r,)
+            for cols, slots in _line_orders(slot_parts):
+                labels = list(relabel)
+                next_label = label
+                for c in cols:
+                    v = values[c]
+                    if v and not labels[v]:
+                        labels[v] = next_label
+                        next_label += 1
+                labels = tuple(labels)
+                # 남은 행 / 열 / 번호가 같은 상태는 하나만 남김
+                survivors.setdefault(
+                    (transposed, frozenset(rows), slots, labels),
+                    (transposed, src, rows, slots, labels, next_label))
+        states = list(survivors.values())
+    transposed, _, rows, slots, relabel, label = states[0]
+    relabel = list(relabel)
+    # 퍼즐에 없는 숫자도 남은 번호를 차례로 붙여서 되돌릴 수 있게 함
+    for digit in range(1, side + 1):
+        if not relabel[digit]:
+            relabel[digit] = label
+            label += 1
+    col_map = [c for slot in slots for stack in slot for group in stack
+               for c in group]
+    return bytes(key), (transposed, list(rows), col_map, relabel)
+
+
+# 등장 순서대로 숫자 다시 붙이기
+def _relabel_cells(cells, side):
+    relabel = [0] * (side + 1)
+    next_label = 1
+    out = bytearray(len(cells))
+    for k, v in enumerate(cells):
+        if v:
+            if not relabel[v]:
+                relabel[v] = next_label
+                next_label += 1
+            out[k] = relabel[v]
+    for digit in range(1, side + 1):
+        if not relabel[digit]:
+            relabel[digit] = next_label
+            next_label += 1
+    return bytes(out), relabel
+
+
+# 밴드 / 스택 순서만 접은 정규형
+def band_canonical_form(board):
+    """canonical_form 과 같지만 밴드 안 행 순서, 스택 안 열 순서는 접지 않음
+    (전치 x 밴드 순서 x 스택 순서 72 가지만 봄)
+
+    빈칸이 없는 정답 보드는 canonical_form 이 가지를 거의 못 쳐서 느리므로
+    정답 보드를 많이 묶어야 할 때 (sudoku_uniformity) 씀
+    """
+    side = len(board)
+    base = isqrt(side)
+    orders = [block_order_to_lines(p, base) for p in permutations(range(base))]
+    best_key = None
+    best_transform = None
+    for transposed in (False, True):
+        src = transpose(board) if transposed else board
+        for row_map in orders:
+            rows = [src[r] for r in row_map]
+            for col_map in orders:
+                cells = [row[c] for row in rows for c in col_map]
+                key, relabel = _relabel_cells(cells, side)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_transform = (transposed, row_map, col_map, relabel)
+    return best_key, best_transform
+
+
+# 키 -> 보드
+def key_to_board(key, side):
+    """정규형 키(bytes)를 보드(리스트의 리스트)로 바꾸기"""
+    return [list(key[r * side:(r + 1) * side]) for r in range(side)]
@@ -0,0 +1,232 @@
+# 스도쿠 팀 프로젝트 - 정답 보드 생성기의 균일성 검사
+#
+# 생성기로 보드를 아주 많이 만들어서 아래 세 가지를 카이제곱 검정으로 본다.
+#   1. 칸 / 숫자 빈도 : 81 칸마다 1~9 가 고르게 나오는지 (가장 치우친 칸)
+#   2. 밴드 패턴 : 맨 위 밴드(와 맨 왼쪽 스택)에서 첫 블럭의 숫자들이
+#      둘째 블럭의 어느 줄로 가는지 (56 가지). 무작위 밴드라면 모두 같은 비율
+#      (완전 무작위 보드에서는 밴드마다 나머지를 채우는 방법 수가 조금씩 달라
+#       정확히 같지는 않으므로, 이 z 값은 생성기끼리 비교하는 용도로 본다)
+#   3. 정규형 종류 : sudoku_symmetry.band_canonical_form 으로 묶은 종류가
+#      얼마나 다양하게 나오는지 (겹치는 횟수를 무작위일 때 기대값과 비교)
+#
+# 카이제곱 p 값은 Wilson-Hilferty 근사로 정규분포 z 값(= bias score)으로 바꾼다.
+# z 가 클수록 치우침이 크고, p 가 ALPHA 보다 작으면 FAIL
+#
+# 보드 생성은 CHUNK 개씩 나눠 여러 프로세스에서 돌리고 결과를 더한다.
+#
+# 사용법
+#   python sudoku_uniformity.py [--grids N] [--canonical N] [--workers N]
+#                               [--generator 모듈:함수] [--json 파일]
+
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import random
+import time
+from collections import Counter
+from importlib import import_module
+
+from sudoku_catalog import read_bands
+from sudoku_symmetry import band_canonical_form
+
+GENERATOR = "sudoku9x9_final:create_solution_board_9x9"
+SEED = 2024
+CHUNK = 20000
+ALPHA = 0.001
+
+# 9x9 스도쿠 정답 보드 수 / (전치 x 밴드 순서 x 스택 순서 x 숫자 바꾸기)
+GRIDS = 6670903752021072936960
+CANONICAL_CLASSES = GRIDS // (2 * 6 * 6 * math.factorial(9))
+
+
+# ========================
+# 밴드 패턴
+# ========================
+
+# sudoku_catalog.py bands 로 만들어 둔 sudoku_bands.bin 에서 읽기
+PATTERNS = [pattern for pattern, _ in read_bands()]
+PATTERN_INDEX = {pattern: k for k, pattern in enumerate(PATTERNS)}
+
+
+# 밴드 -> 패턴 번호
+def band_pattern(rows):
+    """rows = 밴드의 세 줄. 첫 블럭 숫자에 칸 번호를 붙여 둘째 블럭을 읽음"""
+    label = [0] * 10
+    for r in range(3):
+        row = rows[r]
+        label[row[0]] = 3 * r
+        label[row[1]] = 3 * r + 1
+        label[row[2]] = 3 * r + 2
+    return PATTERN_INDEX[tuple((1 << label[row[3]]) | (1 << label[row[4]]) |
+                               (1 << label[row[5]]) for row in rows)]
+
+
+# ========================
+# 보드 만들기 (프로세스마다)
+# ========================
+
+# "모듈:함수" -> 함수
+def load_generator(path):
+    module, name = path.split(":")
+    return getattr(import_module(module), name)
+
+
+# 정규형 -> 8 byte 번호 (프로세스가 달라도 같은 값)
+def class_id(board):
+    key, _ = band_canonical_form(board)
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(),
+                          "little")
+
+
+def audit_chunk(task):
+    """보드 count 개를 만들어 (칸 / 숫자 빈도, 밴드, 스택, 정규형 번호들) 리턴"""
+    generator_path, seed, count, canonical_count = task
+    generator = load_generator(generator_path)
+    rng = random.Random(seed)
+    cells = [0] * (81 * 9)
+    bands = [0] * len(PATTERNS)
+    stacks = [0] * len(PATTERNS)
+    classes = []
+    offsets = range(0, 81 * 9, 9)
+    for k in range(count):
+        board = generator(rng)
+        flat = [v - 1 for row in board for v in row]
+        for offset, v in zip(offsets, flat):
+            cells[offset + v] += 1
+        bands[band_pattern(board[:3])] += 1
+        columns = [[board[r][c] for r in range(9)] for c in range(3)]
+        stacks[band_pattern(columns)] += 1
+        if k < canonical_count:
+            classes.append(class_id(board))
+    return cells, bands, stacks, classes
+
+
+# ========================
+# 검정
+# ========================
+
+# 카이제곱 -> z 값 (Wilson-Hilferty)
+def chi_square_z(chi2, df):
+    t = 2 / (9 * df)
+    return ((chi2 / df) ** (1 / 3) - (1 - t)) / math.sqrt(t)
+
+
+# z -> 한쪽 p 값
+def upper_p(z):
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def chi_square(observed, expected):
+    """(카이제곱, 자유도, z, p) 리턴. expected 는 observed 와 같은 길이"""
+    chi2 = sum((o - e) ** 2 / e for o, e in zip(observed, expected) if e)
+    df = sum(1 for e in expected if e) - 1
+    z = chi_square_z(chi2, df)
+    return chi2, df, z, upper_p(z)
+
+
+def cell_test(cells, grids):
+    """칸마다 1~9 가 grids / 9 번씩 나오는지 (칸마다 자유도 8)
+
+    한 보드의 칸들은 서로 독립이 아니라서 81 칸을 합치지 않고
+    가장 치우친 칸 하나를 보고 p 에 81 을 곱함 (Bonferroni)
+    """
+    worst = max(chi_square(cells[offset:offset + 9], [grids / 9] * 9)[0]
+                for offset in range(0, 81 * 9, 9))
+    z = chi_square_z(worst, 8)
+    return worst, 8, z, min(1.0, 81 * upper_p(z))
+
+
+def coverage_test(classes):
+    """정규형 번호가 겹친 횟수를 무작위 보드일 때의 기대값과 비교
+
+    (서로 다른 종류 수, 겹친 횟수, 기대 겹침, z, p)
+    """
+    samples = sum(classes.values())
+    distinct = len(classes)
+    collisions = samples - distinct
+    # 생일 문제 : 종류가 K 개일 때 겹침 기대값 (포아송 근사)
+    expected = samples * (samples - 1) / (2 * CANONICAL_CLASSES)
+    spread = math.sqrt(max(expected, 1.0))
+    z = (collisions - expected) / spread
+    return distinct, collisions, expected, z, upper_p(z)
+
+
+# ========================
+# 실행
+# ========================
+
+def run(grids, canonical, workers, generator=GENERATOR, seed=SEED):
+    tasks = []
+    for start in range(0, grids, CHUNK):
+        count = min(CHUNK, grids - start)
+        tasks.append((generator, seed + start, count,
+                      max(0, min(count, canonical - start))))
+    cells = [0] * (81 * 9)
+    bands = [0] * len(PATTERNS)
+    stacks = [0] * len(PATTERNS)
+    classes = Counter()
+    with multiprocessing.Pool(workers) as pool:
+        for part in pool.imap_unordered(audit_chunk, tasks):
+            for total, add in zip((cells, bands, stacks), part[:3]):
+                for k, v in enumerate(add):
+                    total[k] += v
+            classes.update(part[3])
+
+    uniform = [grids / len(PATTERNS)] * len(PATTERNS)
+    report = {"generator": generator, "grids": grids,
+              "cell_digit": cell_test(cells, grids),
+              "band_pattern": chi_square(bands, uniform),
+              "stack_pattern": chi_square(stacks, uniform),
+              "patterns_seen": [sum(1 for v in bands if v),
+                                sum(1 for v in stacks if v)]}
+    if classes:
+        report["canonical"] = coverage_test(classes)
+    return report
+
+
+def show(report):
+    print(f"generator {report['generator']}, {report['grids']} grids")
+    print("test            statistic      df   bias(z)         p  result")
+    for name in ("cell_digit", "band_pattern", "stack_pattern"):
+        chi2, df, z, p = report[name]
+        print(f"{name:<14} {chi2:>10.1f} {df:>7} {z:>9.2f} {p:>9.2g}  "
+              f"{'PASS' if p >= ALPHA else 'FAIL'}")
+    bands, stacks = report["patterns_seen"]
+    print(f"band patterns seen {bands}/{len(PATTERNS)}, "
+          f"stack patterns seen {stacks}/{len(PATTERNS)}")
+    if "canonical" in report:
+        distinct, collisions, expected, z, p = report["canonical"]
+        print(f"{'canonical':<14} {collisions:>10} {'':>7} {z:>9.2f} "
+              f"{p:>9.2g}  {'PASS' if p >= ALPHA else 'FAIL'}")
+        print(f"canonical classes seen {distinct}, repeats {collisions} "
+              f"(expected {expected:.2g} for uniform grids)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator uniformity audit")
+    parser.add_argument("--grids", type=int, default=1000000)
+    parser.add_argument("--canonical", type=int, default=20000,
+                        help="grids to put in canonical form (slow part)")
+    parser.add_argument("--workers", type=int,
+                        default=multiprocessing.cpu_count())
+    parser.add_argument("--generator", default=GENERATOR,
+                        help="MODULE:FUNCTION taking an rng, returning a board")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--json", metavar="FILE", help="save the report")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    report = run(args.grids, min(args.canonical, args.grids), args.workers,
+                 args.generator, args.seed)
+    show(report)
+    print(f"elapsed {time.perf_counter() - start:.1f}s "
+          f"with {args.workers} workers")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# 스도쿠 팀 프로젝트 - 제약 단위(unit) 배치
+#
+# 일반 스도쿠의 규칙은 "행 / 열 / 블럭 안에서 숫자가 겹치지 않는다" 이다.
+# 행 / 열 / 블럭을 모두 "칸 번호 묶음(unit)" 으로 바꿔 두면
+# 대각선 스도쿠(Sudoku-X), 조각(jigsaw) 스도쿠, 킬러 스도쿠도
+# unit 목록만 바꿔서 같은 풀이기 / 검사기로 풀 수 있다.
+#
+# Layout 은 미리 계산한 평평한 표만 들고 있다.
+#   units      : unit 마다 칸 번호 튜플
+#   cell_units : 칸마다 그 칸이 속한 unit 번호 튜플
+#   cages      : 킬러 케이지마다 (칸 번호 튜플, 합)
+#   cell_cage  : 칸마다 속한 케이지 번호 (없으면 -1)
+#   key        : unit / 케이지 구성으로 만든 번호 (구성이 같으면 같은 값)
+# 칸 번호는 r * side + c
+
+from math import isqrt
+
+
+class Layout:
+    """스도쿠 변형 하나의 제약 단위 표"""
+
+    def __init__(self, side, units, cages=()):
+        self.side = side
+        self.cages = tuple((tuple(cells), total) for cells, total in cages)
+        # 킬러 케이지 안에서도 숫자는 겹치지 않음
+        self.units = tuple(tuple(unit) for unit in units) + \
+            tuple(cells for cells, _ in self.cages)
+        cell_units = [[] for _ in range(side * side)]
+        for u, unit in enumerate(self.units):
+            for cell in unit:
+                cell_units[cell].append(u)
+        self.cell_units = tuple(tuple(us) for us in cell_units)
+        cell_cage = [-1] * (side * side)
+        for k, (cells, _) in enumerate(self.cages):
+            for cell in cells:
+                cell_cage[cell] = k
+        self.cell_cage = tuple(cell_cage)
+        # 풀이기의 dead_ends 에서 배치를 구별하는 값
+        self.key = hash((side, self.units, self.cages))
+
+
+# ========================
+# unit 만들기
+# ========================
+
+def row_units(side):
+    return [[r * side + c for c in range(side)] for r in range(side)]
+
+
+def column_units(side):
+    return [[r * side + c for r in range(side)] for c in range(side)]
+
+
+def box_units(side):
+    base = isqrt(side)
+    return [[(br * base + i) * side + bc * base + j
+             for i in range(base) for j in range(base)]
+            for br in range(base) for bc in range(base)]
+
+
+def diagonal_units(side):
+    return [[k * side + k for k in range(side)],
+            [k * side + side - 1 - k for k in range(side)]]
+
+
+# ========================
+# 변형별 배치
+# ========================
+
+_standard = {}
+
+
+# 일반 스도쿠
+def standard_layout(side=9):
+    """행 / 열 / 블럭 (side 마다 한 번만 만듦)"""
+    layout = _standard.get(side)
+    if layout is None:
+        layout = _standard[side] = Layout(
+            side, row_units(side) + column_units(side) + box_units(side))
+    return layout
+
+
+# 대각선 스도쿠
+def diagonal_layout(side=9):
+    """일반 스도쿠 + 두 대각선"""
+    return Layout(side, row_units(side) + column_units(side) +
+                  box_units(side) + diagonal_units(side))
+
+
+# 조각 스도쿠
+def jigsaw_layout(regions):
+    """regions[r][c] = 조각 번호 (블럭 대신 조각 사용)"""
+    side = len(regions)
+    pieces = {}
+    for r in range(side):
+        for c in range(side):
+            pieces.setdefault(regions[r][c], []).append(r * side + c)
+    if len(pieces) != side or any(len(p) != side for p in pieces.values()):
+        raise ValueError("jigsaw regions must be side pieces of side cells")
+    return Layout(side, row_units(side) + column_units(side) +
+                  [pieces[k] for k in sorted(pieces)])
+
+
+# 킬러 스도쿠
+def killer_layout(cages, side=9):
+    """cages = [([(r, c), ...], 합), ...] + 일반 스도쿠 규칙"""
+    cages = [([r * side + c for r, c in cells], total)
+             for cells, total in cages]
+    return Layout(side, row_units(side) + column_units(side) +
+                  box_units(side), cages)
+
+
+# ========================
+# 검사
+# ========================
+
+# 규칙 검사 (빈칸 허용)
+def is_valid_board(board, layout=None):
+    """unit 안에 같은 숫자가 없고, 케이지 합이 맞는지
+    (빈칸이 있으면 남은 숫자로 그 합을 채울 수 있는지)"""
+    side = len(board)
+    layout = layout or standard_layout(side)
+    cells = [v for row in board for v in row]
+    for unit in layout.units:
+        seen = 0
+        for cell in unit:
+            v = cells[cell]
+            if v:
+                bit = 1 << (v - 1)
+                if seen & bit:
+                    return False
+                seen |= bit
+    for unit_cells, total in layout.cages:
+        filled = [cells[cell] for cell in unit_cells if cells[cell]]
+        blanks = len(unit_cells) - len(filled)
+        if not blanks:
+            if sum(filled) != total:
+                return False
+            continue
+        # 빈칸에 남은 숫자 중 가장 작은 / 큰 것들을 넣어도 합을 못 맞추면 실패
+        free = [d for d in range(1, side + 1) if d not in filled]
+        if blanks > len(free) or \
+                sum(filled) + sum(free[:blanks]) > total or \
+                sum(filled) + sum(free[-blanks:]) < total:
+            return False
+    return True
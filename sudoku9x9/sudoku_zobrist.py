@@ -0,0 +1,49 @@
+# 스도쿠 팀 프로젝트 - Zobrist 해시
+#
+# (칸, 숫자) 마다 64 bit 난수를 하나씩 정해 두고,
+# 보드의 해시 = 채워진 칸들의 난수를 모두 XOR 한 값으로 삼는다.
+# 칸 하나를 old -> new 로 바꾸면 해시 ^= 난수[칸][old] ^ 난수[칸][new]
+# 이므로 한 수마다 O(1) 로 갱신되고, 보드 전체를 다시 읽을 필요가 없다.
+#
+# 빈칸(0)의 난수는 0 이라서 빈 보드의 해시는 0
+
+import random
+
+ZOBRIST_SEED = 20240917
+
+_tables = {}
+
+
+# 난수표
+def zobrist_table(side):
+    """table[칸 * (side + 1) + 숫자] 형태의 64 bit 난수표 (side 마다 하나)"""
+    table = _tables.get(side)
+    if table is None:
+        rng = random.Random(ZOBRIST_SEED + side)
+        table = []
+        for _ in range(side * side):
+            table.append(0)
+            table.extend(rng.getrandbits(64) for _ in range(side))
+        _tables[side] = table
+    return table
+
+
+# 보드 전체 해시 (처음 한 번만)
+def board_hash(board):
+    """보드의 Zobrist 해시 계산"""
+    side = len(board)
+    table = zobrist_table(side)
+    h = 0
+    for r, row in enumerate(board):
+        for c, v in enumerate(row):
+            if v:
+                h ^= table[(r * side + c) * (side + 1) + v]
+    return h
+
+
+# 한 칸 바뀔 때 해시 갱신
+def update_hash(h, side, cell, old, new):
+    """cell 의 값이 old -> new 로 바뀐 뒤의 해시"""
+    table = zobrist_table(side)
+    k = cell * (side + 1)
+    return h ^ table[k + old] ^ table[k + new]
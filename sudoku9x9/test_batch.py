@@ -0,0 +1,33 @@
+# 스도쿠 팀 프로젝트 - batch 입력 테스트
+#
+# 사용법 : python -m pytest test_batch.py  (또는 python -m unittest test_batch)
+
+import unittest
+
+from sudoku_batch import parse_line, parse_moves
+
+
+class ParseLineTest(unittest.TestCase):
+    def test_spaced_move(self):
+        self.assertEqual(parse_line("1 2 3"), [(1, 2, 3)])
+        self.assertEqual(parse_line("1,2,3  # comment"), [(1, 2, 3)])
+
+    def test_command_only_line(self):
+        self.assertEqual(parse_line("u u r"), ["u", "u", "r"])
+        self.assertEqual(parse_line("u r r"), ["u", "r", "r"])
+
+    def test_mixed_line(self):
+        self.assertEqual(parse_line("1 2 3 u"), [(1, 2, 3), "u"])
+        self.assertEqual(parse_line("u 4 5 6 r"), ["u", (4, 5, 6), "r"])
+        self.assertEqual(parse_line("123 u 456"),
+                         [(1, 2, 3), "u", (4, 5, 6)])
+
+    def test_incomplete_move_is_invalid(self):
+        self.assertEqual(parse_line("1 2 u"), [None, "u"])
+    def test_parse_moves_numbers_lines(self):
+        self.assertEqual(list(parse_moves(["u r", "123456"])),
+                         [(1, "u"), (1, "r"), (2, (1, 2, 3)), (2, (4, 5, 6))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+# 스도쿠 팀 프로젝트 - 풀이 결과 캐시 테스트
+#
+# 사용법 : python -m pytest test_cache.py  (또는 python -m unittest test_cache)
+
+import os
+import tempfile
+import unittest
+
+from sudoku_cache import SolverCache
+from sudoku_seeded import generate_puzzle
+
+
+class SolverCacheTest(unittest.TestCase):
+    def setUp(self):
+        # 힌트 30 개짜리 보통 퍼즐 (정규형 없이 보드 그대로의 키를 씀)
+        self.solution, self.puzzle = generate_puzzle(1, 51)
+
+    def test_easy_puzzle_hits_on_second_solve(self):
+        cache = SolverCache()
+        first = cache.solve(self.puzzle)
+        second = cache.solve(self.puzzle)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(first, second)
+        self.assertEqual(cache.count_solutions(self.puzzle),
+                         cache.count_solutions(self.puzzle))
+        self.assertEqual(cache.stats()["hits"], 3)
+
+    def test_saved_cache_skips_known_puzzles(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "cache.json")
+            cache = SolverCache(path=path)
+            count = cache.count_solutions(self.puzzle)
+            cache.save()
+            again = SolverCache(path=path)
+            self.assertEqual(again.count_solutions(self.puzzle), count)
+            self.assertEqual((again.hits, again.misses), (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+# 스도쿠 팀 프로젝트 - 게임 한 판의 메모리 예산 테스트
+#
+# 사용법 : python -m pytest test_memory.py  (또는 python -m unittest test_memory)
+
+import tracemalloc
+import unittest
+
+from sudoku_memory import FRAMES, LEAK_BUDGET, PEAK_BUDGET, WARMUP, \
+    leak_check, measure_game, play_headless, sandbox
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    def setUp(self):
+        tracemalloc.start(FRAMES)
+        self.sandbox = sandbox()
+        self.sandbox.__enter__()
+        play_headless(0)   # import / 첫 실행 비용 제외
+
+    def tearDown(self):
+        self.sandbox.__exit__(None, None, None)
+        tracemalloc.stop()
+
+    def test_peak_within_budget(self):
+        peak, _, _, _ = measure_game(1)
+        self.assertLessEqual(peak, PEAK_BUDGET)
+
+    def test_no_growth_after_warmup(self):
+        warm, last = leak_check(WARMUP + 5)
+        self.assertLessEqual(last - warm, LEAK_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
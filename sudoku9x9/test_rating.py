@@ -0,0 +1,60 @@
+# 스도쿠 팀 프로젝트 - 실력 점수 sink 테스트
+#
+# 사용법 : python -m pytest test_rating.py  (또는 python -m unittest test_rating)
+
+import os
+import tempfile
+import unittest
+
+from sudoku_events import EventBus
+from sudoku_rating import RatingSink, load_ratings
+
+
+class RatingSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "ratings.json")
+        self.sink = RatingSink(self.path)
+        self.bus = EventBus([self.sink])
+
+    def tearDown(self):
+        self.bus.close()
+        self.folder.cleanup()
+
+    def play(self, game, player, result):
+        self.bus.publish("game_started", game=game, player=player,
+                         seed=game, holes=30)
+        self.bus.publish("game_finished", game=game, player=player,
+                         result=result)
+
+    def test_match_counts_once_per_player(self):
+        # 멀티 모드 게임은 이름 없이 기록되고 승패만 match_finished 로
+        self.play(1, None, 1)
+        self.play(2, None, 1)
+        self.bus.publish("match_finished", games=[1, 2],
+                         players=["aaa", "bbb"], score=1)
+        self.bus.flush()
+        players = load_ratings(self.path).players
+        self.assertEqual(players["aaa"][1], 1)
+        self.assertEqual(players["bbb"][1], 1)
+        self.assertGreater(players["aaa"][0], players["bbb"][0])
+        self.assertEqual(load_ratings(self.path).puzzles, {})
+
+    def test_solo_game_rates_player_and_puzzle(self):
+        self.play(1, "aaa", 1)
+        self.bus.flush()
+        ratings = load_ratings(self.path)
+        self.assertEqual(ratings.players["aaa"][1], 1)
+        self.assertEqual(len(ratings.puzzles), 1)
+
+    def test_same_player_on_both_seats_is_not_rated(self):
+        self.play(1, None, 1)
+        self.play(2, None, 2)
+        self.bus.publish("match_finished", games=[1, 2],
+                         players=["aaa", "aaa"], score=1)
+        self.bus.flush()
+        self.assertEqual(load_ratings(self.path).players, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+# 스도쿠 팀 프로젝트 - 풀이기 테스트
+#
+# 사용법 : python -m pytest test_solver.py  (또는 python -m unittest test_solver)
+
+import unittest
+
+from sudoku_seeded import generate_puzzle
+from sudoku_solver import search_solutions
+from sudoku_units import diagonal_layout, standard_layout
+
+
+class DeadEndsTest(unittest.TestCase):
+    def test_layouts_do_not_share_dead_ends(self):
+        # 대각선을 비운 퍼즐 : 대각선 스도쿠로는 해가 없고 일반 스도쿠로는 있음
+        _, puzzle = generate_puzzle(0, 30)
+        for k in range(9):
+            puzzle[k][k] = puzzle[k][8 - k] = 0
+        dead_ends = set()
+        self.assertEqual(
+            search_solutions(puzzle, 2, dead_ends, diagonal_layout())[0], 0)
+        self.assertTrue(dead_ends)
+        self.assertEqual(search_solutions(puzzle, 2, dead_ends)[0],
+                         search_solutions(puzzle, 2)[0])
+
+    def test_equal_layouts_share_a_key(self):
+        self.assertEqual(diagonal_layout().key, diagonal_layout().key)
+        self.assertNotEqual(diagonal_layout().key, standard_layout().key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# 스도쿠 팀 프로젝트 - 회원 기록 저장소 테스트
+#
+# 사용법 : python -m pytest test_store.py  (또는 python -m unittest test_store)
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from sudoku_store import MemberStore, apply_deltas, \
+    check_concurrent_writers, read_members
+
+
+class ConcurrentWritersTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "members.csv")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_processes_lose_no_updates(self):
+        # 프로세스 100 개가 같은 파일에 동시에 기록 (fcntl 잠금)
+        tries, wins, want_tries, want_wins, _, _ = \
+            check_concurrent_writers(self.path, writers=100, games=5)
+        self.assertEqual(tries, want_tries)
+        self.assertEqual(wins, want_wins)
+
+    def test_threads_share_flushes(self):
+        tries, wins, want_tries, want_wins, flushes, _ = \
+            check_concurrent_writers(self.path, writers=100, games=5,
+                                     processes=False)
+        self.assertEqual((tries, wins), (want_tries, want_wins))
+        self.assertLess(flushes, want_tries)
+
+    def test_waiting_updates_share_one_flush(self):
+        # 저장 중(flush lock)에 들어온 기록 10 개는 다음 flush 한 번에 모두 저장
+        store = MemberStore(self.path)
+        names = [f"p{k}" for k in range(10)]
+        with store._flush_lock:
+            threads = [threading.Thread(target=store.record_game,
+                                        args=(name, "pw", True))
+                       for name in names]
+            for thread in threads:
+                thread.start()
+            deadline = time.monotonic() + 10
+            while len(store._pending) < len(names):
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.flushes, 1)
+        members = read_members(self.path)
+        self.assertEqual({name: members[name] for name in names},
+                         {name: ("pw", 1, 1) for name in names})
+
+    def test_existing_password_is_kept(self):
+        apply_deltas({"kim": ("old", 1, 0)}, self.path)
+        MemberStore(self.path).record_game("kim", "new", True)
+        self.assertEqual(read_members(self.path)["kim"], ("old", 2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()